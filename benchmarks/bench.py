@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# This file is part of configparser_extended library
+# released under the MIT license.
+# See the LICENSE file for more information.
+
+""" Benchmarks of the ExtendedConfigParser resolution paths.
+
+Every benchmark runs on synthetic files (see synthetic.py) and reports the
+best time per operation over several repeats. Results are written as JSON,
+sorted, so that two runs (ex : two releases) can be compared with
+compare.py.
+
+The *_threads_N benchmarks run get() from N threads at once, on a concurrent
+parser (lock-free) and on a regular one behind a lock; their usec_per_op is
+the wall time divided by the total number of lookups, so it falls as the
+throughput scales.
+
+    python bench.py [--quick] [--output results.json] [--filter get]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from configparser_extended import ExtendedConfigParser  # noqa
+import synthetic  # noqa
+
+try:
+    _clock = time.perf_counter
+except AttributeError:
+    _clock = time.time
+
+
+# name -> (generator arguments, parser arguments)
+SCENARIOS = {
+    'explicit': (dict(sections=400, options=10, depth=3), {}),
+    'deep': (dict(sections=400, options=10, depth=8), {}),
+    'implicit': (dict(sections=100, options=10, depth=2, diamonds=100),
+                 dict(inheritance='implicit')),
+    'specialized': (dict(sections=400, options=10, depth=3, spec_density=0.9,
+                         config_depth=6), {}),
+}
+
+
+def timeit(func, number, repeat):
+    """ Returns the best time, in seconds, of `number' calls of func. """
+
+    best = None
+    for i in range(repeat):
+        start = _clock()
+        for j in range(number):
+            func()
+        elapsed = _clock() - start
+        if(best is None or elapsed < best):
+            best = elapsed
+    return best
+
+
+def cycle(values):
+    """ Returns a function returning the values one after the other. """
+
+    state = {'i': -1}
+
+    def next_value():
+        state['i'] = (state['i'] + 1) % len(values)
+        return values[state['i']]
+    return next_value
+
+
+def parser_for(text, config, parser_args, **kwargs):
+    args = dict(parser_args)
+    args.update(kwargs)
+    x = ExtendedConfigParser(config=config, **args)
+    x.read_string(text)
+    return x
+
+
+def layered_parser(layers, config, parser_args):
+    x = ExtendedConfigParser(config=config, **parser_args)
+    for layer in layers:
+        x.read_string(layer)
+    return x
+
+
+def split_layers(text, number=40):
+    """ Splits a file into `number' files, on section boundaries. """
+
+    chunks = text.split('\n[')
+    size = max(1, len(chunks) // number)
+    layers = []
+    for i in range(0, len(chunks), size):
+        layers.append('\n['.join(chunks[i:i + size]))
+    return [layers[0]] + ['[' + layer for layer in layers[1:]]
+
+
+def benchmarks(text, config, parser_args):
+    """ Returns a list of (name, function) pairs for a synthetic file. """
+
+    x = parser_for(text, config, parser_args)
+    compiled = parser_for(text, config, parser_args, compiled=True)
+    typed = parser_for(text, config, parser_args, typed_cache=True)
+    traced = parser_for(text, config, parser_args, stats=True)
+    sections = [x.get_section_name_compact(s) for s in x.sections()]
+    section = cycle(sections)
+    option = cycle(['opt%d' % i for i in range(10)] + ['default0'])
+    options = ['opt%d' % i for i in range(10)]
+    layers = split_layers(text)
+    # 100 names below the config name and 100 names next to its parent
+    fleet = (['{0}_n{1}'.format(config, i) for i in range(100)] +
+             ['{0}_m{1}'.format(config[:config.rfind('_')], i)
+              for i in range(100)])
+
+    return [
+        ('read', lambda: parser_for(text, config, parser_args)),
+        ('read_layered', lambda: layered_parser(layers, config, parser_args)),
+        ('get', lambda: x.get(section(), option())),
+        ('get_sect_first_false',
+         lambda: x.get(section(), option(), sect_first=False)),
+        ('get_cfg_plus', lambda: x.get(section(), option(), cfg_plus=True)),
+        ('get_compiled', lambda: compiled.get(section(), option())),
+        ('get_stats', lambda: traced.get(section(), option())),
+        ('get_missing', lambda: x.get(section(), 'missing', fallback=None)),
+        ('has_option', lambda: x.has_option(section(), option())),
+        ('has_option_cfg_ind',
+         lambda: x.has_option(section(), option(), cfg_ind=True)),
+        ('has_option_strict',
+         lambda: x.has_option(section(), option(), strict=True)),
+        ('items', lambda: x.items(section())),
+        ('items_strict', lambda: x.items(section(), strict=True)),
+        ('options', lambda: x.options(section())),
+        ('options_cfg_ind', lambda: x.options(section(), cfg_ind=True)),
+        ('proxy_getitem', lambda: x[section()][option()]),
+        ('proxy_dict', lambda: dict(x[section()])),
+        ('getint', lambda: x.getint(section(), 'intval')),
+        ('getint_typed_cache', lambda: typed.getint(section(), 'intval')),
+        ('getfloatlist', lambda: x.getfloatlist(section(), 'floats')),
+        ('getfloatlist_typed_cache',
+         lambda: typed.getfloatlist(section(), 'floats')),
+        ('get_many', lambda: x.get_many(section(), options, fallback=None)),
+        ('resolve_section', lambda: x.resolve_section(section())),
+        ('freeze', lambda: x.freeze()),
+        ('resolve_matrix', lambda: x.resolve_matrix(fleet)),
+    ]
+
+
+def threaded(funcs, number, repeat):
+    """ Returns the best time, in seconds, of `number' calls of every
+    function of funcs, each one being called from its own thread. """
+
+    best = None
+    for i in range(repeat):
+        start = threading.Event()
+
+        def work(func):
+            start.wait()
+            for j in range(number):
+                func()
+        threads = [threading.Thread(target=work, args=(func,))
+                   for func in funcs]
+        for t in threads:
+            t.start()
+        begin = _clock()
+        start.set()
+        for t in threads:
+            t.join()
+        elapsed = _clock() - begin
+        if(best is None or elapsed < best):
+            best = elapsed
+    return best
+
+
+def thread_benchmarks(text, config, parser_args):
+    """ Returns a list of (name, function factory) pairs, the factories
+    returning a new function (with its own position in the sections) for
+    every thread. """
+
+    x = parser_for(text, config, parser_args, concurrent=True)
+    locked = parser_for(text, config, parser_args)
+    lock = threading.Lock()
+    sections = [x.get_section_name_compact(s) for s in x.sections()]
+    names = ['opt%d' % i for i in range(10)] + ['default0']
+
+    def concurrent_get():
+        section, option = cycle(sections), cycle(names)
+        return lambda: x.get(section(), option())
+
+    def locked_get():
+        section, option = cycle(sections), cycle(names)
+
+        def get():
+            with lock:
+                return locked.get(section(), option())
+        return get
+
+    return [('get_concurrent', concurrent_get), ('get_locked', locked_get)]
+
+
+def run(quick=False, name_filter=None):
+    results = []
+    number = 200 if quick else 2000
+    repeat = 3 if quick else 5
+    for scenario in sorted(SCENARIOS):
+        gen_args, parser_args = SCENARIOS[scenario]
+        text = synthetic.generate(**gen_args)
+        config = synthetic.config_name(gen_args.get('config_depth', 3))
+        for name, func in benchmarks(text, config, parser_args):
+            if(name_filter and name_filter not in name):
+                continue
+            n = number
+            if(name in ('read', 'read_layered', 'freeze', 'resolve_matrix')):
+                n = max(1, number // 200)
+            best = timeit(func, n, repeat)
+            results.append({
+                'scenario': scenario,
+                'benchmark': name,
+                'number': n,
+                'best_seconds': best,
+                'usec_per_op': best * 1e6 / n,
+            })
+        for name, factory in thread_benchmarks(text, config, parser_args):
+            for threads in (1, 4, 32):
+                full_name = '{0}_threads_{1}'.format(name, threads)
+                if(name_filter and name_filter not in full_name):
+                    continue
+                n = max(1, number // threads)
+                best = threaded([factory() for i in range(threads)], n,
+                                repeat)
+                results.append({
+                    'scenario': scenario,
+                    'benchmark': full_name,
+                    'number': n * threads,
+                    'best_seconds': best,
+                    'usec_per_op': best * 1e6 / (n * threads),
+                })
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'quick': quick,
+            'scenarios': dict((k, v[0]) for k, v in SCENARIOS.items()),
+        },
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--quick', action='store_true',
+                        help='fewer iterations, for a quick check')
+    parser.add_argument('--output', help='JSON file (default: stdout)')
+    parser.add_argument('--filter', help='only run benchmarks whose name '
+                        'contains this string')
+    args = parser.parse_args(argv)
+    res = json.dumps(run(args.quick, args.filter), indent=2, sort_keys=True)
+    if(args.output):
+        with open(args.output, 'w') as f:
+            f.write(res + '\n')
+    else:
+        print(res)
+
+
+if __name__ == '__main__':
+    main()
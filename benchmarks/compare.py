@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# This file is part of configparser_extended library
+# released under the MIT license.
+# See the LICENSE file for more information.
+
+""" Compares two result files written by bench.py.
+
+    python compare.py before.json after.json [--threshold 1.10]
+
+Prints, for every benchmark found in both files, the time per operation
+before and after and their ratio. Exits with status 1 if a benchmark got
+slower than the threshold.
+"""
+
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path) as f:
+        data = json.load(f)
+    return dict(((r['scenario'], r['benchmark']), r['usec_per_op'])
+                for r in data['results'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument('--threshold', type=float, default=1.10,
+                        help='slowdown ratio reported as a regression')
+    args = parser.parse_args(argv)
+    before = load(args.before)
+    after = load(args.after)
+    regressions = 0
+    for key in sorted(set(before) & set(after)):
+        ratio = after[key] / before[key] if before[key] else 0.0
+        flag = ''
+        if(ratio > args.threshold):
+            flag = '  REGRESSION'
+            regressions += 1
+        print('%-12s %-26s %12.2f %12.2f %8.2fx%s' % (
+            key[0], key[1], before[key], after[key], ratio, flag))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of configparser_extended library
+# released under the MIT license.
+# See the LICENSE file for more information.
+
+""" Generators of synthetic configuration files for the benchmarks.
+
+A generated file contains:
+
+    - chains of sections explicitly inheriting from each other
+      ([s0:s1:s2], [s1:s2:s3], ...), `depth' parents each,
+    - `diamonds' implicit diamonds ([d0:l0:r0], [l0:t0], [r0:t0], [t0]),
+      which are only resolved in implicit inheritance mode,
+    - `options' options per section, a `spec_density' share of them being
+      specialized for config names up to `config_depth' levels deep
+      (key3[c0_c1_c2]),
+    - a DEFAULT section.
+"""
+
+import random
+
+
+def config_name(config_depth):
+    """ Returns the deepest config name used in the generated files
+    (ex : c0_c1_c2 for a depth of 3). """
+
+    return '_'.join('c%d' % i for i in range(config_depth))
+
+
+def generate(sections=100, options=10, depth=3, diamonds=0, spec_density=0.3,
+             config_depth=3, seed=0):
+    """ Returns the text of a synthetic configuration file. The same
+    arguments always give the same file. """
+
+    rand = random.Random(seed)
+    tags = [config_name(i) for i in range(1, config_depth + 1)]
+    lines = []
+
+    def body(name):
+        for j in range(options):
+            lines.append('opt%d = %s_%d' % (j, name, j))
+            if(tags and rand.random() < spec_density):
+                tag = rand.choice(tags)
+                lines.append('opt%d[%s] = %s_%d_%s' % (j, tag, name, j, tag))
+        lines.append('intval = %d' % rand.randint(0, 1000))
+        lines.append('floats = %s' % ';'.join(str(rand.random())
+                                              for i in range(5)))
+        lines.append('')
+
+    for i in range(sections):
+        parents = ['s%d' % k for k in range(i + 1, min(i + 1 + depth,
+                                                       sections))]
+        lines.append('[%s]' % ':'.join(['s%d' % i] + parents))
+        body('s%d' % i)
+
+    for i in range(diamonds):
+        lines.append('[d%d:l%d:r%d]' % (i, i, i))
+        body('d%d' % i)
+        lines.append('[l%d:t%d]' % (i, i))
+        body('l%d' % i)
+        lines.append('[r%d:t%d]' % (i, i))
+        body('r%d' % i)
+        lines.append('[t%d]' % i)
+        body('t%d' % i)
+
+    lines.append('[DEFAULT]')
+    for j in range(options):
+        lines.append('default%d = default_%d' % (j, j))
+        if(tags):
+            lines.append('default%d[%s] = default_%d_%s' % (j, tags[0], j,
+                                                            tags[0]))
+    lines.append('')
+    return '\n'.join(lines)
+
+
+def write(path, **kwargs):
+    """ Writes a synthetic configuration file (see generate()). """
+
+    with open(path, 'w') as f:
+        f.write(generate(**kwargs))
+    return path
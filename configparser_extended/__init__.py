@@ -7,6 +7,8 @@
 
 from configparser_extended.ecp import ExtendedConfigParser, \
     SectionProxyExtended
+from configparser_extended.frozen import FrozenConfig, FrozenSection
 
 
-__all__ = ['ExtendedConfigParser', 'SectionProxyExtended']
+__all__ = ['ExtendedConfigParser', 'SectionProxyExtended', 'FrozenConfig',
+           'FrozenSection']
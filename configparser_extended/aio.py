@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of configparser_extended library
+# released under the MIT license.
+# See the LICENSE file for more information.
+
+""" asyncio support of ExtendedConfigParser (aread(), areload(), ...).
+
+The files are read, parsed and merged into a fork of the parser in an
+executor, and so are the lookups, but the parser is only changed in the
+thread of the event loop, the fork replacing it : a Scheduler applies the
+changes once no lookup is running, the lookups started meanwhile waiting for
+them. Everything is built on futures and callbacks, without the
+async syntax, so that the module can be imported by any Python version.
+"""
+
+import functools
+
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
+
+def running_loop():
+    """ Returns the event loop running in the current thread. """
+
+    if(asyncio is None):
+        raise RuntimeError('asyncio is not available')
+    if(hasattr(asyncio, 'get_running_loop')):
+        return asyncio.get_running_loop()
+    return asyncio.get_event_loop()
+
+
+def copy_outcome(source, target):
+    """ Gives the result, exception or cancellation of a done future to
+    another one, unless the latter has been cancelled. """
+
+    if(target.cancelled()):
+        return
+    if(source.cancelled()):
+        target.cancel()
+    elif(source.exception() is not None):
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+def then(loop, future, callback):
+    """ Returns a future of callback(result of future), callback being called
+    in the thread of the loop. If callback returns a future, its outcome is
+    the one of the returned future. """
+
+    res = loop.create_future()
+
+    def done(future):
+        if(res.cancelled()):
+            return
+        if(future.cancelled() or future.exception() is not None):
+            copy_outcome(future, res)
+            return
+        try:
+            value = callback(future.result())
+        except Exception as e:
+            res.set_exception(e)
+            return
+        if(isinstance(value, asyncio.Future)):
+            value.add_done_callback(functools.partial(copy_outcome,
+                                                      target=res))
+        else:
+            res.set_result(value)
+
+    future.add_done_callback(done)
+    return res
+
+
+def prefetch(loaded):
+    """ Consumes the files yielded by ExtendedConfigParser._load_files(), up
+    to the first one with an error (read() stops there), and returns them
+    along with the exception raised meanwhile, if any, for replay(). """
+
+    files = []
+    try:
+        for item in loaded:
+            files.append(item)
+            if(item[2] is not None and item[2][1] is not None):
+                break
+    except Exception as e:
+        return files, e
+    return files, None
+
+
+def sections_of(prefetched):
+    """ Returns the set of the names of the sections of the files returned by
+    prefetch(). """
+
+    names = set()
+    for item in prefetched[0]:
+        if(item[2] is not None):
+            names.update(item[2][0])
+    return names
+
+
+def replay(files, error):
+    """ Yields the files returned by prefetch(), then raises its exception,
+    as the generator prefetch() consumed would. """
+
+    for item in files:
+        yield item
+    if(error is not None):
+        raise error
+
+
+class Scheduler(object):
+    """ Runs the asynchronous jobs of a parser from an event loop : loads
+    (in an executor, then applied in the thread of the loop), changes and
+    lookups (in an executor). The changes wait for the lookups running, and
+    the lookups for the changes waiting. The loads in progress are shared by
+    key. """
+
+    def __init__(self, loop):
+        self.loop = loop
+        # Number of lookups running
+        self.lookups = 0
+        # Changes waiting for the lookups : (future, func, args)
+        self.changes = []
+        # Lookups waiting for the changes : (future, executor, func)
+        self.waiting = []
+        # Key -> future of the load in progress
+        self.loads = {}
+
+    def load(self, key, executor, load, change):
+        """ Returns an awaitable of change(load()), load() being called in
+        executor and change() in the thread of the loop, as a change. While
+        it is in progress, the other loads of the same key (if not None)
+        share its outcome. """
+
+        future = self.loads.get(key) if key is not None else None
+        if(future is None or future.done()):
+            future = then(self.loop,
+                          self.loop.run_in_executor(executor, load),
+                          functools.partial(self.change, change))
+            if(key is not None):
+                self.loads[key] = future
+                future.add_done_callback(functools.partial(self._loaded,
+                                                           key))
+        # An awaiter being cancelled does not cancel the others
+        return asyncio.shield(future)
+
+    def _loaded(self, key, future):
+        if(self.loads.get(key) is future):
+            del self.loads[key]
+        if(not future.cancelled()):
+            # Retrieved, if no one awaits it any more
+            future.exception()
+
+    def change(self, func, *args):
+        """ Returns a future of func(*args), called in the thread of the loop
+        once no lookup is running. """
+
+        future = self.loop.create_future()
+        self.changes.append((future, func, args))
+        self._run()
+        return future
+
+    def lookup(self, executor, func):
+        """ Returns a future of func(), called in executor once no change is
+        waiting. """
+
+        future = self.loop.create_future()
+        self.waiting.append((future, executor, func))
+        self._run()
+        return future
+
+    def _run(self):
+        if(self.changes and self.lookups):
+            return
+        while(self.changes):
+            changes, self.changes = self.changes, []
+            for future, func, args in changes:
+                try:
+                    res = func(*args)
+                except Exception as e:
+                    future.set_exception(e)
+                    continue
+                if(isinstance(res, asyncio.Future)):
+                    # The change has been started again
+                    res.add_done_callback(functools.partial(copy_outcome,
+                                                            target=future))
+                else:
+                    future.set_result(res)
+        waiting, self.waiting = self.waiting, []
+        for future, executor, func in waiting:
+            if(future.cancelled()):
+                continue
+            self.lookups += 1
+            inner = self.loop.run_in_executor(executor, func)
+            inner.add_done_callback(functools.partial(self._looked_up,
+                                                      future))
+
+    def _looked_up(self, future, inner):
+        self.lookups -= 1
+        copy_outcome(inner, future)
+        self._run()
+
+
+def watch(parser, loop, interval, callback, stop):
+    """ Calls parser.areload() from loop every interval seconds until stop
+    (a threading.Event) is set, see ExtendedConfigParser.watch(). """
+
+    def check():
+        if(stop.is_set()):
+            return
+        parser.areload().add_done_callback(done)
+
+    def done(future):
+        if(future.cancelled()):
+            changed, error = [], None
+        elif(future.exception() is not None):
+            changed, error = [], future.exception()
+        else:
+            changed, error = future.result(), None
+        if(callback is not None and (changed or error is not None)):
+            callback(changed, error)
+        if(not stop.is_set()):
+            loop.call_later(interval, check)
+
+    loop.call_later(interval, check)
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of configparser_extended library
+# released under the MIT license.
+# See the LICENSE file for more information.
+
+""" On-disk cache of the fragments of the files read (see the reader module).
+
+A cache file holds the fragment of one source file, marshalled, along with
+what it depends on : the path, size, modification time and SHA-1 of the
+source, the settings of the parser and the encoding. A fragment is loaded
+from its cache file instead of being parsed if the size and modification time
+of the source did not change and it was not modified after the cache file
+was written, or if its content did not change (ex : the file has been
+touched).
+"""
+
+import configparser
+import hashlib
+import io
+import marshal
+import os
+
+from configparser_extended.reader import read_path
+
+# Version of the format of the cache files
+FORMAT = 2
+
+# Extension of the cache files
+SUFFIX = '.ecpc'
+
+
+def settings_key(settings, encoding):
+    """ Returns a digest of what the fragments depend on besides the content
+    of the files, or None if it cannot be known (a custom optionxform). """
+
+    if(settings['optionxform'] is not None):
+        return None
+    key = repr((FORMAT, encoding, settings['comment_prefixes'],
+                settings['inline_comment_prefixes'],
+                settings['empty_lines_in_values'], settings['strict'],
+                settings['dict_type'].__name__, settings['sectcre'].pattern,
+                settings['optcre'].pattern, settings['nonspacecre'].pattern,
+                settings.get('include')))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def file_signature(path):
+    """ Returns the (size, modification time) of a file, or None if it does
+    not exist. """
+
+    try:
+        st = os.stat(path)
+    except (IOError, OSError):
+        return None
+    return st.st_size, mtime(st)
+
+
+def mtime(st):
+    """ Returns the modification time of a stat() result, in nanoseconds
+    where available. """
+
+    return getattr(st, 'st_mtime_ns', st.st_mtime)
+
+
+def cache_path(path, cache):
+    """ Returns the path of the cache file of a source file : next to it if
+    cache is True, else in the cache directory. """
+
+    if(cache is True):
+        head, tail = os.path.split(path)
+        return os.path.join(head, '.' + tail + SUFFIX)
+    name = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()
+    return os.path.join(cache, name + SUFFIX)
+
+
+def file_digest(path):
+    """ Returns the SHA-1 of the content of a file. """
+
+    sha1 = hashlib.sha1()
+    with io.open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+def dump_fragment(fragment):
+    """ Converts a fragment into builtin types marshal can store. """
+
+    sections, error, includes = fragment
+    sections = [(name, tuple(options), tuple(options.values()))
+                for name, options in sections.items()]
+    if(error is not None):
+        error = (error[0].__name__, error[1])
+    return sections, error, includes
+
+
+def load_fragment(data, dict_type):
+    """ Converts the result of dump_fragment() back into a fragment. """
+
+    sections, error, includes = data
+    res = dict_type()
+    for name, keys, values in sections:
+        res[name] = dict_type(zip(keys, values))
+    if(error is not None):
+        error = (getattr(configparser, error[0]), error[1])
+    return res, error, includes
+
+
+def cached_read_path(path, encoding, settings, use_mmap=False, cache=None):
+    """ Same as reader.read_path(), the fragment being loaded from or stored
+    in the cache when cache is True (cache files next to the sources) or a
+    directory. """
+
+    key = None
+    if(cache):
+        if(hasattr(path, '__fspath__')):
+            path = path.__fspath__()
+        if(not isinstance(path, bytes)):
+            key = settings_key(settings, encoding)
+    if(key is None):
+        return read_path(path, encoding, settings, use_mmap)
+    signature = file_signature(path)
+    if(signature is None):
+        return None
+    cpath = cache_path(path, cache)
+    stored = None
+    try:
+        with io.open(cpath, 'rb') as f:
+            written = mtime(os.fstat(f.fileno()))
+            stored = marshal.loads(f.read())
+    except (IOError, OSError, EOFError, ValueError, TypeError):
+        pass
+    digest = None
+    if(isinstance(stored, tuple) and len(stored) == 7 and
+       stored[:3] == (FORMAT, key, path)):
+        # As in git's index, an entry written during the same tick as the
+        # last change of the source is racy : the source may have been
+        # changed again in that tick without its signature changing, its
+        # content is compared then
+        if(stored[3:5] == signature and signature[1] < written):
+            return load_fragment(stored[6], settings['dict_type'])
+        try:
+            digest = file_digest(path)
+        except (IOError, OSError):
+            return None
+        if(stored[5] == digest):
+            fragment = load_fragment(stored[6], settings['dict_type'])
+            store(cpath, (FORMAT, key, path) + signature + (digest,
+                                                            stored[6]))
+            return fragment
+
+    fragment = read_path(path, encoding, settings, use_mmap)
+    if(fragment is None):
+        return None
+    try:
+        if(digest is None):
+            digest = file_digest(path)
+    except (IOError, OSError):
+        return fragment
+    store(cpath, (FORMAT, key, path) + signature + (
+        digest, dump_fragment(fragment)))
+    return fragment
+
+
+def store(cpath, data):
+    """ Writes a cache file atomically. Errors (ex : read-only directory) are
+    ignored, the cache being only an optimization. """
+
+    tmp = '{0}.{1}.{2}.tmp'.format(cpath, os.getpid(), id(data))
+    try:
+        directory = os.path.dirname(cpath)
+        if(directory and not os.path.isdir(directory)):
+            os.makedirs(directory)
+        with io.open(tmp, 'wb') as f:
+            marshal.dump(data, f)
+        if(hasattr(os, 'replace')):
+            os.replace(tmp, cpath)
+        else:
+            os.rename(tmp, cpath)
+    except (IOError, OSError, ValueError):
+        try:
+            os.remove(tmp)
+        except (IOError, OSError):
+            pass
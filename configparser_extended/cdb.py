@@ -0,0 +1,496 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of configparser_extended library
+# released under the MIT license.
+# See the LICENSE file for more information.
+
+""" Constant database (cdb) export of a configuration resolved for one config
+name, and its read-only reader.
+
+write_cdb() stores the values freeze() would return in a cdb file, the
+on-disk hash table format of D. J. Bernstein (cdbdump can list it) : the
+value of an option of a section is stored under the key section\\0option, and
+two kinds of records describe the configuration, under keys starting with
+\\0 : the config name, list separator, config names and section names, and
+the option names of every section (the ones get() finds and the ones the
+section and its parents define, for has_option() and options()). CdbConfig
+memory-maps the file, so that the processes opening it share one copy through
+the page cache, and looks the keys up without loading anything else. It
+mimics the lookup methods of ExtendedConfigParser (get(), getint(),
+has_option(), items(), ...) and accepts their parameters.
+"""
+
+import configparser
+import json
+import mmap
+import os
+import struct
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+from configparser import NoOptionError, NoSectionError
+
+# Version of the records describing the configuration
+FORMAT = 2
+
+_UNSET = object()
+_META = b'\0meta'
+_OPTIONS = b'\0options\0'
+_PAIR = struct.Struct('<II')
+
+
+def cdb_hash(key):
+    """ Returns the hash of a key, as computed by cdb. """
+
+    h = 5381
+    for c in bytearray(key):
+        h = ((h << 5) + h ^ c) & 0xffffffff
+    return h
+
+
+def write_cdb(parser, path, config_name=None, sect_first=True,
+              cfg_plus=False):
+    """ Writes the sections of a parser resolved for a config name (the
+    current one if None) to a cdb file, replaced atomically. Returns the
+    number of sections written. """
+
+    if(config_name is None):
+        config_name = parser.config_name
+    tmp = '{0}.{1}.tmp'.format(path, os.getpid())
+    try:
+        with open(tmp, 'wb') as f:
+            count = _write_records(parser, f, config_name, sect_first,
+                                   cfg_plus)
+        if(hasattr(os, 'replace')):
+            os.replace(tmp, path)
+        else:
+            if(os.path.exists(path)):
+                os.remove(path)
+            os.rename(tmp, path)
+    except BaseException:
+        if(os.path.exists(tmp)):
+            os.remove(tmp)
+        raise
+    return count
+
+
+def _write_records(parser, f, config_name, sect_first, cfg_plus):
+    """ Writes the records of a cdb file, then its hash tables and its
+    header. """
+
+    # Hash tables : (hash, position) of the records of every one of them
+    tables = [[] for i in range(256)]
+    state = {'pos': 2048}
+
+    def add(key, data):
+        h = cdb_hash(key)
+        tables[h & 255].append((h, state['pos']))
+        f.write(_PAIR.pack(len(key), len(data)))
+        f.write(key)
+        f.write(data)
+        state['pos'] += _PAIR.size + len(key) + len(data)
+        if(state['pos'] > 0xffffffff):
+            raise ValueError('the configuration is too large for a cdb file')
+
+    f.write(b'\0' * 2048)
+    sections = []
+    names = {}
+    for name, values in parser.iter_resolved(config_name, sect_first,
+                                             cfg_plus):
+        prefix = name.encode('utf-8') + b'\0'
+        for option, value in values.items():
+            add(prefix + option.encode('utf-8'), value.encode('utf-8'))
+        # The options with a config name (ex : option[config]) get() finds
+        # are stored as well, without being part of the section
+        for option, value in parser._resolve_many(
+                name, [o for o in parser.options(name) if '[' in o],
+                config_name, sect_first, cfg_plus).items():
+            add(prefix + option.encode('utf-8'), value.encode('utf-8'))
+        add(_OPTIONS + name.encode('utf-8'),
+            json.dumps(_defined_options(parser, name, config_name,
+                                        values)).encode('utf-8'))
+        sections.append(name)
+        full_name = parser.get_section_name(name)
+        if(full_name != name):
+            names[full_name] = name
+    add(_META, json.dumps({
+        'format': FORMAT,
+        'config_name': config_name,
+        'list_separator': parser.list_separator,
+        'configs': parser._get_configs(config_name),
+        'configs_plus': parser._get_configs(config_name, True),
+        'defaults': _default_options(parser),
+        'lower': (getattr(parser.optionxform, '__func__', None) is
+                  configparser.RawConfigParser.optionxform),
+        'sections': sections,
+        'names': names,
+    }).encode('utf-8'))
+
+    header = []
+    for table in tables:
+        # Twice as many slots as records, each record at the first free slot
+        # from the one its hash gives
+        size = len(table) * 2
+        slots = [(0, 0)] * size
+        for h, pos in table:
+            i = (h >> 8) % size
+            while(slots[i][1]):
+                i = (i + 1) % size
+            slots[i] = (h, pos)
+        header.append((state['pos'], size))
+        for h, pos in slots:
+            f.write(_PAIR.pack(h, pos))
+        state['pos'] += _PAIR.size * size
+    if(state['pos'] > 0xffffffff):
+        raise ValueError('the configuration is too large for a cdb file')
+    f.seek(0)
+    f.write(b''.join(_PAIR.pack(pos, size) for pos, size in header))
+    return len(sections)
+
+
+def _defined_options(parser, name, config_name, values):
+    """ Returns the option names of a section : the ones get() finds, and
+    the ones the section and its parents (chain) or the section alone (own)
+    define for any config name or for config_name (the *_config ones), as
+    has_option() and options(cfg_ind=True) return them, the names with a
+    config name (ex : option[config]) included in the latter. """
+
+    chain = parser.options(name, cfg_ind=True)
+    own = parser.options(name, strict=True, cfg_ind=True)
+    specs = [[o for o in parser.options(s, strict=True) if '[' in o]
+             for s in parser._corresponding_sections(name)]
+    return {
+        'values': list(values),
+        'chain': chain,
+        'own': own,
+        'chain_config': [o for o in chain if parser.has_option(
+            name, o, config_name)] + sum(specs, []),
+        'own_config': [o for o in own if parser.has_option(
+            name, o, config_name, strict=True)] + specs[0],
+    }
+
+
+def _default_options(parser):
+    """ Returns the option names of DEFAULT and of the defaults, without
+    their config names, as options(defaults=True) adds them. """
+
+    res = []
+    for section in (parser.default_section, parser.father):
+        for o in section or ():
+            if('[' in o):
+                o = o[:o.find('[')]
+            if(o not in res):
+                res.append(o)
+    return res
+
+
+class CdbConfig(Mapping):
+    """ A read-only configuration memory-mapped from a file written by
+    write_cdb() : a mapping of compact section names to CdbSections, with
+    the lookup methods of ExtendedConfigParser and their parameters. The
+    values are the resolved ones, so raw, sect_first and cfg_plus are ignored
+    except for vars, looked up as get() does. Sections may also be accessed
+    with their full name (ex : sect1:sect2:sect3). """
+
+    __slots__ = ('_buf', '_file', '_sections', '_names', '_config_name',
+                 'list_separator', '_lower', '_options', '_configs',
+                 '_defaults')
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._buf = mmap.mmap(self._file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+            meta = self._find(_META)
+            if(meta is None):
+                raise ValueError('{0} is not a configuration cdb file'.format(
+                    path))
+            meta = json.loads(meta.decode('utf-8'))
+            if(meta.get('format') != FORMAT):
+                raise ValueError('{0} has an unknown format'.format(path))
+        except BaseException:
+            self.close()
+            raise
+        self._sections = dict((name, i) for i, name in
+                              enumerate(meta['sections']))
+        self._names = meta['names']
+        self._config_name = meta['config_name']
+        self.list_separator = meta['list_separator']
+        # Config names get() looks vars up with, without and with cfg_plus
+        self._configs = (meta['configs'], meta['configs_plus'])
+        self._defaults = meta['defaults']
+        # The option names are lowered as the parser did
+        self._lower = meta['lower']
+        # Compact section name -> its option names (see _defined_options()),
+        # once looked up
+        self._options = {}
+
+    def close(self):
+        """ Unmaps and closes the file. """
+
+        buf = getattr(self, '_buf', None)
+        if(buf is not None):
+            buf.close()
+            self._buf = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def config_name(self):
+        return self._config_name
+
+    def _find(self, key):
+        """ Returns the data stored under a key, or None. """
+
+        buf = self._buf
+        h = cdb_hash(key)
+        pos, size = _PAIR.unpack_from(buf, (h & 255) * _PAIR.size)
+        if(not size):
+            return None
+        start = (h >> 8) % size
+        for i in range(size):
+            slot = pos + (start + i) % size * _PAIR.size
+            slot_hash, record = _PAIR.unpack_from(buf, slot)
+            if(not record):
+                return None
+            if(slot_hash == h):
+                klen, dlen = _PAIR.unpack_from(buf, record)
+                record += _PAIR.size
+                if(buf[record:record + klen] == key):
+                    return buf[record + klen:record + klen + dlen]
+        return None
+
+    def _section(self, section):
+        """ Returns the compact name of a section, or raises
+        NoSectionError. """
+
+        if(section in self._sections):
+            return section
+        try:
+            return self._names[section]
+        except KeyError:
+            raise NoSectionError(section)
+
+    def __getitem__(self, key):
+        try:
+            return CdbSection(self, self._section(key))
+        except NoSectionError:
+            raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self.sections())
+
+    def __len__(self):
+        return len(self._sections)
+
+    def __contains__(self, key):
+        return key in self._sections or key in self._names
+
+    def __repr__(self):
+        return '<CdbConfig: {0}>'.format(self._config_name)
+
+    def sections(self):
+        """ Returns the list of the compact section names. """
+
+        return sorted(self._sections, key=self._sections.get)
+
+    def has_section(self, section):
+        return section in self
+
+    def _option_names(self, sect):
+        """ Returns the option names of a section (see
+        _defined_options()). """
+
+        try:
+            return self._options[sect]
+        except KeyError:
+            pass
+        options = json.loads(self._find(
+            _OPTIONS + sect.encode('utf-8')).decode('utf-8'))
+        self._options[sect] = options
+        return options
+
+    def _check_config(self, config):
+        """ Raises ValueError if config is not the config name written (''
+        standing for it). """
+
+        if(config and config != self._config_name):
+            raise ValueError('the file has been written for the config name '
+                             '{0}, not {1}'.format(self._config_name, config))
+
+    def options(self, section, strict=False, defaults=False, cfg_ind=False):
+        """ Returns the list of the option names a section can reach, the
+        ones get() finds. If strict or cfg_ind is True, returns the ones the
+        parser would return with cfg_ind True : the config names being
+        resolved, the option names never have one. """
+
+        names = self._option_names(self._section(section))
+        if(strict):
+            res = list(names['own'])
+            if(defaults):
+                res += [o for o in self._defaults if o not in res]
+            return res
+        if(cfg_ind):
+            return list(names['chain'])
+        return list(names['values'])
+
+    def has_option(self, section, option, config='', cfg_ind=False,
+                   strict=False):
+        """ Returns True if the option is defined in the section or its
+        parents (in the section alone if strict is True) for the config name
+        written (for any config name if cfg_ind is True), as the parser does.
+        config must be '' or the config name written. """
+
+        self._check_config(config)
+        if(section not in self):
+            return False
+        # As in the parser, only the lookup for a config name lowers it
+        if(self._lower and not cfg_ind):
+            option = option.lower()
+        names = self._option_names(self._section(section))
+        key = 'own' if strict else 'chain'
+        if(not cfg_ind):
+            key += '_config'
+        return option in names[key]
+
+    def _lookup(self, sect, option):
+        """ Returns the record of an option of a section, or None. """
+
+        if(self._lower):
+            option = option.lower()
+        return self._find(sect.encode('utf-8') + b'\0' +
+                          option.encode('utf-8'))
+
+    def get(self, section, option, raw=False, vars=None, fallback=_UNSET,
+            sect_first=True, cfg_plus=False, isList=False):
+        """ Returns the value of an option of a section, as the parser
+        written would have returned it. vars (a dictionary) overrides the
+        values stored, its keys with a config name first, in the order get()
+        looks them up. """
+
+        try:
+            sect = self._section(section)
+        except NoSectionError:
+            if(fallback is _UNSET):
+                raise
+            return fallback
+        value = None
+        if(vars is not None):
+            for c in self._configs[bool(cfg_plus)]:
+                value = vars.get(option + '[' + c + ']')
+                if(value is not None):
+                    break
+            if(value is None):
+                value = vars.get(option)
+        if(value is None):
+            data = self._lookup(sect, option)
+            if(data is None):
+                if(fallback is _UNSET):
+                    raise NoOptionError(option, section)
+                return fallback
+            value = data.decode('utf-8')
+        if(isList):
+            return value.split(self.list_separator)
+        return value
+
+    def _get_converted(self, section, option, convert, vars, fallback,
+                       isList):
+        res = self.get(section, option, vars=vars, fallback=fallback,
+                       isList=isList)
+        if(res is fallback and fallback is not _UNSET):
+            return res
+        if(isList):
+            return [convert(i) for i in res]
+        return convert(res)
+
+    def getint(self, section, option, raw=False, vars=None, fallback=_UNSET):
+        return self._get_converted(section, option, int, vars, fallback,
+                                   False)
+
+    def getfloat(self, section, option, raw=False, vars=None,
+                 fallback=_UNSET):
+        return self._get_converted(section, option, float, vars, fallback,
+                                   False)
+
+    def getboolean(self, section, option, raw=False, vars=None,
+                   fallback=_UNSET):
+        return self._get_converted(section, option, _str_to_bool, vars,
+                                   fallback, False)
+
+    def getintlist(self, section, option, raw=False, vars=None,
+                   fallback=_UNSET):
+        return self._get_converted(section, option, int, vars, fallback,
+                                   True)
+
+    def getfloatlist(self, section, option, raw=False, vars=None,
+                     fallback=_UNSET):
+        return self._get_converted(section, option, float, vars, fallback,
+                                   True)
+
+    def getbooleanlist(self, section, option, raw=False, vars=None,
+                       fallback=_UNSET):
+        return self._get_converted(section, option, _str_to_bool, vars,
+                                   fallback, True)
+
+    def items(self, section=_UNSET, raw=False, vars=None, strict=False,
+              defaults=False):
+        """ Returns the list of the (name, value) pairs of a section, or of
+        the (name, CdbSection) pairs if section is not given. If strict is
+        True, only the options of options(section, strict, defaults) that
+        get() finds are listed. """
+
+        if(section is _UNSET or section is None):
+            return [(name, self[name]) for name in self.sections()]
+        sect = self._section(section)
+        res = []
+        for option in self.options(sect, strict, defaults):
+            value = self.get(sect, option, vars=vars, fallback=None)
+            if(value is not None):
+                res.append((option, value))
+        return res
+
+
+class CdbSection(Mapping):
+    """ A read-only mapping of the options of a section of a CdbConfig. """
+
+    __slots__ = ('_config', '_name')
+
+    def __init__(self, config, name):
+        self._config = config
+        self._name = name
+
+    @property
+    def name(self):
+        return self._name
+
+    def __getitem__(self, key):
+        try:
+            return self._config.get(self._name, key)
+        except NoOptionError:
+            raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._config.options(self._name))
+
+    def __len__(self):
+        return len(self._config.options(self._name))
+
+    def __contains__(self, key):
+        return self._config._lookup(self._name, key) is not None
+
+    def __repr__(self):
+        return '<CdbSection: {0}>'.format(self._name)
+
+
+def _str_to_bool(string):
+    try:
+        return configparser.ConfigParser.BOOLEAN_STATES[string.lower()]
+    except KeyError:
+        raise ValueError(string + ' is not a boolean')
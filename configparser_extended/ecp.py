@@ -5,13 +5,32 @@
 # See the LICENSE file for more information.
 
 import configparser
+import copy
+import functools
+import glob
+import io
+import itertools
+import locale
+import os
+import re
+import sys
+import threading
+import time
 from configparser import NoOptionError, NoSectionError
 try:
     from backports.configparser.helpers import OrderedDict
 except ImportError:
     from collections import OrderedDict
 
-from six import u
+from six import string_types, text_type, u
+
+from configparser_extended import aio, lazy, reader
+from configparser_extended.frozen import FrozenConfig, FrozenSection
+from configparser_extended.cache import cached_read_path, file_signature
+try:
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = ProcessPoolExecutor = None
 
 
 # Used in parser getters to indicate the default behaviour when a specific
@@ -19,6 +38,63 @@ from six import u
 # a valid fallback value.
 _UNSET = object()
 
+# Characters making a filename a glob pattern
+_GLOB_MAGIC = re.compile('[*?[]')
+
+try:
+    _clock = time.perf_counter
+except AttributeError:
+    _clock = time.time
+
+# Counters kept by ExtendedConfigParser.stats()
+_STATS_COUNTERS = ('get', 'sections_probed', 'configs_probed',
+                   'option_misses', 'hits_vars', 'hits_section',
+                   'hits_default', 'hits_father', 'hits_fallback',
+                   'hits_compiled', 'errors_no_option', 'errors_no_section')
+
+# Interpolations only reading the section of the value and its parents (or
+# none at all)
+_LOCAL_INTERPOLATIONS = (configparser.BasicInterpolation,
+                         configparser.Interpolation)
+
+# Number of buckets of the latency histograms
+_HISTOGRAM_SIZE = 24
+
+# Strings accepted by str_to_bool()
+_BOOLEAN_STATES = {'true': True, 'yes': True, 'on': True, '1': True,
+                   'false': False, 'no': False, 'off': False, '0': False}
+
+
+# What the changes made to a fork of a parser (see
+# ExtendedConfigParser._fork()) may change
+_FORK_STATE = ('_sections', '_proxies', '_section_names', '_specs',
+               'default_section', '_chains', '_configs', '_keys', '_resolved',
+               '_typed', '_stale', '_generation', '_sources', '_reads',
+               '_read_calls', '_strings', '_strings_kept',
+               '_strings_dropped')
+
+
+def _is_bytes_path(path):
+    """ Returns True for the bytes paths of Python 3 (the str paths of Python
+    2 are native ones). """
+
+    return isinstance(path, bytes) and not isinstance(path, str)
+
+
+def _locked(method):
+    """ Decorates the lookup methods : they hold the lock of the parser while
+    it has one, so that the reloads of its watcher thread do not change it
+    under them (see ExtendedConfigParser.watch()). """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        lock = self._lock
+        if(lock is None):
+            return method(self, *args, **kwargs)
+        with lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 class ExtendedConfigParser(configparser.ConfigParser):
 
@@ -30,7 +106,9 @@ class ExtendedConfigParser(configparser.ConfigParser):
     section_separator = ':'
     list_separator = ';'
     inheritance = 'explicit'
-    father = {}     # Contains the defaults values
+    father = None   # Contains the defaults values, see __init__()
+    concurrent = False
+    _lock = None
 
     def __init__(self,
                  defaults=None,
@@ -41,9 +119,73 @@ class ExtendedConfigParser(configparser.ConfigParser):
                  section_separator=':',
                  list_separator=';',
                  inheritance='explicit',
+                 compiled=False,
+                 typed_cache=False,
+                 stats=False,
+                 reloadable=False,
+                 include_directive=None,
+                 concurrent=False,
+                 intern_strings=False,
                  **kwargs
                  ):
 
+        # Resolution index built by compile(), None while it is disabled
+        self.compiled = compiled
+        self._resolved = None
+        # True when the parser changed since the index was compiled : it is
+        # compiled again by the next lookup, see _compile_later()
+        self._stale = False
+        # Converted values of the typed getters, None while it is disabled
+        if(typed_cache and concurrent):
+            raise ValueError('typed_cache cannot be used by concurrent '
+                             'parsers')
+        self._typed = {} if typed_cache else None
+        # Lookup counters, None while they are disabled, see stats()
+        self._stats = None
+        if(stats):
+            self.enable_stats()
+        # Compact section name -> full section name (ex : sect1 ->
+        # sect1:sect2:sect3)
+        self._section_names = {}
+        # (section, implicit) -> tuple of the corresponding sections
+        self._chains = {}
+        # (config, config_separator, plus) -> tuple of config names
+        self._configs = {}
+        # (option, config, config_separator, plus, empty_bare) -> see
+        # _option_keys()
+        self._keys = {}
+        # Section -> specification index, see _get_specs()
+        self._specs = {}
+        # Number of changes, the views of the section proxies being built
+        # again after each one, see SectionProxyExtended
+        self._generation = 0
+        # Fragments read, in order, None unless reloadable, see reload() :
+        # [path (None if not a file), signature, fragment, read call number]
+        self._sources = [] if reloadable else None
+        # Read call number -> how to load its files again, see
+        # _merge_files()
+        self._reads = {} if reloadable else None
+        self._read_calls = 0
+        # aio.Scheduler of the asynchronous methods (aread(), ...)
+        self._aio = None
+        # Prefix of the lines including other files (ex : '!include')
+        self.include_directive = include_directive
+        self._watcher = None
+        # Lock held by the lookups and the reloads while a watcher thread
+        # runs, see watch()
+        self._lock = None
+        # String -> itself, None unless intern_strings : the option names,
+        # config names and values read or set are replaced by the equal
+        # string already stored, if any, see memory_report(). The fragments
+        # kept by reloadable parsers keep their own strings. It is rebuilt
+        # from the strings stored once the options removed, replaced or
+        # reloaded may have left enough unused ones, see _drop_strings().
+        self._strings = {} if intern_strings else None
+        # Size of self._strings once last rebuilt
+        self._strings_kept = 0
+        # Number of strings the sections stopped referring to since then
+        self._strings_dropped = 0
+
         configparser.ConfigParser.__init__(self,
                                            defaults,
                                            dict_type,
@@ -64,11 +206,23 @@ class ExtendedConfigParser(configparser.ConfigParser):
                                                               configparser.
                                                               DEFAULTSECT)
 
+        # Empty until a DEFAULT section is read
+        self.default_section = self._dict()
+
         # Prevents the get() method from looking into defaults before
         # looking into potential parents
         self.father = self._defaults.copy()
         self._defaults = {}
 
+        # Read-mostly mode : the lookups (get(), items(), options(),
+        # has_option(), ...) do not store anything, the caches being filled
+        # whenever the parser changes instead (see _warm_caches()), so that
+        # threads can look values up without any lock. The changes must not
+        # run concurrently with the lookups though.
+        self.concurrent = concurrent
+        if(concurrent):
+            self._warm_caches()
+
     def get(self, section, option, raw=False, vars=None,
             fallback=_UNSET, sect_first=True, cfg_plus=False, isList=False):
         """ Returns the value corresponding to an option in a particular
@@ -93,8 +247,41 @@ class ExtendedConfigParser(configparser.ConfigParser):
 
         (sect_first = True) : option1 = toto1
         (sect_first = False) : option1 = toto_titi2
+
+        If the resolution index has been compiled (see compile()), the value
+        is served from the index instead of walking the sections again.
         """
 
+        if(self._lock is not None):
+            return self._get_locked(section, option, raw, vars, fallback,
+                                    sect_first, cfg_plus, isList)
+        if(self._stats is not None):
+            return self._get_traced(section, option, raw, vars, fallback,
+                                    sect_first, cfg_plus, isList)
+        if(self._resolved is not None and vars is None):
+            return self._get_compiled(section, option, raw, fallback,
+                                      sect_first, cfg_plus, isList)
+        if(sect_first):
+            return self.section_config_loop(section, option, raw, vars,
+                                            fallback, cfg_plus, isList)
+        else:
+            return self.config_section_loop(section, option, raw, vars,
+                                            fallback, cfg_plus, isList)
+
+    @_locked
+    def _get_locked(self, section, option, raw=False, vars=None,
+                    fallback=_UNSET, sect_first=True, cfg_plus=False,
+                    isList=False):
+        """ get() while a watcher thread may reload the parser (see watch()),
+        kept out of get() so that the other lookups do not pay for the
+        lock. """
+
+        if(self._stats is not None):
+            return self._get_traced(section, option, raw, vars, fallback,
+                                    sect_first, cfg_plus, isList)
+        if(self._resolved is not None and vars is None):
+            return self._get_compiled(section, option, raw, fallback,
+                                      sect_first, cfg_plus, isList)
         if(sect_first):
             return self.section_config_loop(section, option, raw, vars,
                                             fallback, cfg_plus, isList)
@@ -102,6 +289,661 @@ class ExtendedConfigParser(configparser.ConfigParser):
             return self.config_section_loop(section, option, raw, vars,
                                             fallback, cfg_plus, isList)
 
+    def _get_compiled(self, section, option, raw=False, fallback=_UNSET,
+                      sect_first=True, cfg_plus=False, isList=False):
+        """ Looks the option up in the resolution index and resolves it (then
+        stores it) if it is not there yet. """
+
+        if(self._stale):
+            self.compile()
+        key = (section, option, self.config_name, sect_first, cfg_plus, raw)
+        try:
+            result = self._resolved[key]
+        except KeyError:
+            try:
+                result = self._resolve(section, option, raw, sect_first,
+                                       cfg_plus)
+            except NoSectionError:
+                # Only section_config_loop() handles the fallback here
+                if(sect_first and fallback is not _UNSET):
+                    return fallback
+                raise
+            # Misses are not stored, so that probing unknown options or
+            # config names does not grow the index
+            if(not self.concurrent and result is not _UNSET):
+                self._resolved[key] = result
+
+        if(result is _UNSET):
+            if(fallback is _UNSET):
+                raise NoOptionError(option, section)
+            return fallback
+        if(isList):
+            result = self.convert_value_list(result)
+        return result
+
+    def _resolve(self, section, option, raw=False, sect_first=True,
+                 cfg_plus=False):
+        """ Returns the value of an option without using the resolution
+        index, or _UNSET if it cannot be found. """
+
+        try:
+            if(sect_first):
+                return self.section_config_loop(section, option, raw,
+                                                cfg_plus=cfg_plus)
+            else:
+                return self.config_section_loop(section, option, raw,
+                                                cfg_plus=cfg_plus)
+        except NoOptionError:
+            return _UNSET
+
+    def compile(self, sect_first=True, cfg_plus=False):
+        """ Builds the resolution index: every option reachable from every
+        section is resolved for the current config name and stored, so that
+        get() becomes a single dict lookup. Other combinations of config name,
+        sect_first and cfg_plus are added to the index the first time they
+        are looked up. The index is emptied whenever the parser changes.
+        Options which cannot be interpolated are left out, so that only
+        their lookups raise. """
+
+        self._stale = False
+        resolved = self._resolved = {}
+        config = self.config_name
+        for s in self._sections:
+            sect = self.get_section_name_compact(s)
+            try:
+                options = self._option_names(sect)
+                values = self._resolve_many(sect, options, config, sect_first,
+                                            cfg_plus)
+            except NoSectionError:
+                # A missing implicit parent, get() will raise as well
+                continue
+            except configparser.Error:
+                # Resolved one at a time to leave the failing ones out
+                values = {}
+                for option in options:
+                    try:
+                        values[option] = self._resolve(sect, option, False,
+                                                       sect_first, cfg_plus)
+                    except configparser.Error:
+                        # Left out of the index
+                        values[option] = None
+            for option in options:
+                key = (sect, option, config, sect_first, cfg_plus, False)
+                if(key not in resolved):
+                    value = values.get(option, _UNSET)
+                    if(value is not None):
+                        resolved[key] = value
+
+    @_locked
+    def get_many(self, section, options, raw=False, vars=None,
+                 fallback=_UNSET, sect_first=True, cfg_plus=False):
+        """ Returns an OrderedDict of the values of several options of a
+        section, the ones get() would return one by one. The inheritance chain
+        and the config names are only processed once.
+
+        If an option cannot be found, fallback is used as its value or, if
+        fallback is not set, NoOptionError is raised. """
+
+        try:
+            values = self._resolve_many(section, options, None, sect_first,
+                                        cfg_plus, raw, vars)
+        except NoSectionError:
+            # Same behaviour as section_config_loop()
+            if(sect_first and fallback is not _UNSET):
+                return OrderedDict((o, fallback) for o in options)
+            raise
+        res = OrderedDict()
+        for option in options:
+            if(option in values):
+                res[option] = values[option]
+            elif(fallback is _UNSET):
+                raise NoOptionError(option, section)
+            else:
+                res[option] = fallback
+        return res
+
+    @_locked
+    def resolve_section(self, section, raw=False, vars=None, sect_first=True,
+                        cfg_plus=False):
+        """ Returns an OrderedDict of every option (without config
+        specification) which can be reached from a section : its own, its
+        parents', DEFAULT's and defaults', mapped to the value get() would
+        return. Options which cannot be found for the current config name are
+        left out. """
+
+        return self._resolve_many(section, self._option_names(section), None,
+                                  sect_first, cfg_plus, raw, vars)
+
+    def aget_many(self, section, options, raw=False, vars=None,
+                  fallback=_UNSET, sect_first=True, cfg_plus=False,
+                  executor=None):
+        """ Asynchronous get_many() : returns an awaitable of its result,
+        computed in executor (the default executor of the event loop if
+        None). It must be called in the thread of the event loop, and waits
+        for the changes made by aread(), aread_file() and areload(), which
+        wait for it in turn. The parser must not be changed otherwise
+        meanwhile. """
+
+        return self._scheduler().lookup(executor, functools.partial(
+            self.get_many, section, list(options), raw, vars, fallback,
+            sect_first, cfg_plus))
+
+    def aresolve_section(self, section, raw=False, vars=None,
+                         sect_first=True, cfg_plus=False, executor=None):
+        """ Asynchronous resolve_section(), see aget_many(). """
+
+        return self._scheduler().lookup(executor, functools.partial(
+            self.resolve_section, section, raw, vars, sect_first, cfg_plus))
+
+    @_locked
+    def _section_view(self, section):
+        """ Returns the (generation, config name, values, interpolated) of the
+        options a section can reach, see SectionProxyExtended. If one of them
+        cannot be interpolated, the values are the raw ones and interpolated
+        is False. """
+
+        generation = self._generation
+        options = self._option_names(section)
+        try:
+            values = self._resolve_many(section, options)
+            interpolated = True
+        except NoSectionError:
+            raise
+        except configparser.Error:
+            # Looked up one at a time by SectionProxyExtended.__getitem__()
+            values = self._resolve_many(section, options, raw=True)
+            interpolated = False
+        return generation, self.config_name, values, interpolated
+
+    @_locked
+    def freeze(self, config_name=None, sect_first=True, cfg_plus=False):
+        """ Returns a read-only FrozenConfig in which every section (under its
+        compact name) maps every option it can reach to the value get() would
+        return for the given config name (the current one if config_name is
+        None). Since it does not refer to the parser, it is not affected by
+        later changes and can be shared between threads. Sections which
+        cannot be resolved (missing implicit parent) are left out. """
+
+        if(config_name is None):
+            config_name = self.config_name
+        sections = OrderedDict()
+        names = {}
+        for sect, values in self.iter_resolved(config_name, sect_first,
+                                               cfg_plus):
+            sections[sect] = FrozenSection(sect, values)
+            full_name = self.get_section_name(sect)
+            if(full_name != sect):
+                names[full_name] = sect
+        return FrozenConfig(sections, names, config_name)
+
+    def iter_resolved(self, config_name=None, sect_first=True,
+                      cfg_plus=False):
+        """ Yields the (compact name, values) of every section, values mapping
+        every option it can reach to the value get() would return for the
+        given config name (the current one if config_name is None), as
+        freeze() does, but one section at a time (see the export module).
+        Sections which cannot be resolved are left out. """
+
+        if(config_name is None):
+            config_name = self.config_name
+        done = set()
+        for s in list(self._sections):
+            sect = self.get_section_name_compact(s)
+            if(sect in done):
+                continue
+            done.add(sect)
+            try:
+                values = self._resolve_many(sect, self._option_names(sect),
+                                            config_name, sect_first, cfg_plus)
+            except NoSectionError:
+                continue
+            yield sect, values
+
+    @_locked
+    def resolve_matrix(self, config_names, sections=None, sect_first=True,
+                       cfg_plus=False):
+        """ Returns an OrderedDict mapping every config name to the
+        FrozenConfig freeze() would return for it, restricted to the given
+        sections (compact or full names) if sections is not None.
+
+        Config names are placed in the prefix tree of the config names the
+        option specifications use (prod -> prod_eu -> prod_eu_fr) : the names
+        below the same node of the tree (ex : prod_eu_fr_paris and
+        prod_eu_fr_lyon when only prod_eu_fr is used) get the same values, so
+        they are resolved once and share their FrozenSections. With cfg_plus
+        (the suffixes of the names matter as well) or a custom optionxform,
+        only identical names are resolved once. """
+
+        if(sections is not None):
+            sections = [self.get_section_name_compact(
+                self.get_section_name(s)) for s in sections]
+        tags = self._config_tags()
+        # The empty config name stands for the option alone
+        tags.add('')
+        shared = (not cfg_plus and
+                  getattr(self.optionxform, '__func__', None) is
+                  configparser.RawConfigParser.optionxform)
+        sep = self.config_separator
+        resolved = {}
+        res = OrderedDict()
+        for name in config_names:
+            if(not shared or name in tags or name.lower() in tags):
+                node = name
+            else:
+                # The deepest config name of the tree which is a prefix of
+                # name stands for every name below it
+                for c in self._build_configs(name):
+                    if(c in tags or c.lower() in tags):
+                        node = (c,)
+                        break
+                else:
+                    node = (None,)
+            if(node not in resolved):
+                resolved[node] = self._resolve_node(node, tags, sep, sections,
+                                                    sect_first, cfg_plus)
+            frozen, names = resolved[node]
+            res[name] = FrozenConfig(frozen, names, name)
+        return res
+
+    def _resolve_node(self, node, tags, sep, sections, sect_first, cfg_plus):
+        """ Returns the (sections, full names) of a FrozenConfig for a node of
+        resolve_matrix(), node being either a config name or a 1-tuple of the
+        prefix (or None) shared by the names below it. """
+
+        if(isinstance(node, tuple)):
+            # A name below the prefix which no specification uses
+            config = '\0' if node[0] is None else node[0] + sep + '\0'
+            while(config in tags):
+                config += '\0'
+        else:
+            config = node
+        frozen = OrderedDict()
+        names = {}
+        if(sections is None):
+            for sect, values in self.iter_resolved(config, sect_first,
+                                                   cfg_plus):
+                frozen[sect] = FrozenSection(sect, values)
+        else:
+            for sect in sections:
+                values = self._resolve_many(sect, self._option_names(sect),
+                                            config, sect_first, cfg_plus)
+                frozen[sect] = FrozenSection(sect, values)
+        for sect in frozen:
+            full_name = self.get_section_name(sect)
+            if(full_name != sect):
+                names[full_name] = sect
+        return frozen, names
+
+    def _config_tags(self):
+        """ Returns the set of the config names used by the option
+        specifications of the sections, DEFAULT and defaults. """
+
+        tags = set()
+        for s in self._sections:
+            for values in self._get_specs(s).values():
+                tags.update(values)
+        for section in (self.default_section, self.father):
+            if(section):
+                tags.update(self._split_option(o)[1] for o in section)
+        tags.discard(None)
+        return tags
+
+    def _option_names(self, section):
+        """ Returns the option names, without config specification, which
+        can be reached from a section : its own, its parents', DEFAULT's and
+        defaults'. """
+
+        res = []
+        known = set()
+        for s in self._corresponding_sections(section):
+            for o in self._get_specs(s):
+                if(o not in known):
+                    known.add(o)
+                    res.append(o)
+        defaults = []
+        if(self.default_section is not None):
+            defaults += list(self.default_section.keys())
+        if(self.father is not None):
+            defaults += list(self.father.keys())
+        for o in defaults:
+            if('[' in o):
+                o = o[:o.find('[')]
+            if(o not in known):
+                known.add(o)
+                res.append(o)
+        return res
+
+    def _resolve_many(self, section, options, config=None, sect_first=True,
+                      cfg_plus=False, raw=False, vars=None, trace=None):
+        """ Returns an OrderedDict of the values of several options of a
+        section, options which cannot be found being left out. The values are
+        the ones section_config_loop() (or config_section_loop() if
+        sect_first is False) would return, but the inheritance chain, config
+        names and specification indexes are only looked up once. config None
+        stands for the current config name.
+
+        If trace is a dict of counters (see stats()), the probes made and the
+        places the values come from are counted in it. """
+
+        if(config is None):
+            config = self.config_name
+        chain = [(s, self._get_specs(s)) for s in
+                 self._corresponding_sections(section)]
+        configs = self._get_configs(config, cfg_plus)
+        default_section = self.default_section
+        if(default_section is None):
+            default_section = {}
+        father = self.father
+        if(father is None):
+            father = {}
+        res = OrderedDict()
+
+        for option in options:
+            if(option in res):
+                continue
+            keys = self._option_keys(option, config, cfg_plus)
+            result = None
+            source = 'vars'
+            if(sect_first):
+                if(vars is not None):
+                    for c in configs:
+                        result = vars.get(option + '[' + c + ']')
+                        if(result is not None):
+                            break
+                    if(result is None):
+                        result = vars.get(option)
+                if(result is None):
+                    source = 'section'
+                    result = self._probe_chain(chain, option, keys, raw,
+                                               trace)
+                if(result is None):
+                    # Same order as in section_config_loop() : the first
+                    # config name only, then the option alone
+                    spec = option + '[' + configs[0] + ']'
+                    source = 'default'
+                    if(option in default_section):
+                        result = default_section.get(spec)
+                    if(result is None and option in father):
+                        source = 'father'
+                        result = father.get(spec)
+                    if(result is None and option in default_section):
+                        source = 'default'
+                        result = default_section.get(option)
+                    if(result is None and option in father):
+                        source = 'father'
+                        result = father.get(option)
+            else:
+                if(config != '' and config is not None):
+                    for i in range(len(keys) - 1):
+                        spec = option + '[' + keys[i][0] + ']'
+                        if(vars is not None):
+                            source = 'vars'
+                            result = vars.get(spec)
+                            if(result is not None):
+                                break
+                        source = 'section'
+                        result = self._probe_chain(chain, option,
+                                                   keys[i:i + 1], raw, trace)
+                        if(result is not None):
+                            break
+                        # Same as in config_section_loop() : stop at the
+                        # first config name found in DEFAULT or defaults
+                        if(spec in default_section):
+                            source = 'default'
+                            result = default_section.get(spec)
+                            break
+                        if(spec in father):
+                            source = 'father'
+                            result = father.get(spec)
+                            break
+                if(result is None):
+                    if(vars is not None):
+                        source = 'vars'
+                        result = vars.get(option)
+                    if(result is None):
+                        source = 'section'
+                        result = self._probe_chain(chain, option, keys[-1:],
+                                                   raw, trace)
+                    if(result is None and option in default_section):
+                        source = 'default'
+                        result = default_section.get(option)
+                    if(result is None and option in father):
+                        source = 'father'
+                        result = father.get(option)
+            if(result is not None):
+                res[option] = result
+                if(trace is not None):
+                    trace['hits_' + source] += 1
+        return res
+
+    def _probe_chain(self, chain, option, keys, raw=False, trace=None):
+        """ Returns the value of the first key found in a list of (section,
+        specification index) pairs, or None. """
+
+        if(trace is not None):
+            return self._probe_chain_traced(chain, option, keys, raw, trace)
+        for s, specs in chain:
+            for c, opt, tag in keys:
+                values = specs.get(opt)
+                if(values is not None and values.get(tag) is not None):
+                    return self.get_result(s, option, raw, c)
+        return None
+
+    def _probe_chain_traced(self, chain, option, keys, raw, trace):
+        """ Same as _probe_chain(), counting the sections and config names
+        probed, and the misses (the NoOptionErrors find_option() would
+        swallow). """
+
+        for s, specs in chain:
+            trace['sections_probed'] += 1
+            for c, opt, tag in keys:
+                trace['configs_probed'] += 1
+                values = specs.get(opt)
+                if(values is not None and values.get(tag) is not None):
+                    return self.get_result(s, option, raw, c)
+                trace['option_misses'] += 1
+        return None
+
+    def enable_stats(self, enabled=True):
+        """ Starts (or stops, if enabled is False) counting what get() does,
+        see stats(). Counting starts from zero. When disabled, get() only pays
+        for one attribute check. """
+
+        if(enabled):
+            self._stats = dict((name, 0) for name in _STATS_COUNTERS)
+            self._stats['latency'] = {}
+        else:
+            self._stats = None
+
+    def reset_stats(self):
+        """ Sets every counter returned by stats() back to zero. """
+
+        self.enable_stats(self._stats is not None)
+
+    def stats(self):
+        """ Returns a snapshot of the counters kept since enable_stats() was
+        called (or since the parser has been created with stats=True), or None
+        if they are disabled :
+
+            - get : number of get() calls (the typed getters and the
+              lookups made by the interpolation included),
+            - sections_probed, configs_probed : sections and (section, config
+              name) pairs looked into,
+            - option_misses : probes which did not find the option (the
+              NoOptionErrors swallowed by find_option()),
+            - hits : number of values served from vars, sections, DEFAULT,
+              defaults (father), fallback or the compiled index,
+            - errors : NoOptionErrors and NoSectionErrors raised by get(),
+            - latency : for each lookup path (section_config_loop,
+              config_section_loop or compiled), the number of calls, their
+              total duration in seconds and an histogram of their durations :
+              {upper bound in microseconds: number of calls}.
+        """
+
+        stats = self._stats
+        if(stats is None):
+            return None
+        res = {
+            'get': stats['get'],
+            'sections_probed': stats['sections_probed'],
+            'configs_probed': stats['configs_probed'],
+            'option_misses': stats['option_misses'],
+            'hits': dict((name[5:], stats[name]) for name in _STATS_COUNTERS
+                         if name.startswith('hits_')),
+            'errors': {'no_option': stats['errors_no_option'],
+                       'no_section': stats['errors_no_section']},
+            'latency': {},
+        }
+        for path, (count, total, histogram) in stats['latency'].items():
+            res['latency'][path] = {
+                'count': count,
+                'total': total,
+                'histogram': OrderedDict((2 ** i, n) for i, n in
+                                         enumerate(histogram) if n),
+            }
+        return res
+
+    def _get_traced(self, section, option, raw=False, vars=None,
+                    fallback=_UNSET, sect_first=True, cfg_plus=False,
+                    isList=False):
+        """ get() used while stats are enabled : times the lookup, then
+        replays it with _resolve_many() to count what it did. """
+
+        stats = self._stats
+        stats['get'] += 1
+        if(self._resolved is not None and vars is None):
+            path = 'compiled'
+        elif(sect_first):
+            path = 'section_config_loop'
+        else:
+            path = 'config_section_loop'
+        start = _clock()
+        try:
+            if(path == 'compiled'):
+                result = self._get_compiled(section, option, raw, fallback,
+                                            sect_first, cfg_plus, isList)
+            elif(sect_first):
+                result = self.section_config_loop(section, option, raw, vars,
+                                                  fallback, cfg_plus, isList)
+            else:
+                result = self.config_section_loop(section, option, raw, vars,
+                                                  fallback, cfg_plus, isList)
+        except NoOptionError:
+            stats['errors_no_option'] += 1
+            raise
+        except NoSectionError:
+            stats['errors_no_section'] += 1
+            raise
+        finally:
+            self._record_latency(path, _clock() - start)
+
+        if(path == 'compiled'):
+            stats['hits_compiled'] += 1
+            return result
+        # Raw values are enough to know where the value comes from, and do not
+        # trigger the (counted) lookups of the interpolation
+        try:
+            found = self._resolve_many(section, [option], None, sect_first,
+                                       cfg_plus, True, vars, trace=stats)
+        except NoSectionError:
+            found = {}
+        if(option not in found):
+            stats['hits_fallback'] += 1
+        return result
+
+    def _record_latency(self, path, duration):
+        """ Adds a duration (in seconds) to the latency stats of a path. """
+
+        latency = self._stats['latency']
+        if(path not in latency):
+            latency[path] = [0, 0.0, [0] * _HISTOGRAM_SIZE]
+        entry = latency[path]
+        entry[0] += 1
+        entry[1] += duration
+        # Bucket i counts the calls which lasted less than 2 ** i us
+        us = duration * 1000000
+        bucket = 0
+        while(us >= 1 and bucket < _HISTOGRAM_SIZE - 1):
+            us /= 2
+            bucket += 1
+        entry[2][bucket] += 1
+
+    def _clear_caches(self, structure=False):
+        """ Empties every structure derived from the parsed content. Called
+        whenever the parser content or its settings change. structure is True
+        when sections have been added or removed, or when the way they
+        inherit from each other changed. """
+
+        self._generation += 1
+        if(structure):
+            self._chains = {}
+        if(self._resolved is not None):
+            self._resolved = {}
+        if(self._typed is not None):
+            self._typed = {}
+        if(self.concurrent):
+            self._warm_caches()
+            if(self._resolved is not None):
+                # Its lookups do not store anything either
+                self.compile()
+
+    def _warm_caches(self):
+        """ Fills the caches the lookups of a concurrent parser do not fill :
+        the specification index of every section, the inheritance chain of
+        every section name, the config names of the current config name and
+        the keys of every option reachable for it. """
+
+        specs = self._specs
+        options = set()
+        # The interpolation looks the raw values up by their full key
+        tagged = set()
+        for s in self._sections:
+            if(s not in specs):
+                specs[s] = self._build_specs(s)
+            options.update(specs[s])
+            tagged.update(o for o in self._sections[s] if '[' in o)
+        for section in (self.default_section, self.father):
+            if(section):
+                options.update(self._split_option(o)[0] for o in section)
+
+        names = list(self._sections) + list(self._section_names)
+        # The implicit chains are built from the explicit ones
+        for implicit in sorted(set([False, self._implicit()])):
+            for name in names:
+                key = (name, implicit)
+                if(key in self._chains):
+                    continue
+                try:
+                    if(implicit):
+                        chain = self._build_chain_inheritance(name)
+                    else:
+                        chain = self._build_chain(name)
+                except NoSectionError:
+                    continue
+                self._chains[key] = chain
+
+        config = self.config_name
+        for plus in (False, True):
+            key = (config, self.config_separator, plus)
+            if(key not in self._configs):
+                if(plus):
+                    self._configs[key] = self._build_configs_plus(config)
+                else:
+                    self._configs[key] = self._build_configs(config)
+        for option in options:
+            for plus, empty_bare in ((False, True), (True, True),
+                                     (False, False)):
+                key = (option, config, self.config_separator, plus,
+                       empty_bare)
+                if(key not in self._keys):
+                    self._keys[key] = self._build_option_keys(
+                        option, config, plus, empty_bare)
+        for option in tagged:
+            key = (option, config, self.config_separator, False, True)
+            if(key not in self._keys):
+                self._keys[key] = self._build_option_keys(option, config,
+                                                          False, True)
+
     def section_config_loop(self, section, option, raw=False, vars=None,
                             fallback=_UNSET, cfg_plus=False, isList=False):
         """ Loops on the configs inside a section
@@ -119,16 +961,13 @@ class ExtendedConfigParser(configparser.ConfigParser):
         # NoSectionError:
         if fallback != _UNSET:
             try:
-                sections = self.get_corresponding_sections(section)
+                sections = self._corresponding_sections(section)
             except NoSectionError:
                 return fallback
         else:
-            sections = self.get_corresponding_sections(section)
+            sections = self._corresponding_sections(section)
 
-        if(not cfg_plus):
-            configs = self.get_configs()
-        else:
-            configs = self.get_configs_plus()
+        configs = self._get_configs(plus=cfg_plus)
 
         if(vars is not None):
             for c in configs:
@@ -138,17 +977,16 @@ class ExtendedConfigParser(configparser.ConfigParser):
                 return vars.get(option)
 
         # Loop on the list of sections
+        keys = self._option_keys(option, plus=cfg_plus)
         for s in sections:
-            # Loop on the config names
-            for c in configs:
-                if(self.get_result(s, option, raw, c, isList=isList) is
-                   not None):
+            specs = self._get_specs(s)
+            # Loop on the config names, then look for the option without any
+            # specific config name
+            for c, opt, tag in keys:
+                values = specs.get(opt)
+                if(values is not None and values.get(tag) is not None):
                     return self.get_result(s, option, raw, c, isList=isList)
 
-            # Look for the option without any specific config name
-            if(self.get_result(s, option, raw, isList=isList) is not None):
-                return self.get_result(s, option, raw, isList=isList)
-
         # Look for the option in the DEFAULT section, in defaults and, finally,
         # in fallback
         for c in configs:
@@ -193,15 +1031,12 @@ class ExtendedConfigParser(configparser.ConfigParser):
         """
 
         result = None
-        sections = self.get_corresponding_sections(section)
-        if(not cfg_plus):
-            configs = self.get_configs()
-        else:
-            configs = self.get_configs_plus()
+        sections = self._corresponding_sections(section)
+        keys = self._option_keys(option, plus=cfg_plus)
 
         if(self.config_name != '' and self.config_name is not None):
             # Loop on the config names
-            for c in configs:
+            for c, opt, tag in keys[:-1]:
 
                 # Search into vars
                 if(vars is not None):
@@ -210,8 +1045,8 @@ class ExtendedConfigParser(configparser.ConfigParser):
 
                 # Loop on the list of sections
                 for s in sections:
-                    if(self.get_result(s, option, raw, c, isList=isList) is
-                       not None):
+                    values = self._get_specs(s).get(opt)
+                    if(values is not None and values.get(tag) is not None):
                         return self.get_result(s, option, raw, c,
                                                isList=isList)
 
@@ -234,8 +1069,10 @@ class ExtendedConfigParser(configparser.ConfigParser):
                     return vars.get(option)
 
             # Loop on the list of sections
+            c, opt, tag = keys[-1]
             for s in sections:
-                if(self.get_result(s, option, raw, isList=isList) is not None):
+                values = self._get_specs(s).get(opt)
+                if(values is not None and values.get(tag) is not None):
                     return self.get_result(s, option, raw, isList=isList)
 
             # Look for the option in the DEFAULT section, in defaults and,
@@ -259,6 +1096,91 @@ class ExtendedConfigParser(configparser.ConfigParser):
             result = self.convert_value_list(result)
         return result
 
+    def _get_specs(self, section):
+        """ Returns the specification index of an actual section : every
+        option name is mapped to a dict {config specification: value}, the
+        option without any config name being stored under None.
+
+        ex : key1=val1 and key1[dev]=dev1 => {'key1': {None: 'val1',
+                                                       'dev': 'dev1'}}
+        """
+
+        try:
+            return self._specs[section]
+        except KeyError:
+            pass
+        specs = self._build_specs(section)
+        if(not self.concurrent):
+            self._specs[section] = specs
+        return specs
+
+    def _build_specs(self, section):
+        """ Builds the index returned by _get_specs(). """
+
+        strings = self._strings
+        specs = OrderedDict()
+        for key, value in self._sections[section].items():
+            opt, tag = self._split_option(key)
+            if(strings is not None):
+                opt = strings.setdefault(opt, opt)
+                tag = strings.setdefault(tag, tag)
+            values = specs.get(opt)
+            if(values is None):
+                values = specs[opt] = {}
+            values[tag] = value
+        return specs
+
+    def _split_option(self, key):
+        """ Splits an option key into its name and its config
+        specification.
+
+        ex : key1[dev] => (key1, dev) and key1 => (key1, None)
+        """
+
+        i = key.find('[')
+        if(i == -1):
+            return key, None
+        if(key[-1] == ']'):
+            return key[:i], key[i + 1:-1]
+        # Not a specification, only reachable through the whole key
+        return key[:i], (key,)
+
+    def _option_keys(self, option, config=None, plus=False, empty_bare=True):
+        """ Returns a (cached) tuple of (config name, option name,
+        specification) triples : one for every config name returned by
+        get_configs() (or get_configs_plus() if plus is True), giving where
+        option[config name] is stored in the specification index, followed
+        by the one of the option without any config name. Just as in
+        find_option(), an empty config name stands for the option without
+        config name unless empty_bare is False. config None stands for the
+        current config name. """
+
+        if(config is None):
+            config = self.config_name
+        key = (option, config, self.config_separator, plus, empty_bare)
+        try:
+            return self._keys[key]
+        except KeyError:
+            pass
+        keys = self._build_option_keys(option, config, plus, empty_bare)
+        if(not self.concurrent):
+            self._keys[key] = keys
+        return keys
+
+    def _build_option_keys(self, option, config, plus, empty_bare):
+        """ Builds the tuple returned by _option_keys(). """
+
+        bare = ('',) + self._split_option(self.optionxform(option))
+        keys = []
+        for c in self._get_configs(config, plus):
+            if(c == '' and empty_bare):
+                keys.append(bare)
+            else:
+                keys.append((c,) + self._split_option(self.optionxform(
+                    option + '[' + c + ']')))
+        keys.append(bare)
+        return tuple(keys)
+
     def get_result(self, s, option, raw=False, c='', isList=False):
         if(c == '' or c is None):
             try:
@@ -308,12 +1230,35 @@ class ExtendedConfigParser(configparser.ConfigParser):
         sections and stores the section name itself as well as its parents'.
         """
 
-        if(self.inheritance == 'im'
-           or self.inheritance == 'impl'
-           or self.inheritance == 'implicit'):
-            return self._get_corresponding_sections_inheritance(section)
+        return list(self._corresponding_sections(section))
+
+    def _corresponding_sections(self, section):
+        """ Same as get_corresponding_sections() but returns the cached tuple
+        itself. """
+
+        return self._get_chain(section, self._implicit())
+
+    def _implicit(self):
+        """ Returns True if the inheritance mode is implicit. """
+
+        return self.inheritance in ('im', 'impl', 'implicit')
+
+    def _get_chain(self, section, implicit=False):
+        """ Returns the (cached) tuple of the sections corresponding to a
+        section name, in explicit or implicit inheritance mode. """
+
+        key = (section, implicit)
+        try:
+            return self._chains[key]
+        except KeyError:
+            pass
+        if(implicit):
+            chain = self._build_chain_inheritance(section)
         else:
-            return self._get_corresponding_sections(section)
+            chain = self._build_chain(section)
+        if(not self.concurrent):
+            self._chains[key] = chain
+        return chain
 
     def _get_corresponding_sections(self, section):
         """ Look for the actual name of the section if it inherits from other
@@ -321,13 +1266,18 @@ class ExtendedConfigParser(configparser.ConfigParser):
         Searches only through parents explicitly defined in the section name
         """
 
+        return list(self._get_chain(section, False))
+
+    def _build_chain(self, section):
+        """ Builds the tuple returned by _get_corresponding_sections(). """
+
         # Find the corresponding section if it inherits from another section
         sect = self.get_section_name(section)
 
         # Store all of the valid section names corresponding to the initial
         # section (the section itself and its parents if they actually exist)
         sections = []
-        section_name_edited = self.get_section_name(section)
+        section_name_edited = sect
         while(self.section_separator in section_name_edited):
             if section_name_edited in self._sections:
                 sections.append(section_name_edited)
@@ -340,7 +1290,7 @@ class ExtendedConfigParser(configparser.ConfigParser):
             # If the section name exists
             if s in self._sections:
                 sections.append(s)
-        return sections
+        return tuple(sections)
 
     def _get_corresponding_sections_inheritance(self, section):
         """ Look for the actual name of the section if it inherits from other
@@ -356,30 +1306,40 @@ class ExtendedConfigParser(configparser.ConfigParser):
         though.
         """
 
+        return list(self._get_chain(section, True))
+
+    def _build_chain_inheritance(self, section):
+        """ Builds the tuple returned by
+        _get_corresponding_sections_inheritance(). """
+
         sections = []
+        found = set()
 
         # Find the corresponding section if it inherits from another section
         sect = self.get_section_name(section)
 
         # Section names alone, without parents
         section_splitted = sect.split(self.section_separator)
+        splitted = set(section_splitted)
 
         # Loop to find the abstract parents of the section names without
         # separators
         for s in section_splitted:
             # Search for the abstract parents of the parent sections
-            parents = self._get_corresponding_sections(s)
+            parents = self._get_chain(s, False)
             # Get the parents' names without separators
             full_name = self.get_section_name(s)
-            parents_splitted = full_name.split(self.section_separator)
-            parents_splitted = [x for x in parents_splitted if x not in
-                                section_splitted]
-            section_splitted.extend(parents_splitted)
+            for x in full_name.split(self.section_separator):
+                if(x not in splitted):
+                    splitted.add(x)
+                    section_splitted.append(x)
             # Remove the already present results
-            parents = [x for x in parents if x not in sections]
-            sections.extend(parents)
+            for x in parents:
+                if(x not in found):
+                    found.add(x)
+                    sections.append(x)
 
-        return sections
+        return tuple(sections)
 
     def get_section_name(self, section):
         """ Returns the actual name of the section inside the read source if
@@ -389,17 +1349,21 @@ class ExtendedConfigParser(configparser.ConfigParser):
         if(section in self._sections):
             return section
 
-        # Look for the section name or the section name followed by a section
-        # separator
-        for sect in self._sections:
-            if(self.section_separator in sect):
-                subsect = sect[:sect.find(self.section_separator)]
-            else:
-                subsect = sect
+        # Look for the section name followed by a section separator
+        sect = self._section_names.get(section)
+        if(sect is None):
+            raise NoSectionError(section)
+        return sect
+
+    def _index_section_names(self):
+        """ Rebuilds the compact name -> full name index used by
+        get_section_name(). The first section found for a compact name wins.
+        """
 
-            if (subsect == section):
-                return sect
-        raise NoSectionError(section)
+        names = {}
+        for sect in self._sections:
+            names.setdefault(self.get_section_name_compact(sect), sect)
+        self._section_names = names
 
     def get_section_name_compact(self, section):
         """ Returns the name of the section without its parents. """
@@ -422,20 +1386,7 @@ class ExtendedConfigParser(configparser.ConfigParser):
 
         ex : foo_bar_baz, foo_bar, foo"""
 
-        configs = []
-        # Stroes the full config name
-        if(config != '' and config is not None):
-            config_name_edited = config
-        else:
-            config_name_edited = self.config_name
-        # foo_bar_baz and foo_bar here
-        # Splits from the end
-        while(self.config_separator in config_name_edited):
-            configs.append(config_name_edited)
-            config_name_edited = config_name_edited[:config_name_edited.rfind(
-                                                    self.config_separator)]
-        configs.append(config_name_edited)
-        return configs
+        return list(self._get_configs(config or None))
 
     def get_configs_plus(self, config=''):
         """ Stores and returns the config name itself
@@ -452,11 +1403,46 @@ class ExtendedConfigParser(configparser.ConfigParser):
                 store foo
         """
 
-        configs = []
-        if(config != '' and config is not None):
-            config_name_edited = config
+        return list(self._get_configs(config or None, True))
+
+    def _get_configs(self, config=None, plus=False):
+        """ Returns the (cached) tuple of config names returned by
+        get_configs(), or by get_configs_plus() if plus is True. config None
+        stands for the current config name. """
+
+        # Stores the full config name
+        if(config is None):
+            config = self.config_name
+        key = (config, self.config_separator, plus)
+        try:
+            return self._configs[key]
+        except KeyError:
+            pass
+        if(plus):
+            configs = self._build_configs_plus(config)
         else:
-            config_name_edited = self.config_name
+            configs = self._build_configs(config)
+        if(not self.concurrent):
+            self._configs[key] = configs
+        return configs
+
+    def _build_configs(self, config_name_edited):
+        """ Builds the tuple returned by get_configs(). """
+
+        configs = []
+        # foo_bar_baz and foo_bar here
+        # Splits from the end
+        while(self.config_separator in config_name_edited):
+            configs.append(config_name_edited)
+            config_name_edited = config_name_edited[:config_name_edited.rfind(
+                                                    self.config_separator)]
+        configs.append(config_name_edited)
+        return tuple(configs)
+
+    def _build_configs_plus(self, config_name_edited):
+        """ Builds the tuple returned by get_configs_plus(). """
+
+        configs = []
         while(self.config_separator in config_name_edited):
             configs.append(config_name_edited)
             cfg = config_name_edited
@@ -472,7 +1458,7 @@ class ExtendedConfigParser(configparser.ConfigParser):
                                                     rfind(self.
                                                           config_separator)]
         configs.append(config_name_edited)
-        return configs
+        return tuple(configs)
 
     def convert_value_list(self, val):
         """ Converts a value into a List if it contains self.list_separator or
@@ -485,79 +1471,86 @@ class ExtendedConfigParser(configparser.ConfigParser):
                fallback=_UNSET):
         """ Returns the value of an option as an integer. """
 
-        res = self.get(section, option, raw, vars, fallback)
-        try:
-            res = int(res)
-        except ValueError:
-            if res is fallback:
-                pass
-            else:
-                raise
-        return res
+        return self._get_converted(section, option, 'int', raw, vars,
+                                   fallback)
 
     def getfloat(self, section, option, raw=False, vars=None,
                  fallback=_UNSET):
         """ Returns the value of an option as an double. """
 
-        res = self.get(section, option, raw, vars, fallback)
-        try:
-            res = float(res)
-        except ValueError:
-            if res is fallback:
-                pass
-            else:
-                raise
-        return res
+        return self._get_converted(section, option, 'float', raw, vars,
+                                   fallback)
 
     def getboolean(self, section, option, raw=False, vars=None,
                    fallback=_UNSET):
         """ Returns the value of an option as a boolean. """
 
-        res = self.get(section, option, raw, vars, fallback)
-        try:
-            res = self.str_to_bool(res)
-        except ValueError:
-            if res is fallback:
-                pass
-            else:
-                raise
-        return res
+        return self._get_converted(section, option, 'boolean', raw, vars,
+                                   fallback)
 
     def getintlist(self, section, option, raw=False, vars=None,
                    fallback=_UNSET):
         """ Returns the value of an option as an integer list. """
 
-        res = self.get(section, option, raw, vars, fallback, isList=True)
-        try:
-            res = [int(i) for i in res]
-        except ValueError:
-            if res is fallback:
-                pass
-            else:
-                raise
-        return res
+        return self._get_converted(section, option, 'int', raw, vars,
+                                   fallback, isList=True)
 
     def getfloatlist(self, section, option, raw=False, vars=None,
                      fallback=_UNSET):
         """ Returns the value of an option as an double list. """
 
-        res = self.get(section, option, raw, vars, fallback, isList=True)
-        try:
-            res = [float(i) for i in res]
-        except ValueError:
-            if res is fallback:
-                pass
-            else:
-                raise
-        return res
+        return self._get_converted(section, option, 'float', raw, vars,
+                                   fallback, isList=True)
 
     def getbooleanlist(self, section, option, raw=False, vars=None,
                        fallback=_UNSET):
         """ Returns the value of an option as a boolean list. """
 
-        res = self.get(section, option, raw, vars, fallback, isList=True)
+        return self._get_converted(section, option, 'boolean', raw, vars,
+                                   fallback, isList=True)
+
+    @_locked
+    def _get_converted(self, section, option, kind, raw=False, vars=None,
+                       fallback=_UNSET, isList=False):
+        """ Returns the value of an option converted by the converter named
+        kind ('int', 'float' or 'boolean'). If the typed cache is enabled,
+        converted values are stored and served without resolving the option
+        again until the parser changes. Fallback values are never stored. """
+
+        if(self._typed is None or vars is not None):
+            return self._convert_option(section, option, kind, raw, vars,
+                                        fallback, isList)
+        key = (kind, isList, section, option, raw, self.config_name)
+        try:
+            res = self._typed[key]
+        except KeyError:
+            try:
+                res = self.get(section, option, raw, isList=isList)
+            except (NoOptionError, NoSectionError):
+                return self._convert_option(section, option, kind, raw, vars,
+                                            fallback, isList)
+            convert = self._converter(kind)
+            if(isList):
+                res = tuple([convert(i) for i in res])
+            else:
+                res = convert(res)
+            self._typed[key] = res
+        if(isList):
+            return list(res)
+        return res
+
+    def _convert_option(self, section, option, kind, raw=False, vars=None,
+                        fallback=_UNSET, isList=False):
+        """ Returns the value of an option converted by the converter named
+        kind, or fallback if it cannot be converted. """
+
+        res = self.get(section, option, raw, vars, fallback, isList=isList)
+        convert = self._converter(kind)
         try:
-            res = [self.str_to_bool(i) for i in res]
+            if(isList):
+                res = [convert(i) for i in res]
+            else:
+                res = convert(res)
         except ValueError:
             if res is fallback:
                 pass
@@ -565,28 +1558,37 @@ class ExtendedConfigParser(configparser.ConfigParser):
                 raise
         return res
 
+    def _converter(self, kind):
+        """ Returns the function converting a string into kind. """
+
+        if(kind == 'int'):
+            return int
+        elif(kind == 'float'):
+            return float
+        return self.str_to_bool
+
     def str_to_bool(self, string):
         """ Returns True if the lowered string is "true", "yes", "on" or "1".
         Returns False if the lowered string is "false", "no", "off" or "0".
         Raises ValueError otherwise """
 
-        string = string.lower()
-        if(string == 'true' or string == 'yes' or string == 'on' or
-           string == '1'):
-            return True
-        elif(string == 'false' or string == 'no' or string == 'off' or
-             string == '0'):
-            return False
-        else:
-            raise ValueError(string + " is not a boolean")
+        try:
+            return _BOOLEAN_STATES[string.lower()]
+        except KeyError:
+            pass
+        raise ValueError(string + " is not a boolean")
 
     def get_config_name(self):
         return self.config_name
 
     def set_config_name(self, config):
         self.config_name = config
+        self._configs = {}
+        self._keys = {}
+        self._clear_caches()
 
-    def read(self, filenames, encoding=None):
+    def read(self, filenames, encoding=None, use_mmap=False, cache=None,
+             lazy=False):
         """Read and parse a filename or a list of filenames.
 
         Files that cannot be opened are silently ignored; this is
@@ -596,12 +1598,137 @@ class ExtendedConfigParser(configparser.ConfigParser):
         configuration files in the list will be read.  A single
         filename may also be given.
 
+        If use_mmap is True, the files are memory-mapped and decoded a block
+        of lines at a time, the pages parsed being released, which spares
+        memory for very large files (see reader.mapped_lines()).
+
+        If cache is True (cache files next to the files read) or a directory,
+        the parsed content of the files is cached on disk, and loaded from
+        there instead of being parsed again while the files do not change
+        (see the cache module).
+
+        If lazy is True, only the section headers are read at first, a
+        section being parsed the first time it is accessed (see the lazy
+        module) : errors in the content of a section are only raised then,
+        as is a RuntimeError if its file changed since it was read. Lazy
+        reads cannot be combined with cache, reloadable or concurrent
+        parsers or the include directive.
+
+        A directory stands for the files it contains, in sorted order (ex :
+        conf.d), hidden files (and the cache files next to the files read)
+        being ignored, and a glob pattern for the files it matches, in sorted
+        order as well (see _expand_paths()). If the parser has an
+        include_directive (ex : '!include'), a line starting with it at the
+        first column, followed by a whitespace, names a file, directory or
+        pattern (relative to the including file) read right after the
+        including file. The files read are all merged at once.
+
         Return list of successfully read files.
         """
 
         filenames = u(filenames)
-        super(ExtendedConfigParser, self).read(filenames, encoding)
-        self.move_defaults()
+        if(lazy):
+            return self._read_lazy(filenames, encoding, cache)
+        filenames = self._filename_list(filenames)
+        if(use_mmap or cache or self._sources is not None or
+           self.include_directive):
+            return self._read_files(filenames, (encoding, use_mmap, cache))
+        read_ok = super(ExtendedConfigParser, self).read(
+            self._expand_paths(filenames), encoding)
+        self._after_read()
+        return read_ok
+
+    def _read_lazy(self, filenames, encoding, cache):
+        """ read() with lazy=True. """
+
+        if(cache or self._sources is not None or self.include_directive or
+           self.concurrent):
+            raise ValueError('lazy reads cannot be cached, reloaded, '
+                             'concurrent or include files')
+        filenames = self._expand_paths(self._filename_list(filenames))
+        if(encoding is None):
+            encoding = locale.getpreferredencoding(False)
+        settings = self._reader_settings()
+        if(u('\n').encode(encoding) != b'\n'):
+            # The headers cannot be looked for in the bytes
+            read_ok = self._merge_files(self._load_files(
+                filenames, (encoding, False, None), settings))
+            self._after_read()
+            return read_ok
+        read_ok = []
+        for filename in filenames:
+            try:
+                buf, signature = lazy.map_file(filename)
+            except (IOError, OSError):
+                continue
+            try:
+                scanned = lazy.scan(buf, filename, encoding, settings)
+                if(scanned is None):
+                    fragment = reader.parse_lines(io.StringIO(
+                        buf[:].decode(encoding), newline=None), filename,
+                        settings)
+            finally:
+                # The sections are read from the file, not from the map
+                if(buf):
+                    buf.close()
+            if(scanned is None):
+                self._merge_fragment(fragment)
+                reader.raise_error(fragment[1])
+            else:
+                self._merge_segments(scanned[0], encoding, filename,
+                                     settings, signature)
+                reader.raise_error(scanned[1])
+            read_ok.append(filename)
+        self._after_read()
+        return read_ok
+
+    def _merge_segments(self, segments, encoding, fpname, settings,
+                        signature):
+        """ Stores the sections found by lazy.scan() as placeholders, loaded
+        by _load_section() when they are accessed. """
+
+        if(not isinstance(self._sections, lazy.LazySections)):
+            self._sections = lazy.LazySections(self._load_section,
+                                               self._sections)
+        sections = self._sections
+        for name, start, end in segments:
+            segment = (fpname, start, end, encoding, settings, signature)
+            current = sections.peek(name)
+            if(current is None):
+                sections[name] = lazy.LazySection(None, [segment])
+                self._proxies[name] = SectionProxyExtended(self, name)
+                if(name != 'DEFAULT'):
+                    self._section_names.setdefault(
+                        self.get_section_name_compact(name), name)
+            elif(type(current) is lazy.LazySection):
+                current.segments.append(segment)
+            else:
+                sections[name] = lazy.LazySection(current, [segment])
+                self._specs.pop(name, None)
+
+    def _load_section(self, name, placeholder):
+        """ Parses the content of a section read lazily and returns it. If it
+        cannot be parsed (or its file changed since it was read), the error
+        is raised and the section stays unloaded. """
+
+        fragments = []
+        for segment in placeholder.segments:
+            fragment = lazy.parse_segment(segment)
+            reader.raise_error(fragment[1])
+            fragments.append(fragment)
+        sect = placeholder.base
+        if(sect is None):
+            sect = self._dict()
+        before_read = self._interpolation.before_read
+        strings = self._strings
+        for fragment in fragments:
+            for optname, val in fragment[0].get(name, {}).items():
+                val = before_read(self, name, optname, val)
+                if(strings is not None):
+                    optname = strings.setdefault(optname, optname)
+                    val = strings.setdefault(val, val)
+                sect[optname] = val
+        return sect
 
     def read_file(self, f, source=None):
         """Like read() but the argument must be a file-like object.
@@ -613,7 +1740,7 @@ class ExtendedConfigParser(configparser.ConfigParser):
         """
 
         super(ExtendedConfigParser, self).read_file(f, source)
-        self.move_defaults()
+        self._after_read()
 
     def read_string(self, string, source='<string>'):
         """ Like read() but the argument must be a string. It is highly
@@ -621,23 +1748,802 @@ class ExtendedConfigParser(configparser.ConfigParser):
 
         # Conversion to unicode to ensure Python2 compatibility
         super(ExtendedConfigParser, self).read_string(string, source)
+        self._after_read()
+
+    def read_parallel(self, filenames, encoding=None, max_workers=None,
+                      processes=False, use_mmap=False, cache=None):
+        """ Like read(), but the files are parsed concurrently, by a pool of
+        max_workers threads (or processes if processes is True, in which case
+        optionxform must be picklable). Their content is then merged in the
+        order of filenames, so that the result is the same as the one of
+        read(). Directories, glob patterns, includes, use_mmap and cache are
+        the same as in read().
+
+        Return list of successfully read files. """
+
+        filenames = self._filename_list(filenames)
+        options = (encoding, use_mmap, cache)
+        if(ThreadPoolExecutor is None or (
+                not self.include_directive and
+                len(self._expand_paths(filenames)) < 2)):
+            return self._read_files(filenames, options)
+        if(processes):
+            pool = ProcessPoolExecutor(max_workers)
+        else:
+            pool = ThreadPoolExecutor(max_workers or 32)
+        with pool:
+            return self._read_files(filenames, options, pool)
+
+    def aread(self, filenames, encoding=None, use_mmap=False, cache=None,
+              executor=None):
+        """ Asynchronous read() : returns an awaitable of its result. The
+        files are read, parsed and merged in executor (the default executor
+        of the event loop if None), into a copy of the parser which replaces
+        it in the thread of the event loop, where it must be called (see
+        _achange()). While it is in progress, the calls with the same
+        arguments share it (the files are merged once).
+
+        The parser should then only be changed from the thread of the event
+        loop (see aget_many()). """
+
+        filenames = self._filename_list(filenames)
+        options = (encoding, use_mmap, cache)
+        settings = self._reader_settings()
+
+        def load():
+            prefetched = aio.prefetch(self._load_files(
+                self._expand_paths(filenames), options, settings))
+            return aio.sections_of(prefetched), prefetched
+
+        def change(parser, prefetched):
+            read_ok = parser._merge_files(aio.replay(*prefetched),
+                                          (filenames, None, None, options))
+            parser._after_read()
+            return read_ok
+
+        key = ('read', tuple(f.__fspath__() if hasattr(f, '__fspath__')
+                             else f for f in filenames), options)
+        return self._achange(self._scheduler(), executor, key, load, change)
+
+    def aread_file(self, f, source=None, executor=None):
+        """ Asynchronous read_file() : returns an awaitable which is done
+        once the file has been read, parsed and merged (see aread()) in
+        executor (the default executor of the event loop if None), the
+        parser being changed in the thread of the event loop, where it must
+        be called. """
+
+        if(source is None):
+            source = getattr(f, 'name', '<???>')
+        settings = self._reader_settings()
+
+        def load():
+            fragment = reader.parse_lines(f, source, settings)
+            loaded, spec = self._load_source(fragment, source, settings)
+            prefetched = aio.prefetch(loaded)
+            return aio.sections_of(prefetched), (prefetched, spec)
+
+        def change(parser, res):
+            prefetched, spec = res
+            parser._merge_files(aio.replay(*prefetched), spec)
+            parser._after_read()
+
+        return self._achange(self._scheduler(), executor, None, load, change)
+
+    def _achange(self, scheduler, executor, key, load, change,
+                 restart=None):
+        """ Returns an awaitable of the result of an asynchronous change :
+        load() is called in executor and returns (touched, payload), touched
+        being the names of the sections change(parser, payload) may change
+        (None if it changes nothing). change() is then called in executor as
+        well, on a fork of the parser (see _fork()), the resolution index of
+        which is compiled if needed, and the fork replaces the parser in the
+        thread of the event loop (see _adopt()), once no lookup is running.
+        If the parser changed meanwhile, change() is called again on a new
+        fork. restart, if given, is called first in the thread of the loop,
+        and may return an awaitable to return instead (ex : the change must
+        be loaded again). Sections read lazily cannot be forked : change()
+        is then called in the thread of the loop. """
+
+        def run(loaded):
+            touched, payload = loaded
+            generation = self._generation
+            if(touched is None or
+               isinstance(self._sections, lazy.LazySections)):
+                return loaded, generation, None, None, None
+            fork = self._fork(touched)
+            try:
+                result = change(fork, payload)
+                if(fork.compiled and fork._stale):
+                    fork.compile()
+            except Exception as e:
+                # Adopted all the same, as read() leaves what it merged
+                return loaded, generation, fork, None, e
+            return loaded, generation, fork, result, None
+
+        def adopt(ran):
+            loaded, generation, fork, result, error = ran
+            if(restart is not None):
+                restarted = restart()
+                if(restarted is not None):
+                    return restarted
+            if(fork is None):
+                return change(self, loaded[1])
+            if(generation != self._generation):
+                # Changed meanwhile
+                return scheduler.load(None, executor,
+                                      functools.partial(run, loaded), adopt)
+            self._adopt(fork)
+            if(error is not None):
+                raise error
+            return result
+
+        return scheduler.load(key, executor, lambda: run(load()), adopt)
+
+    def _fork(self, touched):
+        """ Returns a copy of the parser which can be changed without changing
+        it, as long as only the sections named in touched (and DEFAULT) are
+        changed : the other sections, and everything but the indexes and
+        caches, are shared with the parser. The parser must not change while
+        the copy is made. """
+
+        fork = copy.copy(self)
+        sections = self._dict(self._sections)
+        for name in touched:
+            if(name in sections):
+                sections[name] = self._dict(sections[name])
+        fork._sections = sections
+        fork._proxies = self._dict(self._proxies)
+        fork._section_names = dict(self._section_names)
+        fork._specs = dict((name, specs) for name, specs in self._specs.items()
+                           if name not in touched)
+        fork._chains = dict(self._chains)
+        fork._configs = dict(self._configs)
+        fork._keys = dict(self._keys)
+        if(self._resolved is not None):
+            fork._resolved = dict(self._resolved)
+        if(self._typed is not None):
+            fork._typed = dict(self._typed)
+        if(self._sources is not None):
+            fork._sources = list(self._sources)
+            fork._reads = dict(self._reads)
+        return fork
+
+    def _adopt(self, fork):
+        """ Replaces the content, indexes and caches of the parser by the ones
+        of a fork (see _fork()). """
+
+        for proxy in fork._proxies.values():
+            if(proxy._parser is fork):
+                proxy._parser = self
+        for name in _FORK_STATE:
+            setattr(self, name, getattr(fork, name))
+
+    def _scheduler(self):
+        """ Returns the aio.Scheduler of the running event loop. """
+
+        loop = aio.running_loop()
+        if(self._aio is None or self._aio.loop is not loop):
+            self._aio = aio.Scheduler(loop)
+        return self._aio
+
+    def _filename_list(self, filenames):
+        """ Returns the list of the filenames given to read(). """
+
+        if(isinstance(filenames, string_types + (bytes,)) or
+           hasattr(filenames, '__fspath__')):
+            return [filenames]
+        return list(filenames)
+
+    def _expand_paths(self, filenames, base=None):
+        """ Returns the list of the files designated by a list of filenames,
+        relative to the directory base if given : directories are replaced by
+        the files they contain, in sorted order, hidden files excepted, and
+        glob patterns (names containing *, ? or [ which are not existing
+        files) by the files they match, in sorted order. """
+
+        paths = []
+        for filename in filenames:
+            if(hasattr(filename, '__fspath__')):
+                filename = filename.__fspath__()
+            if(base and not _is_bytes_path(filename)):
+                filename = os.path.join(base, filename)
+            if(os.path.isdir(filename)):
+                for name in sorted(os.listdir(filename)):
+                    if(name.startswith(b'.' if isinstance(name, bytes)
+                                       else '.')):
+                        continue
+                    path = os.path.join(filename, name)
+                    if(os.path.isfile(path)):
+                        paths.append(path)
+            elif(not _is_bytes_path(filename) and
+                 _GLOB_MAGIC.search(filename) and
+                 not os.path.exists(filename)):
+                paths.extend(path for path in sorted(glob.glob(filename))
+                             if os.path.isfile(path))
+            else:
+                paths.append(filename)
+        return paths
+
+    def _read_files(self, filenames, options, pool=None):
+        """ Loads the files designated by some filenames (see _load_files())
+        and merges them. """
+
+        loaded = self._load_files(self._expand_paths(filenames), options,
+                                  self._reader_settings(), pool)
+        read_ok = self._merge_files(loaded, (filenames, None, None, options))
+        self._after_read()
+        return read_ok
+
+    def _load_files(self, paths, options, settings, pool=None,
+                    previous=None, seen=frozenset()):
+        """ Yields the (path, signature, fragment) of some files, in order,
+        each file being followed by the files it includes (see
+        _load_includes()). A fragment is None if the file cannot be read.
+        options are the (encoding, use_mmap, cache) given to read(). The files
+        are parsed by pool if given, their results (and errors) being yielded
+        in order as they come.
+
+        The signatures are only known if the parser is reloadable : the
+        fragments of previous, {(path, signature): fragment}, are then used
+        for the files which did not change. """
+
+        if(self._sources is None):
+            signatures = [None] * len(paths)
+        else:
+            signatures = [file_signature(path) for path in paths]
+        fragments = [None] * len(paths)
+        todo = []
+        for i, key in enumerate(zip(paths, signatures)):
+            if(previous is not None and key in previous):
+                fragments[i] = previous[key]
+            else:
+                todo.append(i)
+        encoding, use_mmap, cache = options
+        args = ([paths[i] for i in todo], [encoding] * len(todo),
+                [settings] * len(todo), [use_mmap] * len(todo),
+                [cache] * len(todo))
+        if(pool is None or len(todo) < 2):
+            parsed = map(cached_read_path, *args)
+        else:
+            parsed = pool.map(cached_read_path, *args)
+        parsed = iter(parsed)
+        todo = set(todo)
+
+        for i, path in enumerate(paths):
+            fragment = fragments[i]
+            if(i in todo):
+                fragment = next(parsed)
+            yield path, signatures[i], fragment
+            if(fragment is not None):
+                for res in self._load_includes(
+                        fragment, os.path.dirname(path), options, settings,
+                        pool, previous,
+                        seen | set([os.path.realpath(path)])):
+                    yield res
+
+    def _load_includes(self, fragment, base, options, settings, pool=None,
+                       previous=None, seen=frozenset()):
+        """ Yields the files included by a fragment (see _load_files()),
+        relative to the directory base. Files already including it (seen, a
+        set of real paths) are skipped, and so are the includes of a fragment
+        which has an error, since it is raised before they are read. """
+
+        if(not fragment[2] or fragment[1] is not None):
+            return iter(())
+        if(_is_bytes_path(base)):
+            # Python 3 only
+            base = os.fsdecode(base)
+        paths = [path for path in self._expand_paths(fragment[2], base)
+                 if os.path.realpath(path) not in seen]
+        return self._load_files(paths, options, settings, pool, previous,
+                                seen)
+
+    def _merge_files(self, loaded, spec=None):
+        """ Merges the fragments loaded by _load_files(), in order, and
+        returns the list of the files read. The error of a fragment is raised
+        once it has been merged, the next files being ignored, just as read()
+        would. If the parser is reloadable, the files are recorded for
+        reload(), along with spec, the (filenames, fragment, base, options)
+        to load them again (see reload()). """
+
+        self._read_calls += 1
+        if(self._sources is not None):
+            self._reads[self._read_calls] = spec
+        read_ok = []
+        for path, signature, fragment in loaded:
+            if(self._sources is not None):
+                # Files which cannot be read are watched as well
+                self._sources.append([path, signature,
+                                      fragment or (self._dict(), None, ()),
+                                      self._read_calls])
+            if(fragment is None):
+                continue
+            self._merge_fragment(fragment)
+            reader.raise_error(fragment[1])
+            if(path is not None):
+                read_ok.append(path)
+        return read_ok
+
+    def _read(self, fp, fpname):
+        """ Parses a configuration file, just as configparser does, and merges
+        its content (see _merge_fragment()), then the files it includes. """
+
+        settings = self._reader_settings()
+        fragment = reader.parse_lines(fp, fpname, settings)
+        if(self._sources is None and not fragment[2]):
+            self._merge_fragment(fragment)
+            reader.raise_error(fragment[1])
+            return
+        self._merge_files(*self._load_source(fragment, fpname, settings))
+
+    def _load_source(self, fragment, fpname, settings):
+        """ Returns the files (see _load_files()) of a source given to
+        read_file() or read_string() : the source itself then the files it
+        includes, and the spec to record for reload(). """
+
+        options = (None, False, None)
+        base = os.path.dirname(fpname) if isinstance(fpname, string_types) \
+            else None
+        loaded = itertools.chain([(None, None, fragment)], self._load_includes(
+            fragment, base, options, settings))
+        return loaded, (None, fragment, base, options)
+
+    def reload(self):
+        """ Reads again the files read by read() or read_parallel() which
+        changed since (size or modification time), as well as the files
+        added to or removed from the directories and glob patterns read or
+        included, and returns their list. The files which did not change are
+        not parsed again. Only the sections found in the files which changed
+        (before or after the change) are rebuilt, from every source read, in
+        the same way read() builds them : the values set with set() in these
+        sections are lost. The cached lookups are only dropped for the
+        sections inheriting from them. Sources given to read_file() or
+        read_string() do not change, the files they include do.
+
+        If a changed file cannot be parsed, its error is raised and the
+        parser is left untouched. Only available if the parser has been
+        created with reloadable=True. """
+
+        if(self._sources is None):
+            raise ValueError('reload() requires reloadable=True')
+        return self._apply_reload(self._prepare_reload(
+            self._sources, self._reads, self._reader_settings()))
+
+    def _prepare_reload(self, entries, reads, settings):
+        """ Loads again the files recorded in entries (see _sources) by the
+        read calls of reads (see _merge_files()) and returns the new sources,
+        the files which changed and the sections affected, or None if nothing
+        changed, without changing the parser. """
+
+        previous = dict(((entry[0], entry[1]), entry[2])
+                        for entry in entries if entry[0] is not None)
+        sources = []
+        changed = []
+        for batch in sorted(reads):
+            filenames, fragment, base, options = reads[batch]
+            if(fragment is None):
+                loaded = self._load_files(self._expand_paths(filenames),
+                                          options, settings, None, previous)
+            else:
+                loaded = itertools.chain([(None, None, fragment)],
+                                         self._load_includes(
+                    fragment, base, options, settings, None, previous))
+            for path, signature, fragment in loaded:
+                if(fragment is None):
+                    fragment = (self._dict(), None, ())
+                if(path is not None and
+                   previous.get((path, signature)) is not fragment):
+                    reader.raise_error(fragment[1])
+                    changed.append(path)
+                sources.append([path, signature, fragment, batch])
+                if(fragment[1] is not None):
+                    # read() stopped there
+                    break
+
+        old = [id(entry[2]) for entry in entries]
+        new = [id(entry[2]) for entry in sources]
+        kept = set(old) & set(new)
+        for entry in entries:
+            if(id(entry[2]) not in kept and entry[0] not in changed):
+                # Removed from a directory or pattern
+                changed.append(entry[0])
+        same_order = [i for i in old if i in kept] == \
+            [i for i in new if i in kept]
+        if(same_order and not changed):
+            return None
+
+        affected = set()
+        if(not same_order):
+            for entry in entries + sources:
+                affected.update(entry[2][0])
+            return sources, changed, affected
+        # (path, read call) -> sections of the fragments replaced
+        replaced = {}
+        for entry in entries:
+            if(id(entry[2]) not in kept):
+                replaced.setdefault((entry[0], entry[3]), []).append(
+                    entry[2][0])
+        for entry in sources:
+            if(id(entry[2]) in kept):
+                continue
+            sections = entry[2][0]
+            before = replaced.get((entry[0], entry[3]))
+            if(not before):
+                affected.update(sections)
+                continue
+            # Only the sections the file defines differently
+            before = before.pop(0)
+            for name in set(before) | set(sections):
+                if(before.get(name) != sections.get(name)):
+                    affected.add(name)
+        for rest in replaced.values():
+            for before in rest:
+                affected.update(before)
+        return sources, changed, affected
+
+    def areload(self, executor=None):
+        """ Asynchronous reload() : returns an awaitable of its result. The
+        files are read and parsed, and the sections rebuilt, in executor (the
+        default executor of the event loop if None), the parser being
+        changed in the thread of the event loop, where it must be called
+        (see aread()). While it is in progress, the other calls share it. """
+
+        if(self._sources is None):
+            raise ValueError('reload() requires reloadable=True')
+        return self._areload(self._scheduler(), executor, ('reload',))
+
+    def _areload(self, scheduler, executor, key):
+        sources = self._sources
+        entries = list(sources)
+        reads = dict(self._reads)
+        calls = self._read_calls
+        settings = self._reader_settings()
+
+        def load():
+            prepared = self._prepare_reload(entries, reads, settings)
+            return (None if prepared is None else prepared[2]), prepared
+
+        def change(parser, prepared):
+            return parser._apply_reload(prepared)
+
+        def restart():
+            if(self._sources is not sources or self._read_calls != calls):
+                # Read or reloaded meanwhile
+                return self._areload(scheduler, executor, None)
+            return None
+
+        return self._achange(scheduler, executor, key, load, change,
+                             restart)
+
+    def _apply_reload(self, prepared):
+        """ Applies the result of _prepare_reload() and returns the files
+        which changed. """
+
+        if(prepared is None):
+            return []
+        sources, changed, affected = prepared
+        built = self._build_sections(sources, affected)
+        lock = self._lock
+        if(lock is None):
+            self._rebuild_sections(sources, affected, built)
+        else:
+            with lock:
+                self._rebuild_sections(sources, affected, built)
+        return changed
+
+    def _build_sections(self, sources, affected):
+        """ Builds some sections (and DEFAULT) from the fragments of sources
+        (see _sources), in the same way read() does, without changing the
+        parser. Returns a dict mapping their names to their content, or to
+        None if no source defines them anymore. """
+
+        before_read = self._interpolation.before_read
+        strings = self._strings
+        built = {}
+        for name in affected:
+            if(name == 'DEFAULT'):
+                continue
+            sect = None
+            for entry in sources:
+                options = entry[2][0].get(name)
+                if(options is None):
+                    continue
+                if(sect is None):
+                    sect = self._dict()
+                for optname, val in options.items():
+                    val = before_read(self, name, optname, val)
+                    if(strings is not None):
+                        optname = strings.setdefault(optname, optname)
+                        val = strings.setdefault(val, val)
+                    sect[optname] = val
+            built[name] = sect
+
+        if('DEFAULT' in affected):
+            # As read() does : the DEFAULT sections read by the last call
+            # reading one
+            last = None
+            for entry in sources:
+                if('DEFAULT' in entry[2][0]):
+                    last = entry[3]
+            default = self._dict()
+            for entry in sources:
+                options = entry[2][0].get('DEFAULT')
+                if(entry[3] != last or options is None):
+                    continue
+                for optname, val in options.items():
+                    val = before_read(self, 'DEFAULT', optname, val)
+                    if(strings is not None):
+                        optname = strings.setdefault(optname, optname)
+                        val = strings.setdefault(val, val)
+                    default[optname] = val
+            built['DEFAULT'] = default
+        return built
+
+    def _rebuild_sections(self, sources, affected, built):
+        """ Replaces the sources and some sections (and DEFAULT) by the ones
+        built by _build_sections(), then updates the indexes and drops the
+        lookups depending on them. """
+
+        self._sources = sources
+        structure = False
+        dropped = 0
+        for name, sect in built.items():
+            if(name == 'DEFAULT'):
+                dropped += len(self.default_section or ())
+                self.default_section = sect
+                continue
+            old = getattr(self._sections, 'peek', self._sections.get)(name)
+            if(old is not None and type(old) is not lazy.LazySection):
+                dropped += len(old)
+            self._specs.pop(name, None)
+            if(sect is not None):
+                if(name not in self._sections):
+                    structure = True
+                    self._proxies[name] = SectionProxyExtended(self, name)
+                self._sections[name] = sect
+            elif(name in self._sections):
+                structure = True
+                del self._sections[name]
+                self._proxies.pop(name, None)
+
+        # A section may also move if it left its first file
+        if(self._order_sections()):
+            structure = True
+        if(structure):
+            self._index_section_names()
+        if(structure or 'DEFAULT' in affected or
+           type(self._interpolation) not in _LOCAL_INTERPOLATIONS):
+            self._clear_caches(structure=structure)
+        else:
+            self._drop_lookups(affected)
+        if(self.compiled and self._resolved is not None and
+           not self._resolved):
+            self._compile_later()
+        self._drop_strings(2 * dropped)
+
+    def _order_sections(self):
+        """ Orders the sections as read() would have created them, the ones
+        not coming from the sources (add_section()) last. Returns True if the
+        order changed. """
+
+        order = self._dict()
+        for entry in self._sources:
+            for name in entry[2][0]:
+                if(name in self._sections):
+                    order[name] = None
+        for name in self._sections:
+            order[name] = None
+        if(list(order) == list(self._sections)):
+            return False
+        sections = self._sections
+        self._sections = self._dict((name, sections[name]) for name in order)
+        return True
+
+    def _drop_lookups(self, sections):
+        """ Drops the cached lookups (compiled index, converted values) of the
+        sections inheriting from some sections, or some sections
+        themselves. """
+
+        self._generation += 1
+        names = set(self.get_section_name_compact(s) for s in sections)
+        names.update(sections)
+        for (name, implicit), chain in self._chains.items():
+            if(not sections.isdisjoint(chain)):
+                names.add(name)
+        if(self._resolved is not None):
+            for key in [k for k in self._resolved if k[0] in names]:
+                del self._resolved[key]
+        if(self._typed is not None):
+            for key in [k for k in self._typed if k[2] in names]:
+                del self._typed[key]
+        if(self.concurrent):
+            self._warm_caches()
+            if(self._resolved is not None):
+                self.compile()
+
+    def watch(self, interval=1.0, callback=None, loop=None):
+        """ Calls reload() every interval seconds in a daemon thread, until
+        unwatch() is called. callback, if given, is called after every
+        reload() which changed something or failed, as callback(changed files,
+        error), error being None or the exception raised. While the thread
+        runs, the lookups (get(), items(), the section proxies, ...) and the
+        changes reload() makes hold a lock of the parser, so that a lookup
+        sees the parser either before or after a reload : watch() must be
+        called before other threads start looking values up. If an event
+        loop is given, areload() is called from it instead, so that the
+        parser is only changed in its thread. """
+
+        self.unwatch()
+        stop = threading.Event()
+        if(loop is not None):
+            self._watcher = (None, stop)
+            loop.call_soon_threadsafe(aio.watch, self, loop, interval,
+                                      callback, stop)
+            return
+
+        def run():
+            while(not stop.wait(interval)):
+                try:
+                    changed = self.reload()
+                    error = None
+                except Exception as e:
+                    changed = []
+                    error = e
+                if(callback is not None and (changed or error is not None)):
+                    callback(changed, error)
+
+        thread = threading.Thread(target=run, name='ecp-watcher')
+        thread.daemon = True
+        self._watcher = (thread, stop)
+        self._lock = threading.RLock()
+        thread.start()
+
+    def unwatch(self):
+        """ Stops the watching started by watch(), if any. """
+
+        if(self._watcher is not None):
+            thread, stop = self._watcher
+            self._watcher = None
+            stop.set()
+            if(thread is not None and
+               thread is not threading.current_thread()):
+                thread.join()
+                self._lock = None
+
+    def _reader_settings(self):
+        """ Returns the settings of the parser used by the reader module. """
+
+        optionxform = self.optionxform
+        if(getattr(optionxform, '__func__', None) is
+           configparser.RawConfigParser.optionxform):
+            # The reader lowers the names itself, so that the settings can
+            # be pickled
+            optionxform = None
+        return {
+            'comment_prefixes': tuple(self._comment_prefixes),
+            'inline_comment_prefixes': tuple(self._inline_comment_prefixes),
+            'empty_lines_in_values': self._empty_lines_in_values,
+            'strict': self._strict,
+            'dict_type': self._dict,
+            'sectcre': self.SECTCRE,
+            'optcre': self._optcre,
+            'nonspacecre': self.NONSPACECRE,
+            'optionxform': optionxform,
+            'include': self.include_directive,
+        }
+
+    def _merge_fragment(self, fragment):
+        """ Stores the content of a fragment (see the reader module) : new
+        sections get their SectionProxyExtended and their compact name
+        indexed, the values are given to the interpolation and stored in the
+        specification indexes (see _get_specs()). The fragment itself is left
+        untouched. """
+
+        before_read = self._interpolation.before_read
+        # The values are stored as they are if the interpolation keeps them
+        identity = getattr(before_read, '__func__', None) is \
+            configparser.Interpolation.before_read
+        all_specs = self._specs
+        split_option = self._split_option
+        strings = self._strings
+        for sectname, options in fragment[0].items():
+            cursect = self._sections.get(sectname)
+            if(cursect is None):
+                cursect = self._sections[sectname] = self._dict()
+                self._proxies[sectname] = SectionProxyExtended(self, sectname)
+                if(sectname != 'DEFAULT'):
+                    self._section_names.setdefault(
+                        self.get_section_name_compact(sectname), sectname)
+                specs = all_specs[sectname] = OrderedDict()
+            else:
+                # Rebuilt on the next lookup if missing
+                specs = all_specs.get(sectname)
+            if(identity and strings is None):
+                cursect.update(options)
+            else:
+                for optname, val in options.items():
+                    if(not identity):
+                        val = before_read(self, sectname, optname, val)
+                    if(strings is not None):
+                        optname = strings.setdefault(optname, optname)
+                        val = strings.setdefault(val, val)
+                    cursect[optname] = val
+            if(specs is None):
+                continue
+            for optname in options:
+                if('[' in optname):
+                    opt, tag = split_option(optname)
+                    if(strings is not None):
+                        tag = strings.setdefault(tag, tag)
+                else:
+                    opt, tag = optname, None
+                if(strings is not None):
+                    opt = strings.setdefault(opt, opt)
+                values = specs.get(opt)
+                if(values is None):
+                    values = specs[opt] = {}
+                values[tag] = cursect[optname]
+
+    def _after_read(self):
+        """ Called once a source has been read : moves the defaults and
+        resets the caches depending on the parsed content. The section name
+        and specification indexes are kept up to date by _read(). """
+
         self.move_defaults()
+        self._specs.pop('DEFAULT', None)
+        self._clear_caches(structure=True)
+        if(self.compiled):
+            self._compile_later()
+
+    def _compile_later(self):
+        """ Compiles the resolution index again at the next lookup rather
+        than after every read, so that reading many sources one by one stays
+        linear. The lookups of concurrent parsers do not store anything : it
+        is compiled right away for them (by _clear_caches() once enabled). """
+
+        if(self.concurrent):
+            if(self._resolved is None):
+                self.compile()
+        else:
+            self._stale = True
+            if(self._resolved is None):
+                self._resolved = {}
+
+    def write(self, fp, space_around_delimiters=True):
+        """ Same as configparser's write(), the DEFAULT section included : its
+        content is kept in self.default_section (see move_defaults()) and the
+        defaults given to the constructor in self.father, DEFAULT's values
+        taking precedence as get() looks there first. """
+
+        if(space_around_delimiters):
+            d = ' {0} '.format(self._delimiters[0])
+        else:
+            d = self._delimiters[0]
+        default = self._dict()
+        for section in (self.father, self.default_section):
+            if(section):
+                default.update(section)
+        if(default):
+            self._write_section(fp, configparser.DEFAULTSECT, default.items(),
+                                d)
+        for section in self._sections:
+            if(section != 'DEFAULT'):
+                self._write_section(fp, section,
+                                    self._sections[section].items(), d)
 
     def move_defaults(self):
         """ Transfers the content from the DEFAULT section to
         self.default_section to prevent get() from returning DEFAULT
-        option values instead of parent option values and "converts"
-        SectionProxies to SectionProxiesExtended. """
+        option values instead of parent option values. The sections read
+        already have their SectionProxyExtended (see _read()), the proxies of
+        the other sections are left untouched. """
 
-        try:
-            self.default_section = self._sections['DEFAULT'].copy()
-            del self._sections['DEFAULT']
-        except KeyError:
-            pass
-        # "Converts" SectionProxies to SectionProxiesExtended
-        for s in self._sections:
-            self._proxies[s] = SectionProxyExtended(self, s)
+        default = self._sections.pop('DEFAULT', None)
+        if(default is not None):
+            self.default_section = default
+            self._proxies.pop('DEFAULT', None)
 
+    @_locked
     def has_option(self, section, option, config='', cfg_ind=False,
                    strict=False):
         """ Returns True if the option has been found, returns False
@@ -659,25 +2565,16 @@ class ExtendedConfigParser(configparser.ConfigParser):
         config name precised in the parameters) and returns False otherwise."""
 
         if(self.has_section(section)):
-            sections = self.get_corresponding_sections(section)
-            if(config != '' and config is not None):
-                configs = self.get_configs(config)
-            else:
-                configs = self.get_configs()
+            sections = self._corresponding_sections(section)
+            keys = self._option_keys(option, config or None,
+                                     empty_bare=False)
             # Looks for the option in the section and its parents with
             # different config values
             for s in sections:
-                for c in configs:
-                    res = super(ExtendedConfigParser, self).has_option(s,
-                                                                       option +
-                                                                       '[' +
-                                                                       c + ']')
-                    if(res):
+                specs = self._get_specs(s)
+                for c, opt, tag in keys:
+                    if(tag in specs.get(opt, ())):
                         return True
-
-                res = super(ExtendedConfigParser, self).has_option(s, option)
-                if(res):
-                    return True
             return False
 
     def _has_option_strict(self, section, option, config=''):
@@ -687,22 +2584,12 @@ class ExtendedConfigParser(configparser.ConfigParser):
 
         sect = self.get_section_name(section)
         if(self.has_section(section)):
-            if(config != '' and config is not None):
-                configs = self.get_configs(config)
-            else:
-                configs = self.get_configs()
+            specs = self._get_specs(sect)
             # Looks for the option in the section with different config values
-            for c in configs:
-                res = super(ExtendedConfigParser, self).has_option(sect,
-                                                                   option +
-                                                                   '[' + c +
-                                                                   ']')
-                if(res):
+            for c, opt, tag in self._option_keys(option, config or None,
+                                                 empty_bare=False):
+                if(tag in specs.get(opt, ())):
                     return True
-            res = super(ExtendedConfigParser, self).has_option(sect,
-                                                               option)
-            if(res):
-                return True
             return False
 
     def _has_option_config_ind(self, section, option):
@@ -711,15 +2598,10 @@ class ExtendedConfigParser(configparser.ConfigParser):
         and returns False otherwise. """
 
         if(self.has_section(section)):
-            sections = self.get_corresponding_sections(section)
+            sections = self._corresponding_sections(section)
             for s in sections:
-                for o in self._sections[s]:
-                    if('[' in o):
-                        opt = o[:o.find('[')]
-                    else:
-                        opt = o
-                    if(option == opt):
-                        return True
+                if(option in self._get_specs(s)):
+                    return True
 
             return False
 
@@ -730,16 +2612,9 @@ class ExtendedConfigParser(configparser.ConfigParser):
 
         if(self.has_section(section)):
             sect = self.get_section_name(section)
-            for o in self._sections[sect]:
-                if('[' in o):
-                    opt = o[:o.find('[')]
-                else:
-                    opt = o
-                if(option == opt):
-                    return True
-
-            return False
+            return option in self._get_specs(sect)
 
+    @_locked
     def has_section(self, section, strict=False):
         """ Returns True if the section name entered is found in the file. If
         strict is True, it will look for the exact given section name. If
@@ -773,6 +2648,129 @@ class ExtendedConfigParser(configparser.ConfigParser):
         section = u(section)
         super(ExtendedConfigParser, self).add_section(section)
         self._proxies[section] = SectionProxyExtended(self, section)
+        self._section_names.setdefault(self.get_section_name_compact(section),
+                                       section)
+        self._clear_caches(structure=True)
+
+    def remove_section(self, section):
+        # Without loading a section read lazily
+        sect = getattr(self._sections, 'peek', self._sections.get)(section)
+        res = super(ExtendedConfigParser, self).remove_section(section)
+        self._specs.pop(section, None)
+        if(res and self._section_names.get(self.get_section_name_compact(
+                section)) == section):
+            # Another section may share the same compact name
+            self._index_section_names()
+        self._clear_caches(structure=True)
+        if(res and sect is not None and type(sect) is not lazy.LazySection):
+            self._drop_strings(2 * len(sect))
+        return res
+
+    def set(self, section, option, value=None):
+        strings = self._strings
+        if(strings is None):
+            super(ExtendedConfigParser, self).set(section, option, value)
+        else:
+            sect = self._sections.get(section)
+            key = self.optionxform(option)
+            new = sect is not None and key not in sect
+            super(ExtendedConfigParser, self).set(
+                section, option, strings.setdefault(value, value))
+            if(new):
+                # The new option is the last one, it keeps its place
+                sect[strings.setdefault(key, key)] = sect.pop(key)
+            else:
+                self._drop_strings(1)
+        self._specs.pop(section, None)
+        self._clear_caches()
+
+    def _stored_strings(self):
+        """ Yields the strings stored by the sections (option names and
+        values, DEFAULT's included) and by the specification indexes (option
+        and config names), one per reference. Sections read lazily and not
+        loaded yet are left out. """
+
+        sections = self._sections
+        names = sections.loaded() if hasattr(sections, 'loaded') else \
+            list(sections)
+        for section in [sections[n] for n in names] + [self.default_section]:
+            for item in (section or {}).items():
+                for string in item:
+                    yield string
+        for specs in self._specs.values():
+            for opt, values in specs.items():
+                yield opt
+                for tag in values:
+                    yield tag
+
+    def _drop_strings(self, count):
+        """ Records that the sections stopped referring to count strings
+        (options removed, replaced or reloaded) and rebuilds the table of
+        intern_strings from the strings still stored once they may be as
+        many as half of the ones kept by the last rebuild, so that the unused
+        strings are released without walking the sections at every change.
+        """
+
+        if(self._strings is None or not count):
+            return
+        self._strings_dropped += count
+        if(self._strings_dropped * 2 < self._strings_kept):
+            return
+        strings = {}
+        for string in self._stored_strings():
+            if(isinstance(string, text_type)):
+                strings.setdefault(string, string)
+        self._strings = strings
+        self._strings_kept = len(strings)
+        self._strings_dropped = 0
+
+    def memory_report(self):
+        """ Returns what the strings stored by the sections (option names and
+        values, DEFAULT's included) and by the specification indexes (option
+        and config names) take, in bytes :
+
+            - references : number of references to strings,
+            - strings : number of distinct string objects,
+            - bytes : size of these objects,
+            - bytes_saved : size of the references sharing their object with
+              another one, that one object per reference would add,
+            - table_bytes : size of the table of intern_strings (0 if
+              disabled).
+
+        Sections read lazily and not loaded yet are left out. """
+
+        sizes = {}
+        count = saved = 0
+        for string in self._stored_strings():
+            if(not isinstance(string, text_type)):
+                continue
+            count += 1
+            if(id(string) in sizes):
+                saved += sizes[id(string)]
+            else:
+                sizes[id(string)] = sys.getsizeof(string)
+        strings = self._strings
+        return {
+            'references': count,
+            'strings': len(sizes),
+            'bytes': sum(sizes.values()),
+            'bytes_saved': saved,
+            'table_bytes': 0 if strings is None else sys.getsizeof(strings),
+        }
+
+    def remove_option(self, section, option):
+        res = super(ExtendedConfigParser, self).remove_option(section, option)
+        self._specs.pop(section, None)
+        self._clear_caches()
+        if(res):
+            self._drop_strings(2)
+        return res
+
+    def __setitem__(self, key, value):
+        super(ExtendedConfigParser, self).__setitem__(key, value)
+        # The section may have been emptied before being read again
+        self._specs.pop(key, None)
+        self._clear_caches()
 
     def __getitem__(self, key):
         try:
@@ -784,6 +2782,7 @@ class ExtendedConfigParser(configparser.ConfigParser):
     def defaults(self):
         return self.father
 
+    @_locked
     def items(self, section=_UNSET, raw=False, vars=None,
               strict=False, defaults=False):
         """ Returns a list of (name, value) tuples for each option in a section
@@ -813,7 +2812,7 @@ class ExtendedConfigParser(configparser.ConfigParser):
         if(section is None or section is _UNSET):
             res = self._items_empty()
         else:
-            sections = self.get_corresponding_sections(section)
+            sections = self._corresponding_sections(section)
             for s in sections:
                 res += (super(ExtendedConfigParser, self).items(s, raw,
                                                                 vars))
@@ -828,16 +2827,27 @@ class ExtendedConfigParser(configparser.ConfigParser):
         excluding its parents. If defaults is True though, the DEFAULT section
         will be included. """
 
-        if(defaults):
-            self._defaults.update(self.father)
-            self._defaults.update(self.default_section)
         if(section is None or section is _UNSET):
-            res = self._items_empty()
-        else:
-            sect = self.get_section_name(section)
-            res = super(ExtendedConfigParser, self).items(sect, raw, vars)
-        self._defaults = {}
-        return res
+            return self._items_empty()
+        sect = self.get_section_name(section)
+        if(not defaults):
+            return super(ExtendedConfigParser, self).items(sect, raw, vars)
+        # Same as configparser's items(), the defaults being the ones of
+        # DEFAULT and of the constructor, without storing them in
+        # self._defaults where other threads would see them
+        d = self._dict()
+        d.update(self.father)
+        d.update(self.default_section)
+        d.update(self._sections[sect])
+        orig_keys = list(d.keys())
+        if(vars):
+            for key, value in vars.items():
+                d[self.optionxform(key)] = value
+        if(raw):
+            return [(option, d[option]) for option in orig_keys]
+        return [(option, self._interpolation.before_get(self, sect, option,
+                                                        d[option], d))
+                for option in orig_keys]
 
     def _items_empty(self):
         """ Returns a list of section_name, section_proxy pairs, including
@@ -845,6 +2855,7 @@ class ExtendedConfigParser(configparser.ConfigParser):
 
         return [(sect, self[sect]) for sect in self._sections]
 
+    @_locked
     def options(self, section, strict=False, defaults=False, cfg_ind=False):
         """ Returns a list of option names for the given section and its
         parents if strict is False, or, if strict is True, returns a list of
@@ -869,7 +2880,7 @@ class ExtendedConfigParser(configparser.ConfigParser):
         parents. """
 
         res = []
-        sections = self.get_corresponding_sections(section)
+        sections = self._corresponding_sections(section)
         for s in sections:
             res += super(ExtendedConfigParser, self).options(s)
         if(self.default_section is not None):
@@ -896,7 +2907,7 @@ class ExtendedConfigParser(configparser.ConfigParser):
         for the given section and its parents. """
 
         res = []
-        sections = self.get_corresponding_sections(section)
+        sections = self._corresponding_sections(section)
         for s in sections:
             # Only the elements that are not in common are taken
             res += list(set(self._options_strict_config_ind(s,
@@ -908,46 +2919,121 @@ class ExtendedConfigParser(configparser.ConfigParser):
         for the given section only. If defaults is True, DEFAULT options will
         be included. """
 
-        res = []
         sect = self.get_section_name(section)
-        options = super(ExtendedConfigParser, self).options(sect)
+        res = list(self._get_specs(sect).keys())
         if(defaults):
+            options = []
             if(self.default_section is not None):
                 options += list(self.default_section.keys())
             if(self.father is not None):
                 options += list(self.father.keys())
-        for o in options:
-            if("[" in o):
-                opt = o[:o.find("[")]
-            else:
-                opt = o
-            if(opt not in res):
-                res.append(opt)
+            known = set(res)
+            for o in options:
+                if("[" in o):
+                    opt = o[:o.find("[")]
+                else:
+                    opt = o
+                if(opt not in known):
+                    known.add(opt)
+                    res.append(opt)
         return res
 
     def set_config_separator(self, separator):
         self.config_separator = separator
+        self._configs = {}
+        self._keys = {}
+        self._clear_caches()
 
     def set_section_separator(self, separator):
         self.section_separator = separator
+        self._index_section_names()
+        self._clear_caches(structure=True)
 
     def set_list_separator(self, separator):
         self.list_separator = separator
+        self._clear_caches()
 
     def set_inheritance(self, inheritance):
         self.inheritance = inheritance
+        self._clear_caches(structure=True)
 
 
 class SectionProxyExtended(configparser.SectionProxy):
     """ A proxy for a single section from a parser. Designed to support
-    inheritance. """
+    inheritance : as a mapping, it holds every option the section can reach
+    (its own, its parents', DEFAULT's and the defaults), without config
+    specification, mapped to the value get() returns for the current config
+    name, as in freeze(). These values are resolved at once and kept until
+    the parser changes. Keys with a config specification (ex : key2[dev]) can
+    still be looked up and tested with in, through get(). """
+
+    __slots__ = ('_parser', '_name', '_view')
 
     def __init__(self, parser, name):
         self._parser = parser
         self._name = name
-
-    def __getitem__(self, key):
+        # (generation, config name, values, interpolated), see _get_view()
+        self._view = None
+
+    def _get_view(self):
+        """ Returns the (values, interpolated) of the options the section can
+        reach. If one of them cannot be interpolated, the values are the raw
+        ones and interpolated is False. """
+
+        parser = self._parser
+        view = self._view
+        if(view is None or view[0] != parser._generation or
+           view[1] != parser.config_name):
+            view = parser._section_view(self._name)
+            # Lookups of concurrent parsers do not store anything
+            if(not parser.concurrent):
+                self._view = view
+        return view[2], view[3]
+
+    def _lookup(self, key, check=False):
+        """ Returns the value of a key : the options the section can reach
+        are taken from the view, the other keys (ex : key2[dev]) and the
+        values which cannot be interpolated are looked up through get().
+        Raises KeyError if it cannot be found. If check is True, only whether
+        it can be found matters : the values are not interpolated. """
+
+        values, interpolated = self._get_view()
+        option = self._parser.optionxform(key)
+        if(option in values and (interpolated or check)):
+            return values[option]
         try:
-            return self._parser.get(self._name, key)
+            return self._parser.get(self._name, key, raw=check)
         except NoOptionError:
             raise KeyError(key)
+
+    def __getitem__(self, key):
+        return self._lookup(key)
+
+    def __contains__(self, key):
+        try:
+            self._lookup(key, True)
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        return iter(self._get_view()[0])
+
+    def __len__(self):
+        return len(self._get_view()[0])
+
+    def get(self, option, fallback=None, raw=False, vars=None, _impl=None,
+            **kwargs):
+        """ Returns the value of an option, or fallback if it cannot be
+        found. """
+
+        if(_impl is None and not raw and vars is None and not kwargs):
+            values, interpolated = self._get_view()
+            if(interpolated):
+                key = self._parser.optionxform(option)
+                if(key in values):
+                    return values[key]
+        if(_impl is None):
+            _impl = self._parser.get
+        return _impl(self._name, option, raw=raw, vars=vars,
+                     fallback=fallback, **kwargs)
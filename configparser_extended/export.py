@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of configparser_extended library
+# released under the MIT license.
+# See the LICENSE file for more information.
+
+""" Export of a configuration resolved for one config name.
+
+The files written are flat : every section appears under its compact name,
+with every option it can reach (inheritance, DEFAULT, defaults) mapped to the
+value get() returns for the config name, so that they can be loaded by any
+INI or JSON reader without further resolution. The values are interpolated
+(read the INI files back with interpolation=None). The sections are resolved
+and written one at a time (see ExtendedConfigParser.iter_resolved()), so that
+huge configurations are not held in memory twice. Options without a value
+(allow_no_value) are left out, get() not finding them either.
+"""
+
+import json
+
+
+def write_ini(parser, fp, config_name=None, space_around_delimiters=True,
+              sect_first=True, cfg_plus=False):
+    """ Writes the sections of a parser resolved for a config name (the
+    current one if None) to a text file in the INI format, as
+    configparser's write() does. Returns the number of sections written. """
+
+    delimiter = parser._delimiters[0]
+    if(space_around_delimiters):
+        delimiter = ' {0} '.format(delimiter)
+    count = 0
+    for name, values in parser.iter_resolved(config_name, sect_first,
+                                             cfg_plus):
+        lines = ['[{0}]\n'.format(name)]
+        for option, value in values.items():
+            lines.append('{0}{1}{2}\n'.format(
+                option, delimiter, str(value).replace('\n', '\n\t')))
+        lines.append('\n')
+        fp.write(''.join(lines))
+        count += 1
+    return count
+
+
+def write_json(parser, fp, config_name=None, sect_first=True,
+               cfg_plus=False):
+    """ Writes the sections of a parser resolved for a config name (the
+    current one if None) to a text file as a JSON object of objects, one
+    section per line. Returns the number of sections written. """
+
+    fp.write('{\n')
+    count = 0
+    for name, values in parser.iter_resolved(config_name, sect_first,
+                                             cfg_plus):
+        if(count):
+            fp.write(',\n')
+        fp.write('{0}: {1}'.format(json.dumps(name), json.dumps(values)))
+        count += 1
+    fp.write('\n}\n' if count else '}\n')
+    return count
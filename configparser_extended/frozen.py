@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of configparser_extended library
+# released under the MIT license.
+# See the LICENSE file for more information.
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+
+class FrozenSection(Mapping):
+    """ A read-only mapping of the resolved options of a section : option
+    names (without config specification) are mapped to their values.
+    Inheritance, DEFAULT, defaults and config specifications have already
+    been applied. """
+
+    __slots__ = ('_name', '_values')
+
+    def __init__(self, name, values):
+        self._name = name
+        self._values = dict(values)
+
+    @property
+    def name(self):
+        return self._name
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def __repr__(self):
+        return '<FrozenSection: {0}>'.format(self._name)
+
+
+class FrozenConfig(Mapping):
+    """ A read-only mapping of compact section names to FrozenSections, as
+    returned by ExtendedConfigParser.freeze(). It keeps no reference to the
+    parser, so that it can be shared between threads. Sections may also be
+    accessed with their full name (ex : sect1:sect2:sect3). """
+
+    __slots__ = ('_sections', '_names', '_config_name')
+
+    def __init__(self, sections, names=None, config_name=''):
+        self._sections = sections
+        self._names = dict(names or {})
+        self._config_name = config_name
+
+    @property
+    def config_name(self):
+        return self._config_name
+
+    def __getitem__(self, key):
+        try:
+            return self._sections[key]
+        except KeyError:
+            if(key not in self._names):
+                raise
+        return self._sections[self._names[key]]
+
+    def __iter__(self):
+        return iter(self._sections)
+
+    def __len__(self):
+        return len(self._sections)
+
+    def __contains__(self, key):
+        return key in self._sections or key in self._names
+
+    def __repr__(self):
+        return '<FrozenConfig: {0}>'.format(self._config_name)
+
+    def sections(self):
+        """ Returns the list of the compact section names. """
+
+        return list(self._sections)
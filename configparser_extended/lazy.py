@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of configparser_extended library
+# released under the MIT license.
+# See the LICENSE file for more information.
+
+""" Lazy loading of the sections of large files.
+
+scan() only looks for the section headers of a memory-mapped file and
+returns the byte range of every section. The sections are stored in the
+parser as LazySection placeholders, in a LazySections mapping which parses
+them the first time they are accessed. The map is closed once scanned : the
+byte range of a section is read from the file when it is parsed
+(parse_segment()), after checking that the file did not change since it was
+scanned.
+
+A line starting with a section header at its very first column always starts
+a section (it cannot be the continuation of a value), so parsing the bytes
+between two such lines gives the same result as parsing the whole file. Files
+containing indented headers cannot be split that way and are read at once.
+"""
+
+import io
+import mmap
+import os
+import re
+
+try:
+    from backports.configparser.helpers import OrderedDict
+except ImportError:
+    from collections import OrderedDict
+from configparser import DuplicateSectionError, MissingSectionHeaderError, \
+    ParsingError
+
+from configparser_extended.cache import mtime
+from configparser_extended.reader import inline_comment_start, parse_lines
+
+# Lines which may be section headers
+_HEADER_CANDIDATE = re.compile(br'^[ \t\f\v\r]*\[', re.M)
+
+
+class LazySection(object):
+    """ Placeholder of a section which has not been parsed yet : the content
+    already loaded (base, or None) and the byte ranges to parse next, as
+    (file name, start, end, encoding, reader settings, signature) tuples,
+    see parse_segment(). """
+
+    __slots__ = ('base', 'segments')
+
+    def __init__(self, base, segments):
+        self.base = base
+        self.segments = segments
+
+
+class LazySections(OrderedDict):
+    """ The mapping of the sections of a parser reading files lazily : the
+    LazySection placeholders are replaced by the actual sections, built by
+    loader(name, placeholder), as soon as they are accessed. Iterating over
+    the names does not load anything. """
+
+    def __init__(self, loader, *args):
+        OrderedDict.__init__(self, *args)
+        self._loader = loader
+
+    def __getitem__(self, key):
+        value = OrderedDict.__getitem__(self, key)
+        if(type(value) is LazySection):
+            value = self._loader(key, value)
+            OrderedDict.__setitem__(self, key, value)
+        return value
+
+    def peek(self, key, default=None):
+        """ Returns the value stored, placeholder or section, without loading
+        it. """
+
+        return OrderedDict.get(self, key, default)
+
+    def get(self, key, default=None):
+        if(key in self):
+            return self[key]
+        return default
+
+    def pop(self, key, *args):
+        if(key in self):
+            value = self[key]
+            OrderedDict.__delitem__(self, key)
+            return value
+        return OrderedDict.pop(self, key, *args)
+
+    def setdefault(self, key, default=None):
+        if(key in self):
+            return self[key]
+        self[key] = default
+        return default
+
+    def items(self):
+        return [(key, self[key]) for key in list(self)]
+
+    def values(self):
+        return [self[key] for key in list(self)]
+
+    def loaded(self):
+        """ Returns the list of the names of the sections loaded. """
+
+        return [key for key in self
+                if(type(self.peek(key)) is not LazySection)]
+
+
+def scan(buf, fpname, encoding, settings):
+    """ Returns the sections of a memory-mapped file as a (segments, error)
+    pair, segments being a list of (section name, start, end) and error the
+    error of the fragments (see the reader module) to raise once the
+    segments have been stored, or None if the file contains indented section
+    headers. """
+
+    comment_prefixes = settings['comment_prefixes']
+    inline_prefixes = settings['inline_comment_prefixes']
+    sect_match = settings['sectcre'].match
+    headers = []
+    for mo in _HEADER_CANDIDATE.finditer(buf):
+        start = mo.start()
+        if(mo.end() - 1 > start):
+            return None
+        end = buf.find(b'\n', start)
+        line = buf[start:len(buf) if end == -1 else end + 1].decode(encoding)
+        value = line.strip()
+        if(comment_prefixes and value.startswith(comment_prefixes)):
+            continue
+        if(inline_prefixes):
+            comment = inline_comment_start(line, inline_prefixes)
+            if(comment is not None):
+                value = line[:comment].strip()
+        header = sect_match(value)
+        if(header):
+            headers.append((header.group('header'), start))
+
+    # Only blank lines and comments may come before the first section
+    first = headers[0][1] if headers else len(buf)
+    if(buf[:first].strip()):
+        sections, error, includes = parse_lines(io.StringIO(
+            buf[:first].decode(encoding), newline=None), fpname, settings)
+        if(error is not None and error[0] is MissingSectionHeaderError):
+            return [], error
+
+    segments = []
+    seen = set()
+    for i, (name, start) in enumerate(headers):
+        if(settings['strict'] and name in seen):
+            lineno = count_lines(buf, start) + 1
+            return segments, (DuplicateSectionError, (name, fpname, lineno))
+        seen.add(name)
+        end = headers[i + 1][1] if i + 1 < len(headers) else len(buf)
+        segments.append((name, start, end))
+    return segments, None
+
+
+def count_lines(buf, end):
+    """ Returns the number of lines before a position of a buffer, or of a
+    binary file. """
+
+    if(hasattr(buf, 'read')):
+        buf.seek(0)
+        buf = buf.read(end)
+    count = 0
+    for i in range(0, end, 1 << 20):
+        count += buf[i:min(end, i + (1 << 20))].count(b'\n')
+    return count
+
+
+def shift_error(error, offset):
+    """ Returns the error of a fragment parsed from the middle of a file,
+    its line numbers being shifted by offset. """
+
+    cls, args = error
+    if(cls is ParsingError):
+        return cls, (args[0], [(lineno + offset, line)
+                               for lineno, line in args[1]])
+    return cls, args[:-1] + (args[-1] + offset,)
+
+
+def map_file(path):
+    """ Returns a read-only memory map of a file (or an empty bytes for an
+    empty file) and the (size, modification time) of the file mapped. """
+
+    with open(path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            buf = b''
+        return buf, (st.st_size, mtime(st))
+
+
+def parse_segment(segment):
+    """ Parses the byte range of a section found by scan() (see LazySection)
+    and returns its fragment, the line numbers of its error being the ones
+    of the file. Raises RuntimeError if the size or modification time of the
+    file changed since it was scanned. """
+
+    path, start, end, encoding, settings, signature = segment
+    with open(path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        data = None
+        if((st.st_size, mtime(st)) == signature):
+            f.seek(start)
+            data = f.read(end - start)
+        if(data is None or len(data) != end - start):
+            raise RuntimeError('{0} changed since it was read lazily : it '
+                               'must be read again'.format(path))
+        fragment = parse_lines(io.StringIO(data.decode(encoding),
+                                           newline=None), path, settings)
+        if(fragment[1] is not None):
+            fragment = fragment[0], shift_error(
+                fragment[1], count_lines(f, start)), fragment[2]
+    return fragment
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of configparser_extended library
+# released under the MIT license.
+# See the LICENSE file for more information.
+
+""" Parsing of the sources into fragments.
+
+A fragment is what a source contributes to a parser : a (sections, error,
+includes) tuple where sections is an ordered mapping of section names to
+ordered mappings of option names to their (joined, not yet interpolated)
+values, error is None or the error to raise once the fragment has been merged
+(see raise_error()), and includes the tuple of the paths given to the include
+directive, if any. Fragments only hold builtin types, so that they can be
+built in other threads or processes and cached.
+"""
+
+import io
+import itertools
+import locale
+import mmap
+import sys
+from configparser import ParsingError, DuplicateSectionError, \
+    DuplicateOptionError, MissingSectionHeaderError
+
+# Bytes of a memory-mapped file decoded at once, see mapped_lines()
+_BLOCK_SIZE = 1 << 16
+
+
+def inline_comment_start(line, prefixes):
+    """ Returns the index of the inline comment of a line, or None. As in
+    configparser, the occurrences of the prefixes are looked at in turns, the
+    first turn finding a prefix at the start of the line or after a whitespace
+    giving the smallest such index. """
+
+    indexes = dict((prefix, -1) for prefix in prefixes)
+    while(indexes):
+        start = None
+        next_indexes = {}
+        for prefix, index in indexes.items():
+            index = line.find(prefix, index + 1)
+            if(index == -1):
+                continue
+            next_indexes[prefix] = index
+            if(index == 0 or line[index - 1].isspace()):
+                if(start is None or index < start):
+                    start = index
+        if(start is not None):
+            return start
+        indexes = next_indexes
+    return None
+
+
+def parse_lines(lines, fpname, settings):
+    """ Parses the lines of a source just as configparser does and returns
+    its fragment. settings is the dict returned by
+    ExtendedConfigParser._reader_settings(). """
+
+    comment_prefixes = settings['comment_prefixes']
+    inline_prefixes = settings['inline_comment_prefixes']
+    empty_lines_in_values = settings['empty_lines_in_values']
+    strict = settings['strict']
+    dict_type = settings['dict_type']
+    sect_match = settings['sectcre'].match
+    opt_match = settings['optcre'].match
+    nonspace = settings['nonspacecre'].search
+    optionxform = settings['optionxform']
+    include = settings.get('include')
+
+    sections = dict_type()
+    includes = []
+    elements_added = set()
+    errors = []
+    error = None
+    cursect = None
+    sectname = None
+    optname = None
+    indent_level = 0
+    for lineno, line in enumerate(lines, start=1):
+        comment_start = None
+        if(inline_prefixes):
+            comment_start = inline_comment_start(line, inline_prefixes)
+        stripped = line.strip()
+        if(comment_prefixes and stripped.startswith(comment_prefixes)):
+            comment_start = 0
+        if(comment_start is None):
+            value = stripped
+        else:
+            value = line[:comment_start].strip()
+        if(not value):
+            if(empty_lines_in_values):
+                # Empty line added to the value, unless it was a comment
+                if(comment_start is None and cursect is not None and
+                   optname and cursect[optname] is not None):
+                    cursect[optname].append('')
+            else:
+                # Empty line marks the end of the value
+                indent_level = sys.maxsize
+            continue
+        first_nonspace = nonspace(line)
+        cur_indent_level = first_nonspace.start() if first_nonspace else 0
+        # Continuation line
+        if(cursect is not None and optname and
+           cur_indent_level > indent_level):
+            cursect[optname].append(value)
+            continue
+        indent_level = cur_indent_level
+        if(include and not cur_indent_level and value.startswith(include) and
+           value[len(include):len(include) + 1].isspace()):
+            # Include directive, ends the current value
+            includes.append(value[len(include):].strip())
+            optname = None
+            continue
+        mo = sect_match(value)
+        if(mo):
+            sectname = mo.group('header')
+            if(strict and sectname in elements_added):
+                error = (DuplicateSectionError, (sectname, fpname, lineno))
+                break
+            cursect = sections.get(sectname)
+            if(cursect is None):
+                cursect = sections[sectname] = dict_type()
+            elements_added.add(sectname)
+            # Sections cannot start with a continuation line
+            optname = None
+        elif(cursect is None):
+            error = (MissingSectionHeaderError, (fpname, lineno, line))
+            break
+        else:
+            mo = opt_match(value)
+            if(mo):
+                optname, vi, optval = mo.group('option', 'vi', 'value')
+                if(not optname):
+                    errors.append((lineno, repr(line)))
+                optname = optname.rstrip()
+                if(optionxform is None):
+                    optname = optname.lower()
+                else:
+                    optname = optionxform(optname)
+                if(strict and (sectname, optname) in elements_added):
+                    error = (DuplicateOptionError, (sectname, optname, fpname,
+                                                    lineno))
+                    break
+                elements_added.add((sectname, optname))
+                if(optval is not None):
+                    cursect[optname] = [optval.strip()]
+                else:
+                    # Option without value
+                    cursect[optname] = None
+            else:
+                # Non-fatal error, raised at the end of the source with
+                # every bogus line
+                errors.append((lineno, repr(line)))
+
+    # Multiline values
+    for options in sections.values():
+        for name, val in options.items():
+            if(isinstance(val, list)):
+                options[name] = '\n'.join(val).rstrip()
+    if(error is None and errors):
+        error = (ParsingError, (fpname, errors))
+    return sections, error, tuple(includes)
+
+
+def read_path(path, encoding, settings, use_mmap=False):
+    """ Returns the fragment of a file, or None if it cannot be opened. If
+    use_mmap is True, the file is memory-mapped (see mapped_lines()). """
+
+    try:
+        if(use_mmap):
+            if(encoding is None):
+                encoding = locale.getpreferredencoding(False)
+            if(u'\n'.encode(encoding) == b'\n'):
+                with io.open(path, 'rb') as fp:
+                    return parse_lines(mapped_lines(fp, encoding), path,
+                                       settings)
+        with io.open(path, encoding=encoding) as fp:
+            return parse_lines(fp, path, settings)
+    except (IOError, OSError):
+        return None
+
+
+def mapped_lines(fp, encoding):
+    """ Returns an iterator over the lines of a binary file, read from a
+    read-only memory map of the file. The map is decoded a block of lines at
+    a time and the pages already parsed are given back to the system, so
+    that neither the whole content nor the list of its lines is held in
+    memory. The encoding must encode '\\n' as b'\\n' (ex : utf-8, latin-1,
+    but not utf-16); \\r\\n line endings are turned into \\n, as text files
+    do. """
+
+    try:
+        buf = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # Empty file
+        return iter(())
+    # The lines of a block are split by io.StringIO, not by Python code
+    return itertools.chain.from_iterable(_mapped_blocks(buf, encoding))
+
+
+def _mapped_blocks(buf, encoding):
+    """ Yields the decoded blocks of a memory map, as files of lines, then
+    closes it. """
+
+    # Not available before Python 3.8 nor on every platform
+    advise = getattr(buf, 'madvise', None)
+    dontneed = getattr(mmap, 'MADV_DONTNEED', None)
+    try:
+        size = len(buf)
+        pos = 0
+        released = 0
+        while(pos < size):
+            # A block ends at the end of a line
+            end = buf.find(b'\n', pos + _BLOCK_SIZE)
+            end = size if end == -1 else end + 1
+            block = buf[pos:end]
+            if(b'\r\n' in block):
+                block = block.replace(b'\r\n', b'\n')
+            yield io.StringIO(block.decode(encoding), newline='\n')
+            pos = end
+            if(advise is not None and dontneed is not None):
+                page = pos - pos % mmap.PAGESIZE
+                if(page > released):
+                    advise(dontneed, released, page - released)
+                    released = page
+    finally:
+        buf.close()
+
+
+def raise_error(error):
+    """ Raises the error of a fragment, if any. """
+
+    if(error is None):
+        return
+    cls, args = error
+    if(cls is ParsingError):
+        exc = ParsingError(args[0])
+        for lineno, line in args[1]:
+            exc.append(lineno, line)
+        raise exc
+    raise cls(*args)
@@ -2,13 +2,29 @@
 # -*- coding: utf-8 -*-
 
 import unittest
+import configparser
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
 from configparser import NoOptionError, NoSectionError
-from configparser_extended import ExtendedConfigParser, SectionProxyExtended
+from configparser_extended import ExtendedConfigParser, SectionProxyExtended, \
+    FrozenConfig, FrozenSection
+from configparser_extended import reader
+from configparser_extended.cdb import CdbConfig, write_cdb
+from configparser_extended.export import write_ini, write_json
 try:
     from backports.configparser.helpers import OrderedDict
 except ImportError:
     from collections import OrderedDict
 from six import u
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
 
 
 class BasicTestCase(unittest.TestCase):
@@ -872,3 +888,1646 @@ class SpecificationTestCase(unittest.TestCase):
     def test_get_specified_vars(self):
         self.assertEqual(self.x.get('sect1', 'key1', vars={'key1[dev]': 'deez'}
                                     ), 'deez')
+
+
+class CompiledTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.x = ExtendedConfigParser(config='dev_plop_toto', compiled=True)
+        self.x.read('./test_cfg.ini')
+        self.y = ExtendedConfigParser(config='dev_plop_toto')
+        self.y.read('./test_cfg.ini')
+
+    def test_compiled_index_built(self):
+        self.assertEqual(len(self.x._resolved), 0)
+        self.x.get('sect1', 'key1')
+        self.assertTrue(len(self.x._resolved) > 0)
+
+    def test_compiled_once_per_batch(self):
+        x = ExtendedConfigParser(config='dev_plop_toto', compiled=True)
+        calls = []
+        compile = x.compile
+        x.compile = lambda *args: calls.append(args) or compile(*args)
+        for i in range(5):
+            x.read('./test_cfg.ini')
+        self.assertEqual(calls, [])
+        self.assertEqual(x.get('sect1', 'key1'), self.y.get('sect1', 'key1'))
+        self.assertEqual(x.get('sect3', 'key3'), self.y.get('sect3', 'key3'))
+        self.assertEqual(len(calls), 1)
+
+    def test_compiled_same_results(self):
+        for sect in ['sect1', 'sect2', 'sect3', 'sect4', 'sect8']:
+            for option in self.y._option_names(sect):
+                for sect_first in [True, False]:
+                    for cfg_plus in [True, False]:
+                        self.assertEqual(
+                            self.x.get(sect, option, fallback='nope',
+                                       sect_first=sect_first,
+                                       cfg_plus=cfg_plus),
+                            self.y.get(sect, option, fallback='nope',
+                                       sect_first=sect_first,
+                                       cfg_plus=cfg_plus))
+
+    def test_compiled_fail(self):
+        self.assertRaises(NoOptionError, self.x.get, 'sect1', 'key412')
+        self.assertRaises(NoSectionError, self.x.get, 'sect404', 'key1')
+
+    def test_compiled_fallback(self):
+        self.assertEqual(self.x.get('sect1', 'key412', fallback='deez'),
+                         'deez')
+        self.assertEqual(self.x.get('sect404', 'key1', fallback='deez'),
+                         'deez')
+
+    def test_compiled_list(self):
+        self.assertEqual(self.x.get('sect1', 'key_list', isList=True),
+                         ['damn', 'dang', 'nabbit'])
+
+    def test_compiled_set(self):
+        self.assertEqual(self.x.get('sect2', 'key1'), 'val1_sect2')
+        self.x.set('sect2', 'key1', 'changed')
+        self.assertEqual(self.x.get('sect2', 'key1'), 'changed')
+
+    def test_compiled_config_name(self):
+        self.assertEqual(self.x.get('sect3', 'key3'), 'dev_plop_toto3')
+        self.x.set_config_name('dev')
+        self.assertEqual(self.x.get('sect3', 'key3'), 'dev3')
+
+    def test_compiled_interpolation_error(self):
+        for x in (self.x, self.y):
+            x.read_string(u('[sect9]\nbad=%(missing)s\ngood=%(key)s\n'
+                            'key=val\n'))
+        self.assertEqual(self.x.get('sect1', 'key1'),
+                         self.y.get('sect1', 'key1'))
+        self.assertEqual(self.x.get('sect9', 'good'), 'val')
+        for x in (self.x, self.y):
+            self.assertRaises(configparser.InterpolationMissingOptionError,
+                              x.get, 'sect9', 'bad')
+        self.assertEqual(self.x.get('sect9', 'bad', raw=True),
+                         '%(missing)s')
+
+    def test_compiled_misses_not_stored(self):
+        self.x.get('sect1', 'key1')
+        size = len(self.x._resolved)
+        for i in range(100):
+            self.assertEqual(self.x.get('sect1', 'key{0}'.format(1000 + i),
+                                        fallback=None), None)
+            self.assertRaises(NoOptionError, self.x.get, 'sect1',
+                              'nokey{0}'.format(i))
+        self.assertEqual(len(self.x._resolved), size)
+
+
+class SectionNameIndexTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.x = ExtendedConfigParser()
+        self.x.read('./test_cfg.ini')
+
+    def test_index_read(self):
+        self.assertEqual(self.x._section_names['sect4'], 'sect4:sect5:sect6')
+
+    def test_index_add_section(self):
+        self.x.add_section('sect9:sect2')
+        self.assertEqual(self.x.get_section_name('sect9'), 'sect9:sect2')
+        self.assertEqual(self.x.get('sect9', 'key1'), 'val1_sect2')
+
+    def test_index_remove_section(self):
+        self.x.add_section('sect1:sect3')
+        self.assertTrue(self.x.remove_section('sect1:sect2:sect3'))
+        self.assertEqual(self.x.get_section_name('sect1'), 'sect1:sect3')
+        self.assertTrue(self.x.remove_section('sect1:sect3'))
+        self.assertRaises(NoSectionError, self.x.get_section_name, 'sect1')
+
+    def test_index_set_section_separator(self):
+        self.x.set_section_separator('%')
+        self.assertRaises(NoSectionError, self.x.get_section_name, 'sect1')
+        self.x.set_section_separator(':')
+        self.assertEqual(self.x.get_section_name('sect1'), 'sect1:sect2:sect3')
+
+
+class ChainCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.x = ExtendedConfigParser(inheritance='implicit')
+        self.x.read('./test_cfg.ini')
+
+    def test_chain_cached(self):
+        self.x.get('sect8', 'grandpa')
+        self.assertEqual(self.x._chains[('sect8', True)],
+                         ('sect8:sect5', 'sect5:sect51', 'sect51'))
+
+    def test_chain_returns_copy(self):
+        self.x.get_corresponding_sections('sect8').append('sect404')
+        self.assertEqual(self.x.get_corresponding_sections('sect8'),
+                         ['sect8:sect5', 'sect5:sect51', 'sect51'])
+
+    def test_chain_add_section(self):
+        self.assertEqual(self.x.get('sect8', 'grandpa'), '51')
+        self.x.remove_section('sect51')
+        self.x.add_section('sect51')
+        self.x.set('sect51', 'grandpa', '52')
+        self.assertEqual(self.x.get('sect8', 'grandpa'), '52')
+        self.x.remove_section('sect5:sect51')
+        self.assertRaises(NoSectionError, self.x.get, 'sect8', 'grandpa')
+
+    def test_chain_set_inheritance(self):
+        self.assertEqual(self.x.get('sect8', 'grandpa'), '51')
+        self.x.set_inheritance('explicit')
+        self.assertRaises(NoOptionError, self.x.get, 'sect8', 'grandpa')
+
+
+class ConfigsCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.x = ExtendedConfigParser(config='dev_plop_toto')
+        self.x.read('./test_cfg.ini')
+
+    def test_configs_cached(self):
+        self.x.get('sect3', 'key3')
+        self.assertEqual(self.x._configs[('dev_plop_toto', '_', False)],
+                         ('dev_plop_toto', 'dev_plop', 'dev'))
+
+    def test_configs_plus_cached(self):
+        self.x.get('sect3', 'key3', cfg_plus=True)
+        self.assertEqual(self.x._configs[('dev_plop_toto', '_', True)],
+                         ('dev_plop_toto', 'plop_toto', 'toto', 'dev_plop',
+                          'plop', 'dev'))
+
+    def test_configs_returns_copy(self):
+        self.x.get_configs().append('stuff')
+        self.assertEqual(self.x.get_configs(),
+                         ['dev_plop_toto', 'dev_plop', 'dev'])
+
+    def test_configs_set_config_separator(self):
+        self.x.get_configs()
+        self.x.set_config_separator('#')
+        self.assertEqual(self.x._configs, {})
+        self.assertEqual(self.x.get_configs(), ['dev_plop_toto'])
+
+
+class SpecificationIndexTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.x = ExtendedConfigParser(config='dev')
+        self.x.read('./test_cfg.ini')
+
+    def test_specs(self):
+        specs = self.x._get_specs('sect2')
+        self.assertEqual(list(specs.keys()), ['key1', 'key2'])
+        self.assertEqual(specs['key2'], {None: 'val2', 'dev': 'dev2',
+                                         'dev_plop': 'dev_plop2'})
+
+    def test_split_option(self):
+        self.assertEqual(self.x._split_option('key1[dev]'), ('key1', 'dev'))
+        self.assertEqual(self.x._split_option('key1'), ('key1', None))
+        self.assertEqual(self.x._split_option('key1[dev'),
+                         ('key1', ('key1[dev',)))
+
+    def test_specs_set(self):
+        self.x.set('sect2', 'key1[dev]', 'new_dev1')
+        self.assertEqual(self.x.get('sect2', 'key1'), 'new_dev1')
+        self.assertTrue(self.x.has_option('sect2', 'key1', 'dev',
+                                          strict=True))
+
+    def test_specs_remove_option(self):
+        self.x.remove_option('sect2', 'key2[dev]')
+        self.assertEqual(self.x.get('sect2', 'key2'), 'val2')
+        self.x.remove_option('sect2', 'key2')
+        self.x.remove_option('sect2', 'key2[dev_plop]')
+        self.assertFalse(self.x.has_option('sect2', 'key2', cfg_ind=True,
+                                           strict=True))
+
+    def test_specs_bracket_option(self):
+        self.assertEqual(self.x.get('sect1', 'key1[dev]'), 'dev1')
+
+    def test_no_default_section(self):
+        self.x = ExtendedConfigParser()
+        self.x.read_string(u('[sect1]\nkey1=val1\n'))
+        self.assertRaises(NoOptionError, self.x.get, 'sect1', 'key2')
+        self.assertEqual(self.x.get('sect1', 'key2', fallback='deez'), 'deez')
+
+
+class FreezeTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.x = ExtendedConfigParser(config='dev_plop_toto')
+        self.x.read('./test_cfg.ini')
+        self.frozen = self.x.freeze()
+
+    def test_freeze_type(self):
+        self.assertTrue(isinstance(self.frozen, FrozenConfig))
+        self.assertTrue(isinstance(self.frozen['sect1'], FrozenSection))
+
+    def test_freeze_sections(self):
+        self.assertEqual(self.frozen.sections(),
+                         ['sect1', 'sect2', 'sect3', 'sect4', 'sect5',
+                          'sect51', 'sect6', 'sect61', 'sect8'])
+        self.assertTrue('sect1:sect2:sect3' in self.frozen)
+        self.assertTrue(self.frozen['sect1:sect2:sect3'] is
+                        self.frozen['sect1'])
+
+    def test_freeze_values(self):
+        for sect in self.frozen:
+            for option in self.x._option_names(sect):
+                self.assertEqual(self.frozen[sect].get(option),
+                                 self.x.get(sect, option, fallback=None))
+
+    def test_freeze_config_name(self):
+        frozen = self.x.freeze('dev')
+        self.assertEqual(frozen.config_name, 'dev')
+        self.assertEqual(frozen['sect3']['key3'], 'dev3')
+        self.assertEqual(self.x.get_config_name(), 'dev_plop_toto')
+
+    def test_freeze_sect_first(self):
+        self.x.set_config_name('dev_plop_toto')
+        frozen = self.x.freeze(sect_first=False)
+        self.assertEqual(frozen['sect1']['key1'], 'dev_plop_toto1_sect3')
+
+    def test_freeze_unmodified(self):
+        self.x.set('sect2', 'key1', 'changed')
+        self.assertEqual(self.frozen['sect2']['key1'], 'val1_sect2')
+
+    def test_freeze_read_only(self):
+        def assign():
+            self.frozen['sect2']['key1'] = 'changed'
+        self.assertRaises(TypeError, assign)
+        self.assertRaises(AttributeError, setattr, self.frozen['sect2'],
+                          'stuff', 'changed')
+
+
+class BulkTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.x = ExtendedConfigParser(config='dev_plop')
+        self.x.read('./test_cfg.ini')
+
+    def test_get_many(self):
+        res = OrderedDict([('key3', 'dev_plop3'), ('key1', 'dev1'),
+                           ('key049', 'DEFAULT')])
+        self.assertEqual(self.x.get_many('sect1', ['key3', 'key1', 'key049']),
+                         res)
+
+    def test_get_many_sect_first(self):
+        self.x.set_config_name('dev_plop_toto')
+        res = self.x.get_many('sect1', ['key1', 'key3'], sect_first=False)
+        self.assertEqual(res['key1'], 'dev_plop_toto1_sect3')
+        self.assertEqual(res['key3'], 'dev_plop_toto3')
+
+    def test_get_many_fail(self):
+        self.assertRaises(NoOptionError, self.x.get_many, 'sect1',
+                          ['key1', 'key412'])
+        self.assertRaises(NoSectionError, self.x.get_many, 'sect404',
+                          ['key1'])
+
+    def test_get_many_fallback(self):
+        res = OrderedDict([('key1', 'dev1'), ('key412', 'deez')])
+        self.assertEqual(self.x.get_many('sect1', ['key1', 'key412'],
+                                         fallback='deez'), res)
+        self.assertEqual(self.x.get_many('sect404', ['key1'],
+                                         fallback='deez'),
+                         OrderedDict([('key1', 'deez')]))
+
+    def test_get_many_vars(self):
+        res = self.x.get_many('sect1', ['key1', 'key2'],
+                              vars={'key2': 'deez'})
+        self.assertEqual(res, OrderedDict([('key1', 'dev1'),
+                                           ('key2', 'deez')]))
+
+    def test_resolve_section(self):
+        res = self.x.resolve_section('sect2')
+        self.assertEqual(res, OrderedDict([('key1', 'val1_sect2'),
+                                           ('key2', 'dev_plop2'),
+                                           ('key3', 'default3'),
+                                           ('key049', 'DEFAULT')]))
+
+    def test_resolve_section_same_as_get(self):
+        for option, value in self.x.resolve_section('sect1').items():
+            self.assertEqual(self.x.get('sect1', option), value)
+
+
+class TypedCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.x = ExtendedConfigParser(typed_cache=True)
+        self.x.read('./test_cfg.ini')
+
+    def test_typed_cache_values(self):
+        self.assertEqual(self.x.getint('sect1', 'key_int'), 1)
+        self.assertEqual(self.x.getint('sect1', 'key_int'), 1)
+        self.assertEqual(self.x.getfloat('sect1', 'key_float'), 1.24)
+        self.assertTrue(self.x.getboolean('sect1', 'key_bool1'))
+        self.assertEqual(self.x.getfloatlist('sect1', 'key_list_float'),
+                         [0.96, 1.73, 6.82])
+        self.assertEqual(self.x.getbooleanlist('sect1', 'key_list_bool'),
+                         [True, False, True])
+        self.assertEqual(len(self.x._typed), 5)
+
+    def test_typed_cache_list_copy(self):
+        self.x.getintlist('sect1', 'key_list_int').append(42)
+        self.assertEqual(self.x.getintlist('sect1', 'key_list_int'),
+                         [1, 7, 3])
+
+    def test_typed_cache_set(self):
+        self.assertEqual(self.x.getint('sect1', 'key_int'), 1)
+        self.x.set('sect1:sect2:sect3', 'key_int', '2')
+        self.assertEqual(self.x.getint('sect1', 'key_int'), 2)
+
+    def test_typed_cache_list_separator(self):
+        self.assertEqual(self.x.getintlist('sect1', 'key_list_int'),
+                         [1, 7, 3])
+        self.x.set_list_separator(',')
+        self.assertRaises(ValueError, self.x.getintlist, 'sect1',
+                          'key_list_int')
+
+    def test_typed_cache_fallback(self):
+        self.assertEqual(self.x.getint('sect1', 'key173', fallback=4), 4)
+        self.assertEqual(self.x.getint('sect1', 'key173',
+                                       fallback='not_an_int'), 'not_an_int')
+        self.assertEqual(self.x._typed, {})
+
+    def test_typed_cache_wrong_type(self):
+        self.assertRaises(ValueError, self.x.getboolean, 'sect1', 'key_bool6')
+        self.assertRaises(ValueError, self.x.getboolean, 'sect1', 'key_bool6')
+
+
+class StatsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.x = ExtendedConfigParser(config='dev_plop', stats=True)
+        self.x.read('./test_cfg.ini')
+
+    def test_stats_disabled(self):
+        x = ExtendedConfigParser()
+        x.read('./test_cfg.ini')
+        self.assertEqual(x.get('sect1', 'key1'), 'val1')
+        self.assertIsNone(x.stats())
+
+    def test_stats_get(self):
+        self.assertEqual(self.x.get('sect1', 'key1', raw=True), 'dev1')
+        self.assertEqual(self.x.get('sect1', 'key049', raw=True), 'DEFAULT')
+        stats = self.x.stats()
+        self.assertEqual(stats['get'], 2)
+        self.assertEqual(stats['hits']['section'], 1)
+        self.assertEqual(stats['hits']['default'], 1)
+        self.assertTrue(stats['sections_probed'] >= 4)
+        self.assertTrue(stats['option_misses'] > 0)
+        self.assertEqual(stats['latency']['section_config_loop']['count'], 2)
+        self.assertEqual(sum(stats['latency']['section_config_loop']
+                             ['histogram'].values()), 2)
+
+    def test_stats_fallback_and_errors(self):
+        self.assertEqual(self.x.get('sect1', 'key412', fallback='deez'),
+                         'deez')
+        self.assertEqual(self.x.get('sect1', 'key1', vars={'key1': 'v'}), 'v')
+        self.assertRaises(NoOptionError, self.x.get, 'sect1', 'key412')
+        self.assertRaises(NoSectionError, self.x.get, 'sect404', 'key1')
+        stats = self.x.stats()
+        self.assertEqual(stats['get'], 4)
+        self.assertEqual(stats['hits']['fallback'], 1)
+        self.assertEqual(stats['hits']['vars'], 1)
+        self.assertEqual(stats['errors'], {'no_option': 1, 'no_section': 1})
+
+    def test_stats_compiled(self):
+        self.x.compile()
+        self.x.reset_stats()
+        self.x.get('sect1', 'key1', raw=True)
+        stats = self.x.stats()
+        self.assertEqual(stats['hits']['compiled'], 1)
+        self.assertEqual(list(stats['latency']), ['compiled'])
+
+    def test_stats_reset(self):
+        self.x.getint('sect1', 'key_int', raw=True)
+        self.assertEqual(self.x.stats()['get'], 1)
+        self.x.reset_stats()
+        self.assertEqual(self.x.stats()['get'], 0)
+        self.x.enable_stats(False)
+        self.x.get('sect1', 'key1')
+        self.assertIsNone(self.x.stats())
+
+
+class ReaderTestCase(unittest.TestCase):
+
+    text = u('[sect1:sect2]\n'
+             'key1 = val1 ; not a comment\n'
+             'key1[dev] = multi\n'
+             '    line\n'
+             '# comment\n'
+             'key2 : val2\n'
+             '[sect2]\n'
+             'key3=val3\n'
+             '[DEFAULT]\n'
+             'key4=default4\n')
+
+    def setUp(self):
+        self.x = ExtendedConfigParser(config='dev')
+        self.x.read_string(self.text)
+
+    def test_read_same_as_configparser(self):
+        y = configparser.ConfigParser(default_section='NONE')
+        y.read_string(self.text)
+        for s in self.x.sections():
+            self.assertEqual(dict(self.x._sections[s]), dict(y._sections[s]))
+        self.assertEqual(dict(self.x.default_section),
+                         dict(y._sections['DEFAULT']))
+
+    def test_read_indexes(self):
+        self.assertEqual(self.x._section_names, {'sect1': 'sect1:sect2',
+                                                 'sect2': 'sect2'})
+        self.assertEqual(self.x._specs['sect1:sect2']['key1'],
+                         {None: 'val1 ; not a comment',
+                          'dev': 'multi\nline'})
+        self.assertNotIn('DEFAULT', self.x._specs)
+        self.assertTrue(isinstance(self.x['sect1'], SectionProxyExtended))
+        self.assertEqual(self.x.get('sect1', 'key1'), 'multi\nline')
+
+    def test_read_update(self):
+        self.x.read_string(u('[sect2]\nkey3[dev]=dev3\n[sect3]\nkey5=val5\n'))
+        self.assertEqual(self.x.get('sect1', 'key3'), 'dev3')
+        self.assertEqual(self.x.get('sect3', 'key5'), 'val5')
+        self.assertEqual(self.x._specs['sect2']['key3'],
+                         {None: 'val3', 'dev': 'dev3'})
+
+    def test_read_errors(self):
+        self.assertRaises(configparser.MissingSectionHeaderError,
+                          self.x.read_string, u('key=val\n'))
+        self.assertRaises(configparser.DuplicateSectionError,
+                          self.x.read_string, u('[sect5]\n[sect5]\n'))
+        self.assertRaises(configparser.ParsingError,
+                          self.x.read_string, u('[sect6]\nbad line\n'))
+
+    def test_read_inline_comments(self):
+        x = ExtendedConfigParser(inline_comment_prefixes=(';', '#'))
+        x.read_string(u('[sect1]\nkey1 = val1 ; comment\nkey2 = a#b # c\n'))
+        self.assertEqual(x.get('sect1', 'key1'), 'val1')
+        self.assertEqual(x.get('sect1', 'key2'), 'a#b')
+
+
+class SectionProxyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.x = ExtendedConfigParser(config='dev')
+        self.x.read('./test_cfg.ini')
+
+    def test_proxies_kept_between_reads(self):
+        proxy = self.x['sect2']
+        self.x.read_string(u('[sect2]\nkey9=val9\n[sect9]\nkey9=val9\n'))
+        self.assertIs(self.x['sect2'], proxy)
+        self.assertEqual(proxy['key9'], 'val9')
+        self.assertTrue(isinstance(self.x['sect9'], SectionProxyExtended))
+
+    def test_proxy_slots(self):
+        self.assertEqual(SectionProxyExtended.__slots__,
+                         ('_parser', '_name', '_view'))
+        self.assertEqual(self.x['sect2'].name, 'sect2')
+        self.assertIs(self.x['sect2'].parser, self.x)
+
+    def test_proxy_mapping(self):
+        proxy = self.x['sect1']
+        frozen = self.x.freeze()['sect1']
+        self.assertEqual(dict(proxy), dict(frozen))
+        self.assertEqual(sorted(proxy), sorted(frozen))
+        self.assertEqual(len(proxy), len(frozen))
+        self.assertTrue('key3' in proxy)
+        self.assertTrue('KEY3' in proxy)
+        self.assertFalse('key173' in proxy)
+        self.assertEqual(proxy['key3'], 'dev3')
+        self.assertEqual(proxy['KEY3'], 'dev3')
+        # Keys with a config specification are found as get() finds them,
+        # without being part of the mapping
+        for key in ('key2[dev]', 'key2[dev_plop]', 'KEY2[DEV]'):
+            self.assertTrue(key in proxy)
+            self.assertEqual(proxy[key], self.x.get('sect1', key))
+        self.assertEqual(proxy['key2[dev_plop]'], 'dev_plop2')
+        self.assertFalse('key2[prod]' in proxy)
+        self.assertRaises(KeyError, lambda: proxy['key2[prod]'])
+        self.assertFalse('key2[dev]' in list(proxy))
+        self.assertEqual(proxy.get('key173', 'fb'), 'fb')
+        self.assertEqual(proxy.get('key3', raw=True), 'dev3')
+        self.assertRaises(KeyError, lambda: proxy['key173'])
+
+    def test_proxy_view_cached(self):
+        proxy = self.x['sect1']
+        self.assertEqual(proxy['key1'], 'dev1')
+        view = proxy._view
+        self.assertEqual(dict(proxy)['key2'], 'dev2')
+        self.assertIs(proxy._view, view)
+        self.x.set('sect1:sect2:sect3', 'key1[dev]', 'changed')
+        self.assertEqual(proxy['key1'], 'changed')
+        self.x.config_name = 'dev_plop'
+        self.assertEqual(proxy['key2'], 'dev_plop2')
+        self.x.set_config_name('')
+        self.assertEqual(proxy['key2'], 'val2')
+        self.x.read_string(u('[sect1:sect2:sect3]\nkey9=val9\n'))
+        self.assertTrue('key9' in proxy)
+        self.x.remove_option('sect1:sect2:sect3', 'key9')
+        self.assertFalse('key9' in proxy)
+
+    def test_proxy_interpolation_error(self):
+        self.x.read_string(u('[sect9]\nkey1=%(missing)s\nkey2=val2\n'))
+        proxy = self.x['sect9']
+        self.assertEqual(proxy['key2'], 'val2')
+        self.assertTrue('key1' in proxy)
+        self.assertRaises(configparser.InterpolationMissingOptionError,
+                          lambda: proxy['key1'])
+        self.x.read_string(u('[sect9]\nkey3[dev]=%(missing)s\n'))
+        self.assertTrue('key3[dev]' in proxy)
+        self.assertRaises(configparser.InterpolationMissingOptionError,
+                          lambda: proxy['key3[dev]'])
+
+    def test_proxy_concurrent(self):
+        x = ExtendedConfigParser(config='dev', concurrent=True)
+        x.read('./test_cfg.ini')
+        proxy = x['sect1']
+        self.assertEqual(dict(proxy), dict(x.freeze()['sect1']))
+        self.assertIs(proxy._view, None)
+
+
+class ParallelReadTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.files = []
+        contents = [u('[sect1:sect2]\nkey1=val1\n[DEFAULT]\nkey3=default3\n'),
+                    u('[sect2]\nkey1=val1_sect2\nkey2[dev]=dev2\n'),
+                    u('[sect1:sect2]\nkey1=over1\n[DEFAULT]\nkey4=default4\n')]
+        for i, content in enumerate(contents):
+            path = os.path.join(self.dir, '{0}.ini'.format(i))
+            with io.open(path, 'w') as f:
+                f.write(content)
+            self.files.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def assertSameParser(self, x, y):
+        self.assertEqual(x._sections, y._sections)
+        self.assertEqual(x.default_section, y.default_section)
+        self.assertEqual(x._section_names, y._section_names)
+
+    def test_read_parallel(self):
+        x = ExtendedConfigParser(config='dev')
+        x.read(self.files)
+        y = ExtendedConfigParser(config='dev')
+        self.assertEqual(y.read_parallel(self.files + ['./nope.ini']),
+                         self.files)
+        self.assertSameParser(x, y)
+        self.assertEqual(y.get('sect1', 'key1'), 'over1')
+        self.assertEqual(y.get('sect1', 'key2'), 'dev2')
+        self.assertEqual(y.get('sect1', 'key3'), 'default3')
+
+    def test_read_parallel_directory(self):
+        x = ExtendedConfigParser()
+        x.read(self.files)
+        y = ExtendedConfigParser()
+        self.assertEqual(y.read_parallel(self.dir, max_workers=2), self.files)
+        self.assertSameParser(x, y)
+
+    def test_read_parallel_processes(self):
+        x = ExtendedConfigParser()
+        x.read(self.files)
+        y = ExtendedConfigParser()
+        y.read_parallel(self.files, max_workers=2, processes=True)
+        self.assertSameParser(x, y)
+
+    def test_read_parallel_error(self):
+        with io.open(self.files[1], 'w') as f:
+            f.write(u('[sect2]\nbad line\n'))
+        y = ExtendedConfigParser()
+        self.assertRaises(configparser.ParsingError, y.read_parallel,
+                          self.files)
+        self.assertIn('sect2', y._sections)
+        self.assertNotIn('key4', y._sections['DEFAULT'])
+
+
+class MmapReadTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, name, content, encoding='utf-8', newline=None):
+        path = os.path.join(self.dir, name)
+        with io.open(path, 'w', encoding=encoding, newline=newline) as f:
+            f.write(content)
+        return path
+
+    def test_read_mmap(self):
+        x = ExtendedConfigParser(config='dev_plop')
+        x.read('./test_cfg.ini')
+        y = ExtendedConfigParser(config='dev_plop')
+        self.assertEqual(y.read('./test_cfg.ini', use_mmap=True),
+                         ['./test_cfg.ini'])
+        self.assertEqual(x._sections, y._sections)
+        self.assertEqual(x.default_section, y.default_section)
+        self.assertEqual(y.get('sect1', 'key1'), 'dev1')
+
+    def test_read_mmap_encodings(self):
+        content = u('[sect1]\nkey1 = été\n  suite\n')
+        x = ExtendedConfigParser()
+        x.read([self.write('a.ini', content, newline='\r\n'),
+                self.write('b.ini', u(''))], encoding='utf-8', use_mmap=True)
+        self.assertEqual(x.get('sect1', 'key1'), u('été\nsuite'))
+        y = ExtendedConfigParser()
+        y.read(self.write('c.ini', u('[sect2]\nkey2=à\n'), 'utf-16'),
+               encoding='utf-16', use_mmap=True)
+        self.assertEqual(y.get('sect2', 'key2'), u('à'))
+
+    def test_read_mmap_interpolation(self):
+
+        class Upper(configparser.Interpolation):
+
+            def before_read(self, parser, section, option, value):
+                return value.upper()
+
+        x = ExtendedConfigParser(interpolation=Upper())
+        x.read(self.write('a.ini', u('[sect1]\nkey1=val1\n')), use_mmap=True)
+        self.assertEqual(x.get('sect1', 'key1'), 'VAL1')
+
+    def test_mapped_lines_blocks(self):
+        lines = [u('[sect{0}]\r\nkey{0} = été{0}\r\n').format(i)
+                 for i in range(3000)]
+        path = self.write('a.ini', u('').join(lines) + u('last'), newline='')
+        with io.open(path, 'rb') as fp:
+            mapped = list(reader.mapped_lines(fp, 'utf-8'))
+        with io.open(path, encoding='utf-8') as fp:
+            self.assertEqual(mapped, list(fp))
+        self.assertEqual(len(mapped), 6001)
+
+
+class CacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'a.ini')
+        self.write(u('[sect1:sect2]\nkey1=val1\n[sect2]\nkey2[dev]=dev2\n'))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, content, mtime=None):
+        with io.open(self.path, 'w') as f:
+            f.write(content)
+        if(mtime is not None):
+            os.utime(self.path, (mtime, mtime))
+
+    def read(self, cache=True):
+        x = ExtendedConfigParser(config='dev')
+        x.read(self.path, cache=cache)
+        return x
+
+    def test_cache_file(self):
+        x = self.read()
+        self.assertTrue(os.path.isfile(os.path.join(self.dir,
+                                                    '.a.ini.ecpc')))
+        self.assertEqual(x._sections, self.read()._sections)
+        self.assertEqual(self.read().get('sect1', 'key2'), 'dev2')
+        self.assertEqual(self.read().read_parallel(self.dir, cache=True),
+                         [self.path])
+
+    def test_cache_dir(self):
+        cache = os.path.join(self.dir, 'cache')
+        self.read(cache)
+        self.assertEqual(len(os.listdir(cache)), 1)
+        self.assertEqual(self.read(cache).get('sect1', 'key1'), 'val1')
+
+    def test_cache_hit(self):
+        self.write(u('[sect1]\nkey1=val1\n'), 1000000000)
+        self.read()
+        # Same size and modification time : the cached content is used
+        self.write(u('[sect1]\nkey1=val9\n'), 1000000000)
+        self.assertEqual(self.read().get('sect1', 'key1'), 'val1')
+
+    def test_cache_racy(self):
+        self.write(u('[sect1]\nkey1=val1\n'), 1000000000)
+        self.read()
+        # Cache file written in the tick of the last change of the source :
+        # the source may have changed again without its signature changing
+        os.utime(os.path.join(self.dir, '.a.ini.ecpc'),
+                 (1000000000, 1000000000))
+        self.write(u('[sect1]\nkey1=val9\n'), 1000000000)
+        self.assertEqual(self.read().get('sect1', 'key1'), 'val9')
+
+    def test_cache_invalidation(self):
+        self.write(u('[sect1]\nkey1=val1\n'), 1000000000)
+        self.read()
+        self.write(u('[sect1]\nkey1=changed\n'), 1000000000)
+        self.assertEqual(self.read().get('sect1', 'key1'), 'changed')
+        self.write(u('[sect1]\nkey1=val9\n'), 1000000100)
+        self.assertEqual(self.read().get('sect1', 'key1'), 'val9')
+
+    def test_cache_errors(self):
+        self.write(u('[sect1]\nbad line\n'))
+        self.assertRaises(configparser.ParsingError, self.read)
+        self.assertRaises(configparser.ParsingError, self.read)
+        x = ExtendedConfigParser()
+        self.assertEqual(x.read(os.path.join(self.dir, 'nope.ini'),
+                                cache=True), [])
+
+
+class ReloadTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.base = self.write('base.ini', u('[sect1:sect2]\nkey1=val1\n'
+                                             '[sect2]\nkey2=val2\n'
+                                             '[DEFAULT]\nkey3=default3\n'))
+        self.over = self.write('over.ini', u('[sect2]\nkey2[dev]=dev2\n'))
+        self.x = ExtendedConfigParser(config='dev', reloadable=True,
+                                      typed_cache=True)
+        self.x.read([self.base, self.over])
+        self.t = 1000000000
+
+    def tearDown(self):
+        self.x.unwatch()
+        shutil.rmtree(self.dir)
+
+    def write(self, name, content):
+        path = os.path.join(self.dir, name)
+        with io.open(path, 'w') as f:
+            f.write(content)
+        if(hasattr(self, 't')):
+            # Makes sure the modification time changes
+            self.t += 10
+            os.utime(path, (self.t, self.t))
+        return path
+
+    def test_reload_unchanged(self):
+        self.assertEqual(self.x.reload(), [])
+
+    def test_reload(self):
+        self.assertEqual(self.x.get('sect1', 'key2'), 'dev2')
+        self.write('over.ini', u('[sect2]\nkey2[dev]=dev9\nkey4=4\n'))
+        self.assertEqual(self.x.reload(), [self.over])
+        self.assertEqual(self.x.get('sect1', 'key2'), 'dev9')
+        self.assertEqual(self.x.getint('sect1', 'key4'), 4)
+        self.assertEqual(self.x.get('sect1', 'key1'), 'val1')
+        self.assertEqual(self.x.get('sect1', 'key3'), 'default3')
+
+    def test_reload_structure(self):
+        self.write('base.ini', u('[sect1]\nkey1=val9\n[sect3]\nkey5=val5\n'))
+        self.x.reload()
+        self.assertEqual(self.x.sections(), ['sect1', 'sect3', 'sect2'])
+        self.assertEqual(self.x.get('sect3', 'key5'), 'val5')
+        self.assertEqual(self.x.get('sect1', 'key1'), 'val9')
+        self.assertRaises(NoOptionError, self.x.get, 'sect1', 'key2')
+        self.assertRaises(NoOptionError, self.x.get, 'sect1', 'key3')
+
+    def test_reload_missing_file(self):
+        path = os.path.join(self.dir, 'later.ini')
+        self.x.read(path)
+        os.remove(self.over)
+        self.write('later.ini', u('[sect4]\nkey1=val4\n'))
+        self.assertEqual(sorted(self.x.reload()), sorted([self.over, path]))
+        self.assertEqual(self.x.get('sect4', 'key1'), 'val4')
+        self.assertEqual(self.x.get('sect1', 'key2'), 'val2')
+
+    def test_reload_error(self):
+        self.write('over.ini', u('[sect2]\nbad line\n'))
+        self.assertRaises(configparser.ParsingError, self.x.reload)
+        self.assertEqual(self.x.get('sect1', 'key2'), 'dev2')
+
+    def test_reload_changed_sections(self):
+        self.write('base.ini', u('[sect1:sect2]\nkey1=val9\n'
+                                 '[sect2]\nkey2=val2\n'
+                                 '[DEFAULT]\nkey3=default3\n'))
+        x = self.x
+        sources, changed, affected = x._prepare_reload(
+            x._sources, x._reads, x._reader_settings())
+        self.assertEqual(changed, [self.base])
+        self.assertEqual(affected, set(['sect1:sect2']))
+
+    def test_reload_build_error(self):
+
+        class Failing(configparser.Interpolation):
+
+            def before_read(self, parser, section, option, value):
+                if(value == 'fail'):
+                    raise ValueError(value)
+                return value
+
+        x = ExtendedConfigParser(config='dev', reloadable=True,
+                                 interpolation=Failing())
+        x.read([self.base, self.over])
+        sources = x._sources
+        self.write('base.ini', u('[sect1]\nkey1=val9\n[sect3]\nkey5=fail\n'))
+        self.assertRaises(ValueError, x.reload)
+        self.assertIs(x._sources, sources)
+        self.assertEqual(x.sections(), ['sect1:sect2', 'sect2'])
+        self.assertEqual(x.get('sect1', 'key1'), 'val1')
+
+    def test_reload_not_reloadable(self):
+        x = ExtendedConfigParser()
+        self.assertRaises(ValueError, x.reload)
+
+    def test_watch(self):
+        changes = []
+        done = threading.Event()
+
+        def callback(changed, error):
+            changes.append((changed, error))
+            done.set()
+
+        self.x.watch(0.01, callback)
+        self.write('over.ini', u('[sect2]\nkey2[dev]=dev9\n'))
+        self.assertTrue(done.wait(5))
+        self.x.unwatch()
+        self.assertEqual(changes, [([self.over], None)])
+        self.assertEqual(self.x.get('sect1', 'key2'), 'dev9')
+
+    def test_watch_lookups(self):
+        names = ['sect{0}'.format(i) for i in range(20)]
+        errors = []
+        stop = threading.Event()
+
+        def lookup():
+            while(not stop.is_set()):
+                for name in names:
+                    try:
+                        self.x.get(name, 'key1', fallback=None)
+                        self.x.getint(name, 'key9', fallback=0)
+                    except Exception as e:
+                        errors.append(e)
+
+        self.x.watch(0.001)
+        self.assertIsNotNone(self.x._lock)
+        threads = [threading.Thread(target=lookup) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for i in range(40):
+            # Sections added, removed and moved at every change
+            content = ''.join('[{0}:sect2]\nkey1=val{1}\n'.format(name, i)
+                              for name in names[i % 2::2])
+            self.write('base.ini', u(content) + u('[sect2]\nkey2=val2\n'))
+            time.sleep(0.005)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        self.x.unwatch()
+        self.assertIsNone(self.x._lock)
+        self.assertEqual(errors, [])
+
+
+class LazyReadTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.x = ExtendedConfigParser(config='dev_plop')
+        self.x.read('./test_cfg.ini', lazy=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, name, content):
+        path = os.path.join(self.dir, name)
+        with io.open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_lazy_same_as_read(self):
+        y = ExtendedConfigParser(config='dev_plop')
+        y.read('./test_cfg.ini')
+        self.assertEqual(self.x.sections(), y.sections())
+        self.assertEqual(self.x.default_section, y.default_section)
+        for s in y.sections():
+            self.assertEqual(dict(self.x._sections[s]), dict(y._sections[s]))
+
+    def test_lazy_loading(self):
+        self.assertEqual(self.x._sections.loaded(), [])
+        self.assertEqual(self.x.get('sect2', 'key1'), 'val1_sect2')
+        self.assertEqual(self.x._sections.loaded(), ['sect2'])
+        self.assertEqual(self.x.get('sect1', 'key1'), 'dev1')
+        # Found in sect1 itself : sect3 is not needed
+        self.assertEqual(sorted(self.x._sections.loaded()),
+                         ['sect1:sect2:sect3', 'sect2'])
+        self.assertEqual(self.x['sect4']['son'], '4')
+
+    def test_lazy_layers(self):
+        self.x.read(self.write('a.ini', u('[sect2]\nkey1[dev]=dev_a\n')),
+                    lazy=True)
+        self.x.read_string(u('[sect3]\nkey9=val9\n'))
+        self.assertEqual(self.x.get('sect1', 'key9'), 'val9')
+        self.assertEqual(self.x.get('sect2', 'key1'), 'dev_a')
+        self.assertEqual(self.x.get('sect2', 'key2'), 'dev_plop2')
+
+    def test_lazy_errors(self):
+        path = self.write('a.ini', u('[sect1]\nkey1=val1\n[sect2]\n'
+                                     'bad line\n'))
+        x = ExtendedConfigParser()
+        x.read(path, lazy=True)
+        self.assertEqual(x.get('sect1', 'key1'), 'val1')
+        try:
+            x.get('sect2', 'key1')
+            self.fail()
+        except configparser.ParsingError as e:
+            self.assertEqual(e.errors, [(4, "'bad line\\n'")])
+        self.assertRaises(ValueError, x.read, path, lazy=True, cache=True)
+
+    def test_lazy_changed_file(self):
+        path = self.write('a.ini', u('[sect1]\nkey1=val1\n[sect2]\n'
+                                     'key2=val2\n[sect3]\nkey3=val3\n'))
+        x = ExtendedConfigParser()
+        x.read(path, lazy=True)
+        self.assertEqual(x.get('sect1', 'key1'), 'val1')
+        # Same size, but another modification time
+        self.write('a.ini', u('[sect1]\nkey1=val1\n[sect2]\n'
+                              'key2=new2\n[sect3]\nkey3=val3\n'))
+        os.utime(path, (1000000000, 1000000000))
+        self.assertRaises(RuntimeError, x.get, 'sect2', 'key2')
+        # Truncated
+        self.write('a.ini', u('[sect1]\n'))
+        self.assertRaises(RuntimeError, x.get, 'sect3', 'key3')
+        self.assertEqual(x.get('sect1', 'key1'), 'val1')
+
+    def test_lazy_indented_headers(self):
+        path = self.write('a.ini', u('[sect1]\n  [sect2]\nkey1=val1\n'))
+        x = ExtendedConfigParser()
+        x.read(path, lazy=True)
+        self.assertEqual(x.sections(), ['sect1', 'sect2'])
+        self.assertEqual(x.get('sect2', 'key1'), 'val1')
+
+
+class IncludeTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.dir, 'conf.d'))
+        self.main = self.write('main.ini', u('[sect1:sect2]\nkey1=val1\n'
+                                             '!include conf.d\n'
+                                             '[sect2]\nkey2=val2\n'))
+        self.b = self.write('conf.d/b.ini', u('[sect2]\nkey2=b2\n'))
+        self.a = self.write('conf.d/a.ini', u('[sect2]\nkey2=a2\nkey3=a3\n'))
+        self.write('conf.d/.hidden.ini', u('[sect2]\nkey2=hidden\n'))
+        self.t = 1000000000
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, name, content):
+        path = os.path.join(self.dir, name)
+        with io.open(path, 'w') as f:
+            f.write(content)
+        if(hasattr(self, 't')):
+            # Makes sure the modification time changes
+            self.t += 10
+            os.utime(path, (self.t, self.t))
+        return path
+
+    def test_directory(self):
+        x = ExtendedConfigParser()
+        conf_d = os.path.join(self.dir, 'conf.d')
+        self.assertEqual(x.read(conf_d), [self.a, self.b])
+        self.assertEqual(x.get('sect2', 'key2'), 'b2')
+
+    def test_glob(self):
+        x = ExtendedConfigParser()
+        pattern = os.path.join(self.dir, 'conf.d', '[ab].ini')
+        self.assertEqual(x.read(pattern), [self.a, self.b])
+        self.assertEqual(x.get('sect2', 'key2'), 'b2')
+        self.assertEqual(x.read(os.path.join(self.dir, 'nothing*.ini')), [])
+
+    def test_filenames(self):
+        x = ExtendedConfigParser(include_directive='!include')
+        self.assertEqual(x._filename_list(u(self.main)), [u(self.main)])
+        # Text and bytes paths, the includes of the latter being relative to
+        # its decoded directory
+        self.assertEqual(x.read(u(self.main)), [self.main, self.a, self.b])
+        y = ExtendedConfigParser(include_directive='!include')
+        y.read(self.main.encode('utf-8'))
+        self.assertEqual(y.get('sect1', 'key3'), 'a3')
+        self.assertEqual(x._sections, y._sections)
+
+    def test_include(self):
+        x = ExtendedConfigParser(include_directive='!include')
+        self.assertEqual(x.read(self.main), [self.main, self.a, self.b])
+        # The included files are read after the whole including file
+        self.assertEqual(x.get('sect1', 'key2'), 'b2')
+        self.assertEqual(x.get('sect1', 'key3'), 'a3')
+        self.assertEqual(x.get('sect1', 'key1'), 'val1')
+
+    def test_include_disabled(self):
+        x = ExtendedConfigParser()
+        self.assertRaises(configparser.ParsingError, x.read, self.main)
+        x = ExtendedConfigParser(include_directive='!inc')
+        self.assertRaises(configparser.ParsingError, x.read, self.main)
+
+    def test_include_relative(self):
+        self.write('conf.d/c.ini', u('!include ../other.ini\n'))
+        self.write('other.ini', u('[sect3]\nkey1=other\n'))
+        x = ExtendedConfigParser(include_directive='!include')
+        x.read_string(u('!include {0}\n').format(
+            os.path.join(self.dir, 'conf.d', 'c.ini')))
+        self.assertEqual(x.get('sect3', 'key1'), 'other')
+
+    def test_include_cycle(self):
+        self.write('conf.d/a.ini', u('[sect2]\nkey3=a3\n!include ..\n'
+                                     '!include ../main.ini\n'))
+        x = ExtendedConfigParser(include_directive='!include')
+        self.assertEqual(x.read_parallel(self.main),
+                         [self.main, self.a, self.b])
+        self.assertEqual(x.get('sect2', 'key3'), 'a3')
+
+    def test_include_lazy(self):
+        x = ExtendedConfigParser(include_directive='!include')
+        self.assertRaises(ValueError, x.read, self.main, lazy=True)
+
+    def test_reload(self):
+        x = ExtendedConfigParser(include_directive='!include',
+                                 reloadable=True)
+        x.read(self.main)
+        fragments = [entry[2] for entry in x._sources]
+        self.assertEqual(x.reload(), [])
+        c = self.write('conf.d/c.ini', u('[sect2]\nkey2=c2\n'))
+        self.assertEqual(x.reload(), [c])
+        self.assertEqual(x.get('sect1', 'key2'), 'c2')
+        # The files which did not change are not parsed again
+        self.assertEqual([entry[2] for entry in x._sources[:3]], fragments)
+        os.remove(c)
+        self.assertEqual(x.reload(), [c])
+        self.assertEqual(x.get('sect1', 'key2'), 'b2')
+
+
+@unittest.skipIf(asyncio is None, 'asyncio is not available')
+class AsyncTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.base = self.write('base.ini', u('[sect1:sect2]\nkey1=val1\n'
+                                             '[sect2]\nkey2=val2\n'
+                                             'key2[dev]=dev2\n'))
+        self.x = ExtendedConfigParser(config='dev', reloadable=True)
+        self.loop = asyncio.new_event_loop()
+        self.t = 1000000000
+
+    def tearDown(self):
+        self.x.unwatch()
+        self.loop.close()
+        shutil.rmtree(self.dir)
+
+    def write(self, name, content):
+        path = os.path.join(self.dir, name)
+        with io.open(path, 'w') as f:
+            f.write(content)
+        if(hasattr(self, 't')):
+            # Makes sure the modification time changes
+            self.t += 10
+            os.utime(path, (self.t, self.t))
+        return path
+
+    def run_calls(self, *calls):
+        """ Makes the calls from the event loop, and returns the results of
+        the awaitables they return. """
+
+        started = self.loop.create_future()
+        self.loop.call_soon(lambda: started.set_result(asyncio.gather(
+            *[call() for call in calls], return_exceptions=True)))
+        return self.loop.run_until_complete(
+            self.loop.run_until_complete(started))
+
+    def test_aread(self):
+        res = self.run_calls(lambda: self.x.aread(self.base))
+        self.assertEqual(res, [[self.base]])
+        self.assertEqual(self.x.get('sect1', 'key2'), 'dev2')
+        self.assertEqual(self.x.get('sect1', 'key1'), 'val1')
+
+    def test_aread_shared(self):
+        res = self.run_calls(lambda: self.x.aread(self.base),
+                             lambda: self.x.aread(self.base),
+                             lambda: self.x.aread([self.base]))
+        self.assertEqual(res, [[self.base]] * 3)
+        # Merged once
+        self.assertEqual(len(self.x._sources), 1)
+        self.run_calls(lambda: self.x.aread(self.base))
+        self.assertEqual(len(self.x._sources), 2)
+
+    def test_aread_error(self):
+        path = self.write('bad.ini', u('[sect3]\nkey1=val1\nbad line\n'))
+        res = self.run_calls(lambda: self.x.aread([self.base, path]))
+        self.assertIsInstance(res[0], configparser.ParsingError)
+        # Merged before the error is raised, as read() does
+        self.assertEqual(self.x.get('sect3', 'key1'), 'val1')
+
+    def test_aread_file(self):
+        f = io.StringIO(u('[sect3]\nkey3=val3\n'))
+        self.run_calls(lambda: self.x.aread_file(f))
+        self.assertEqual(self.x.get('sect3', 'key3'), 'val3')
+
+    def test_areload(self):
+        self.run_calls(lambda: self.x.aread(self.base))
+        self.write('base.ini', u('[sect1:sect2]\nkey1=val9\n[sect2]\n'))
+        res = self.run_calls(self.x.areload, self.x.areload)
+        self.assertEqual(res, [[self.base], [self.base]])
+        self.assertEqual(self.x.get('sect1', 'key1'), 'val9')
+        self.assertRaises(NoOptionError, self.x.get, 'sect1', 'key2')
+        self.assertEqual(self.run_calls(self.x.areload), [[]])
+
+    def test_lookups(self):
+        self.x.read(self.base)
+        res = self.run_calls(
+            lambda: self.x.aget_many('sect1', ['key1', 'key2']),
+            lambda: self.x.aresolve_section('sect2'),
+            lambda: self.x.aget_many('sect1', ['nope']))
+        self.assertEqual(res[0], OrderedDict([('key1', 'val1'),
+                                              ('key2', 'dev2')]))
+        self.assertEqual(res[1], OrderedDict([('key2', 'dev2')]))
+        self.assertIsInstance(res[2], NoOptionError)
+
+    def test_lookups_and_changes(self):
+        path = self.write('over.ini', u('[sect2]\nkey2[dev]=over2\n'))
+        self.x.read(self.base)
+        res = self.run_calls(
+            lambda: self.x.aget_many('sect1', ['key2']),
+            lambda: self.x.aread(path),
+            lambda: self.x.aget_many('sect1', ['key2']))
+        # The file is merged once the lookups started before are done
+        self.assertEqual(res[0]['key2'], 'dev2')
+        self.assertEqual(res[2]['key2'], 'dev2')
+        res = self.run_calls(lambda: self.x.aget_many('sect1', ['key2']))
+        self.assertEqual(res[0]['key2'], 'over2')
+
+    def test_changes_in_executor(self):
+        threads = []
+
+        class Recording(configparser.Interpolation):
+
+            def before_read(self, parser, section, option, value):
+                threads.append(threading.current_thread())
+                return value
+
+        x = ExtendedConfigParser(config='dev', reloadable=True, compiled=True,
+                                 interpolation=Recording())
+        self.run_calls(lambda: x.aread(self.base))
+        self.assertTrue(threads)
+        self.assertNotIn(threading.current_thread(), threads)
+        # Compiled in the executor as well
+        self.assertFalse(x._stale)
+        self.assertTrue(x._resolved)
+        self.assertIs(x['sect2']._parser, x)
+        self.assertEqual(x.get('sect1', 'key2'), 'dev2')
+
+    def test_changed_meanwhile(self):
+        from concurrent.futures import Executor, Future
+
+        class Inline(Executor):
+
+            def submit(self, fn, *args, **kwargs):
+                future = Future()
+                future.set_result(fn(*args, **kwargs))
+                return future
+
+        forks = []
+        fork = self.x._fork
+        self.x._fork = lambda touched: forks.append(touched) or fork(touched)
+
+        def calls():
+            # Forked right away, then changed before the fork is adopted
+            res = self.x.aread(self.base, executor=Inline())
+            self.x.read_string(u('[sect3]\nkey3=val3\n'))
+            return res
+
+        self.assertEqual(self.run_calls(calls), [[self.base]])
+        self.assertEqual(len(forks), 2)
+        self.assertEqual(self.x.get('sect3', 'key3'), 'val3')
+        self.assertEqual(self.x.get('sect1', 'key2'), 'dev2')
+
+    def test_watch(self):
+        self.x.read(self.base)
+        changes = []
+        done = self.loop.create_future()
+
+        def callback(changed, error):
+            changes.append((changed, error))
+            done.set_result(None)
+
+        self.x.watch(0.01, callback, loop=self.loop)
+        self.write('base.ini', u('[sect1]\nkey1=val9\n'))
+        self.loop.run_until_complete(asyncio.wait_for(done, 10))
+        self.x.unwatch()
+        self.assertEqual(changes, [([self.base], None)])
+        self.assertEqual(self.x.get('sect1', 'key1'), 'val9')
+
+
+class ExportTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.x = ExtendedConfigParser(defaults={'key8': 'father8',
+                                                'key3': 'father3'},
+                                      config='dev_plop')
+        self.x.read('./test_cfg.ini')
+        self.frozen = self.x.freeze()
+
+    def test_iter_resolved(self):
+        res = list(self.x.iter_resolved('dev'))
+        frozen = self.x.freeze('dev')
+        self.assertEqual([name for name, values in res], frozen.sections())
+        for name, values in res:
+            self.assertEqual(dict(values), dict(frozen[name]))
+
+    def test_write_ini(self):
+        f = io.StringIO()
+        self.assertEqual(write_ini(self.x, f), len(self.frozen))
+        y = configparser.ConfigParser(interpolation=None)
+        y.read_string(f.getvalue())
+        self.assertEqual(y.sections(), self.frozen.sections())
+        for name in self.frozen:
+            self.assertEqual(dict(y[name]), dict(self.frozen[name]))
+        self.assertEqual(y.get('sect1', 'key2'), 'dev_plop2')
+        self.assertEqual(y.get('sect1', 'key8'), 'father8')
+
+    def test_write_ini_no_value(self):
+        x = ExtendedConfigParser(allow_no_value=True)
+        x.read_string(u'[sect]\nflag\nkey = value\n')
+        f = io.StringIO()
+        write_ini(x, f)
+        # get() does not find the option without a value either
+        self.assertEqual(f.getvalue(), '[sect]\nkey = value\n\n')
+
+    def test_write_json(self):
+        f = io.StringIO()
+        write_json(self.x, f, 'dev')
+        res = json.loads(f.getvalue())
+        frozen = self.x.freeze('dev')
+        self.assertEqual(list(res), frozen.sections())
+        self.assertEqual(res['sect1']['key1'], 'dev1')
+        self.assertEqual(res['sect1']['key3'], 'dev3')
+        f = io.StringIO()
+        self.assertEqual(write_json(ExtendedConfigParser(), f), 0)
+        self.assertEqual(json.loads(f.getvalue()), {})
+
+    def test_write_default(self):
+        f = io.StringIO()
+        self.x.write(f)
+        y = ExtendedConfigParser(config='dev_plop')
+        y.read_string(f.getvalue())
+        self.assertEqual(y.get('sect1', 'key049', sect_first=False),
+                         'DEFAULT_dev')
+        self.assertEqual(y.get('sect1', 'key8'), 'father8')
+        # DEFAULT comes before the defaults
+        self.assertEqual(y.get('sect4', 'key3'), 'default3')
+        self.assertEqual(dict(y.freeze()), dict(self.frozen))
+
+
+class ConcurrentTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.x = ExtendedConfigParser(defaults={'key8': 'father8'},
+                                      config='dev_plop', concurrent=True)
+        self.x.read('./test_cfg.ini')
+        self.y = ExtendedConfigParser(defaults={'key8': 'father8'},
+                                      config='dev_plop')
+        self.y.read('./test_cfg.ini')
+
+    def lookups(self, x):
+        res = []
+        for section in ('sect1', 'sect2', 'sect3', 'sect4'):
+            res.append(x.options(section))
+            res.append(x.options(section, cfg_ind=True))
+            res.append(x.items(section))
+            res.append(x.items(section, strict=True, defaults=True))
+            for option in ('key1', 'key2', 'key3', 'key8', 'key_list'):
+                res.append(x.get(section, option, fallback=None))
+                res.append(x.has_option(section, option))
+                res.append(x.has_option(section, option, cfg_ind=True))
+        return res
+
+    def caches(self, x):
+        return (dict(x._chains), dict(x._configs), dict(x._keys),
+                dict(x._specs), x._defaults)
+
+    def test_lookups(self):
+        before = self.caches(self.x)
+        self.assertEqual(self.lookups(self.x), self.lookups(self.y))
+        self.assertEqual(self.caches(self.x), before)
+        self.assertEqual(self.x._defaults, {})
+
+    def test_threads(self):
+        expected = self.lookups(self.y)
+        results = []
+
+        def work():
+            for i in range(20):
+                results.append(self.lookups(self.x) == expected)
+        threads = [threading.Thread(target=work) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, [True] * 160)
+
+    def test_changes(self):
+        self.x.set('sect1:sect2:sect3', 'key1[dev]', 'changed')
+        self.y.set('sect1:sect2:sect3', 'key1[dev]', 'changed')
+        self.x.set_config_name('dev')
+        self.y.set_config_name('dev')
+        self.x.remove_option('sect4:sect5:sect6', 'key1')
+        self.y.remove_option('sect4:sect5:sect6', 'key1')
+        before = self.caches(self.x)
+        self.assertEqual(self.x.get('sect1', 'key1'), 'changed')
+        self.assertEqual(self.lookups(self.x), self.lookups(self.y))
+        self.assertEqual(self.caches(self.x), before)
+
+    def test_compiled(self):
+        x = ExtendedConfigParser(config='dev_plop', compiled=True,
+                                 concurrent=True)
+        x.read('./test_cfg.ini')
+        size = len(x._resolved)
+        self.assertEqual(x.get('sect1', 'key1', sect_first=False),
+                         self.y.get('sect1', 'key1', sect_first=False))
+        self.assertEqual(len(x._resolved), size)
+
+    def test_compiled_changed(self):
+        x = ExtendedConfigParser(config='dev_plop', compiled=True,
+                                 concurrent=True)
+        x.read('./test_cfg.ini')
+        size = len(x._resolved)
+        x.set('sect2', 'key1', 'changed')
+        self.assertEqual(len(x._resolved), size)
+        self.assertEqual(x.get('sect2', 'key1'), 'changed')
+        x.remove_option('sect2', 'key1')
+        self.assertTrue(len(x._resolved) > 0)
+        self.assertEqual(x.get('sect2', 'key1', fallback=None), None)
+        # A value which cannot be interpolated only fails its own lookups
+        x.read_string(u('[sect9]\nbad=%(missing)s\n'))
+        self.assertTrue(len(x._resolved) > 0)
+        self.assertEqual(x.get('sect1', 'key1'), self.y.get('sect1', 'key1'))
+        self.assertRaises(configparser.InterpolationMissingOptionError,
+                          x.get, 'sect9', 'bad')
+
+    def test_unsupported(self):
+        self.assertRaises(ValueError, ExtendedConfigParser, typed_cache=True,
+                          concurrent=True)
+        self.assertRaises(ValueError, self.x.read, './test_cfg.ini',
+                          lazy=True)
+
+    def test_father_not_shared(self):
+        x = ExtendedConfigParser()
+        x.father['key'] = 'value'
+        self.assertEqual(ExtendedConfigParser().father, {})
+        self.assertEqual(ExtendedConfigParser.father, None)
+
+
+class MatrixTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.x = ExtendedConfigParser(defaults={'key8': 'father8',
+                                                'key8[dev_x]': 'father8_x'})
+        self.x.read('./test_cfg.ini')
+        self.names = ['dev_plop_toto_paris', 'dev_plop_toto_lyon',
+                      'dev_plop', 'dev_x', 'dev_x_y', 'DEV_plop_berlin',
+                      'prod', 'dev_plop_toto_stuff', '']
+
+    def frozen(self, config):
+        return dict((name, dict(values)) for name, values in config.items())
+
+    def test_resolve_matrix(self):
+        for sect_first in (True, False):
+            for cfg_plus in (True, False):
+                res = self.x.resolve_matrix(self.names, None, sect_first,
+                                            cfg_plus)
+                self.assertEqual(list(res), self.names)
+                for name in self.names:
+                    self.assertEqual(res[name].config_name, name)
+                    self.assertEqual(
+                        self.frozen(res[name]),
+                        self.frozen(self.x.freeze(name, sect_first,
+                                                  cfg_plus)))
+
+    def test_shared(self):
+        res = self.x.resolve_matrix(self.names)
+        self.assertTrue(res['dev_plop_toto_paris']['sect1'] is
+                        res['dev_plop_toto_lyon']['sect1'])
+        self.assertFalse(res['dev_plop_toto_paris']['sect1'] is
+                         res['dev_plop_toto_stuff']['sect1'])
+        self.assertEqual(res['dev_plop_toto_paris']['sect1']['key3'],
+                         'dev_plop_toto3')
+        self.assertEqual(res['dev_plop_toto_stuff']['sect1']['key1'],
+                         'dev1')
+        self.assertEqual(res['DEV_plop_berlin']['sect1']['key2'],
+                         'dev_plop2')
+        # Only the whole config name is looked for in the defaults
+        self.assertEqual(res['dev_x']['sect1']['key8'], 'father8_x')
+        self.assertEqual(res['dev_x_y']['sect1']['key8'], 'father8')
+        self.assertEqual(res['prod']['sect1']['key2'], 'val2')
+
+    def test_sections(self):
+        res = self.x.resolve_matrix(['dev', 'prod'],
+                                    ['sect1:sect2:sect3', 'sect2'])
+        self.assertEqual(list(res['dev']), ['sect1', 'sect2'])
+        self.assertEqual(res['dev']['sect1:sect2:sect3']['key3'], 'dev3')
+        self.assertEqual(res['prod']['sect2']['key2'], 'val2')
+        self.assertRaises(NoSectionError, self.x.resolve_matrix, ['dev'],
+                          ['sect7'])
+
+
+class CdbTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.x = ExtendedConfigParser(defaults={'key8': 'father8'},
+                                      config='dev_plop')
+        self.x.read('./test_cfg.ini')
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'cfg.cdb')
+        self.frozen = self.x.freeze()
+        self.assertEqual(write_cdb(self.x, self.path), len(self.frozen))
+        self.cdb = CdbConfig(self.path)
+
+    def tearDown(self):
+        self.cdb.close()
+        shutil.rmtree(self.dir)
+
+    def test_values(self):
+        self.assertEqual(self.cdb.config_name, 'dev_plop')
+        self.assertEqual(self.cdb.sections(), self.frozen.sections())
+        for name in self.frozen:
+            self.assertEqual(dict(self.cdb[name]), dict(self.frozen[name]))
+            self.assertEqual(self.cdb.options(name),
+                             list(self.frozen[name]))
+        self.assertEqual(self.cdb.get('sect1', 'key2'), 'dev_plop2')
+        self.assertEqual(self.cdb.get('sect1:sect2:sect3', 'KEY2'),
+                         'dev_plop2')
+        self.assertEqual(self.cdb.get('sect1', 'key8'), 'father8')
+        self.assertEqual(self.cdb.items('sect6'),
+                         list(self.frozen['sect6'].items()))
+
+    def test_lookups(self):
+        self.assertTrue(self.cdb.has_section('sect1:sect2:sect3'))
+        self.assertFalse(self.cdb.has_section('sect7'))
+        self.assertTrue(self.cdb.has_option('sect1', 'key3'))
+        self.assertFalse(self.cdb.has_option('sect1', 'key173'))
+        self.assertFalse(self.cdb.has_option('sect7', 'key1'))
+        self.assertTrue('key1' in self.cdb['sect1'])
+        self.assertRaises(NoOptionError, self.cdb.get, 'sect1', 'key173')
+        self.assertRaises(NoSectionError, self.cdb.get, 'sect7', 'key1')
+        self.assertRaises(KeyError, lambda: self.cdb['sect7'])
+        self.assertEqual(self.cdb.get('sect7', 'key1', fallback=3), 3)
+        self.assertEqual(self.cdb.get('sect1', 'key173', vars={
+            'key173': 'var'}), 'var')
+
+    def test_same_as_parser(self):
+        options = ['key8', 'KEY1', 'key173', 'key2[dev]', 'key049']
+        for sect in self.cdb.sections():
+            # The config names being resolved, cfg_ind is implied
+            for defaults in (False, True):
+                for cfg_ind in (False, True):
+                    self.assertEqual(
+                        sorted(self.x.options(sect, True, defaults, True)),
+                        sorted(self.cdb.options(sect, True, defaults,
+                                                cfg_ind)))
+            self.assertEqual(sorted(self.x.options(sect, cfg_ind=True)),
+                             sorted(self.cdb.options(sect, cfg_ind=True)))
+            for option in self.x.options(sect, cfg_ind=True) + options:
+                for cfg_ind in (False, True):
+                    for strict in (False, True):
+                        for config in ('', 'dev_plop'):
+                            self.assertEqual(
+                                bool(self.x.has_option(sect, option, config,
+                                                       cfg_ind, strict)),
+                                self.cdb.has_option(sect, option, config,
+                                                    cfg_ind=cfg_ind,
+                                                    strict=strict),
+                                (sect, option, cfg_ind, strict))
+                for cfg_plus in (False, True):
+                    for vars in (None, {'key1': 'var1', 'key2[dev]': 'var2',
+                                        'key3[dev_plop]': 'var3',
+                                        'key173[plop]': 'var4',
+                                        'key1[plop]': 'var5'}):
+                        self.assertEqual(
+                            self.x.get(sect, option, vars=vars,
+                                       fallback=None, cfg_plus=cfg_plus),
+                            self.cdb.get(sect, option, vars=vars,
+                                         fallback=None, cfg_plus=cfg_plus),
+                            (sect, option, cfg_plus, vars))
+            vars = {'key1[dev_plop]': 'var1', 'key2': 'var2'}
+            self.assertEqual(self.cdb.items(sect, vars=vars),
+                             [(o, self.x.get(sect, o, vars=vars))
+                              for o in self.cdb.options(sect)])
+        self.assertFalse(self.cdb.has_option('sect7', 'key1', strict=True))
+        self.assertRaises(NoSectionError, self.cdb.get, 'sect7', 'key1',
+                          vars={'key1': 'var1'})
+        self.assertRaises(ValueError, self.cdb.has_option, 'sect1', 'key1',
+                          'prod')
+        self.assertEqual(self.cdb.items('sect1', strict=True, defaults=True),
+                         [(o, self.x.get('sect1', o)) for o in
+                          self.cdb.options('sect1', True, True)
+                          if self.x.get('sect1', o, fallback=None)])
+
+    def test_converters(self):
+        self.assertEqual(self.cdb.getint('sect1', 'key_int'), 1)
+        self.assertEqual(self.cdb.getfloat('sect1', 'key_float'), 1.24)
+        self.assertTrue(self.cdb.getboolean('sect1', 'key_bool2'))
+        self.assertRaises(ValueError, self.cdb.getboolean, 'sect1',
+                          'key_bool6')
+        self.assertEqual(self.cdb.getintlist('sect1', 'key_list_int'),
+                         [1, 7, 3])
+        self.assertEqual(self.cdb.getbooleanlist('sect1', 'key_list_bool'),
+                         [True, False, True])
+        self.assertEqual(self.cdb.get('sect1', 'key_list', isList=True),
+                         ['damn', 'dang', 'nabbit'])
+        self.assertEqual(self.cdb.getint('sect1', 'key173', fallback=4), 4)
+
+    def test_config_name(self):
+        write_cdb(self.x, self.path, 'dev')
+        with CdbConfig(self.path) as cdb:
+            self.assertEqual(cdb.config_name, 'dev')
+            self.assertEqual(cdb.get('sect1', 'key2'), 'dev2')
+        # The file opened before keeps its content
+        self.assertEqual(self.cdb.get('sect1', 'key2'), 'dev_plop2')
+
+    def test_invalid(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'\0' * 2048)
+        self.assertRaises(ValueError, CdbConfig, self.path)
+
+
+class InternTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.x = ExtendedConfigParser(config='dev_plop', intern_strings=True)
+        self.x.read('./test_cfg.ini')
+        self.x.read_string(u('[sect9]\nkey2[dev]=true\nkey_bool1=true\n'))
+        self.y = ExtendedConfigParser(config='dev_plop')
+        self.y.read('./test_cfg.ini')
+        self.y.read_string(u('[sect9]\nkey2[dev]=true\nkey_bool1=true\n'))
+
+    def key(self, section, option):
+        for key in self.x._sections[section]:
+            if(key == option):
+                return key
+
+    def test_shared(self):
+        sect1 = self.x._sections['sect1:sect2:sect3']
+        sect9 = self.x._sections['sect9']
+        self.assertTrue(sect1['key_bool1'] is sect9['key_bool1'])
+        self.assertTrue(self.key('sect9', 'key2[dev]') is
+                        self.key('sect2', 'key2[dev]'))
+        self.assertTrue(self.key('sect9', 'key_bool1') is
+                        self.key('sect1:sect2:sect3', 'key_bool1'))
+        # The config names of the specification indexes as well
+        tags = [tag for s in ('sect2', 'sect3')
+                for tag in self.x._get_specs(s)['key2'] if tag == 'dev']
+        self.assertEqual(len(tags), 2)
+        self.assertTrue(tags[0] is tags[1])
+
+    def test_values(self):
+        self.assertEqual(self.x.freeze(), self.y.freeze())
+        self.assertEqual(self.x.items('sect9'), self.y.items('sect9'))
+
+    def test_set(self):
+        self.x.set('sect9', 'key_bool2', 'true')
+        self.x.set('sect9', 'key_bool1', 'on')
+        self.assertEqual(list(self.x._sections['sect9']),
+                         ['key2[dev]', 'key_bool1', 'key_bool2'])
+        self.assertTrue(self.key('sect9', 'key_bool2') is
+                        self.key('sect1:sect2:sect3', 'key_bool2'))
+        self.assertTrue(self.x._sections['sect9']['key_bool2'] is
+                        self.x._sections['sect1:sect2:sect3']['key_bool1'])
+        self.assertEqual(self.x.get('sect9', 'key_bool1'), 'on')
+
+    def test_pruned(self):
+        # The table is rebuilt once the values replaced may be as many as
+        # half of the strings stored
+        for i in range(1000):
+            self.x.set('sect9', 'key_bool1', 'value{0}'.format(i))
+        stored = set(self.x._stored_strings())
+        self.assertTrue(len(self.x._strings) <= len(stored) * 3 // 2 + 1)
+        self.assertTrue('value0' not in self.x._strings)
+        self.x.add_section('sect10')
+        for i in range(100):
+            self.x.set('sect10', 'key{0}'.format(i), 'gone{0}'.format(i))
+        self.x.remove_section('sect10')
+        self.assertFalse([s for s in self.x._strings if 'gone' in s])
+        self.assertEqual(set(self.x._strings),
+                         set(self.x._stored_strings()) - set([None]))
+        # The strings kept are still shared
+        self.x.read_string(u('[sect11]\nkey2[dev]=true\n'))
+        self.assertTrue(self.key('sect11', 'key2[dev]') is
+                        self.key('sect2', 'key2[dev]'))
+
+    def test_reload(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp, 'cfg.ini')
+            with io.open(path, 'w') as f:
+                f.write(u('[sect1]\nkey1=old1\n[DEFAULT]\nkey2=old2\n'))
+            x = ExtendedConfigParser(intern_strings=True, reloadable=True)
+            x.read(path)
+            with io.open(path, 'w') as f:
+                f.write(u('[sect1]\nkey1=new\n[DEFAULT]\nkey2=new\n'))
+            os.utime(path, (1000000000, 1000000000))
+            self.assertEqual(x.reload(), [path])
+            self.assertTrue(x.default_section['key2'] is
+                            x._sections['sect1']['key1'])
+            for string in ('old1', 'old2'):
+                self.assertTrue(string not in x._strings)
+        finally:
+            shutil.rmtree(tmp)
+
+    def test_memory_report(self):
+        res = self.x.memory_report()
+        ref = self.y.memory_report()
+        self.assertEqual(res['references'], ref['references'])
+        self.assertTrue(res['strings'] < ref['strings'])
+        self.assertTrue(res['bytes'] < ref['bytes'])
+        self.assertTrue(res['bytes_saved'] > ref['bytes_saved'])
+        self.assertTrue(res['table_bytes'] > 0)
+        self.assertEqual(ref['table_bytes'], 0)